@@ -3,18 +3,20 @@ Evalueate the model on the test motions.
 """
 
 import sys
-import pickle
 import os
 import os.path as osp
+import numpy as np
 from tqdm import tqdm
 
 sys.path.append("src")
 from model.infer_with_one_stage import infer_one_stage
 from model.infer_with_two_stage import infer_two_stage
-from utils.types import EvaluateMode
+from utils.types import EvaluateMode, InferBackend
 from utils.RobotConfig import RobotConfig
 from utils.consts import *
 from utils.calculate_error_from_motions import calculate_error
+from utils.motion import load_gt_motion
+from utils.smoothing import smooth_motion
 
 
 def evaluate_on_test_motions(
@@ -24,19 +26,20 @@ def evaluate_on_test_motions(
     device: str,
     evaluate_mode: EvaluateMode,
     best_model_idx: int = -1,
+    backend: InferBackend = InferBackend.TORCH,
+    smooth: bool = False,
 ):
     # store variables for motion paths
     robot_name = robot_config.robot_type.name
-    gt_motions = pickle.load(open(GT_PATH, "rb"))
-    robot_name_for_gt = robot_name[0] + robot_name[1:].lower()
 
     robot_pred_motion_dir = PRED_MOTIONS_DIR(robot_name, one_stage, extreme_filter_off)
+    variant = PRED_VARIANT(backend.value, smooth)
     os.makedirs(robot_pred_motion_dir, exist_ok=True)
 
     total_motion_errors = []
     for motion_idx in tqdm(GT_MOTION_IDXS):
         # load the ground truth motion and the human pose
-        gt_motion = gt_motions[robot_name_for_gt][motion_idx]["q"]
+        gt_motion = load_gt_motion(robot_config.robot_type, motion_idx)
         amass_data_path = osp.join(AMASS_DATA_PATH, f"{motion_idx}_stageii.npz")
 
         # predict the robot motion from the human pose
@@ -48,6 +51,7 @@ def evaluate_on_test_motions(
                 device=device,
                 evaluate_mode=evaluate_mode,
                 weight_idx=best_model_idx,
+                backend=backend,
             )
         else:
             pred_motion = infer_two_stage(
@@ -57,15 +61,19 @@ def evaluate_on_test_motions(
                 device=device,
                 evaluate_mode=evaluate_mode,
                 weight_idx=best_model_idx,
+                backend=backend,
             )
 
+        # smooth the predicted motion (same as the rendering)
+        if smooth:
+            pred_motion = smooth_motion(pred_motion, robot_config.smooth_window)
+
         # save the predicted motion
         pred_motion_path = osp.join(
             robot_pred_motion_dir,
-            PRED_MOTION_NAME(robot_name, extreme_filter_off, motion_idx),
+            PRED_MOTION_NAME(robot_name, extreme_filter_off, motion_idx, variant),
         )
-        with open(pred_motion_path, "wb") as f:
-            pickle.dump(pred_motion, f)
+        pred_motion.save(pred_motion_path)
 
         # if the motion is not in the test motions, skip calculating the error
         if motion_idx not in TEST_GT_MOTION_IDXS:
@@ -86,13 +94,13 @@ def evaluate_on_test_motions(
     mean_error = np.mean(total_motion_errors)
 
     # write the result to a file
-    result_path = osp.join(
-        robot_pred_motion_dir, EVAL_RESULT_TXT_NAME(evaluate_mode.name)
-    )
+    result_path = osp.join(robot_pred_motion_dir, EVAL_RESULT_TXT_NAME(evaluate_mode.name, variant))
     print(result_path)
     with open(result_path, "w") as f:
         f.write(f"Robot: {robot_name} EF: [{'OFF' if extreme_filter_off else 'ON'}]\n")
         f.write(f"Evaluate_mode: {evaluate_mode.name}\n")
+        f.write(f"Backend: {backend.value}\n")
+        f.write(f"Smooth: {f'ON (window {robot_config.smooth_window})' if smooth else 'OFF'}\n")
         f.write(f"Mean_error: {mean_error}\n")
         f.write("===================================================\n")
         f.write("All errors:\n")
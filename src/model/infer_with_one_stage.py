@@ -9,33 +9,36 @@ import os.path as osp
 
 sys.path.append("./src")
 from utils.RobotConfig import RobotConfig
-from utils.types import EvaluateMode
+from utils.types import EvaluateMode, InferBackend
 from utils.consts import *
 from utils.data import load_smpl_to_6D_reps
-from model.net import MLP
+from utils.motion import RobotMotion
+from model.net import MLP, quantize_int8
+from model.onnx_backend import OnnxRetargeter, onnx_model_path
+from model.knn_retargeter import KnnRetargeter, knn_index_path
 
 
-def infer_one_stage(
+def load_one_stage_model(
     robot_config: RobotConfig,
     extreme_filter_off: bool,
-    human_pose_path: str,
     device: str,
     evaluate_mode: EvaluateMode = EvaluateMode.LINK,
     weight_idx: int = -1,
-):
+    int8: bool = False,
+) -> MLP:
     """
-    Predict robot angles from SMPL parameters with motion retargeting model.
+    Build the one-stage model and load its trained weights.
 
     Args:
         robot_config: RobotConfig
-        extreme_filter: bool
-        human_pose_path: str
+        extreme_filter_off: bool
         device: str
         evaluate_mode: EvaluateMode
-        weight_idx: int
+        weight_idx: int (-1: use the best weight)
+        int8: bool (load the int8 dynamically quantized weights, see tools/quantize_model.py. runs on CPU only)
 
     Returns:
-        robot_angles: List[dict]
+        model: MLP in eval mode
     """
 
     # input & output dimensions
@@ -65,23 +68,80 @@ def infer_one_stage(
     else:
         model_name = MODEL_WEIGHT_NAME(robot_name, "os", weight_idx)
 
+    # The int8 weights are loaded into the quantized model
+    if int8:
+        model = quantize_int8(model)
+        weight_dir = MODEL_INT8_WEIGHTS_DIR(robot_name, True, extreme_filter_off)
+        device = "cpu"
+
     model_path = osp.join(weight_dir, model_name)
 
     # Load the weights
     model.load_state_dict(torch.load(model_path, map_location=device))
     model.eval()
 
+    return model
+
+
+def infer_one_stage(
+    robot_config: RobotConfig,
+    extreme_filter_off: bool,
+    human_pose_path: str,
+    device: str,
+    evaluate_mode: EvaluateMode = EvaluateMode.LINK,
+    weight_idx: int = -1,
+    backend: InferBackend = InferBackend.TORCH,
+) -> RobotMotion:
+    """
+    Predict robot angles from SMPL parameters with motion retargeting model.
+
+    Args:
+        robot_config: RobotConfig
+        extreme_filter: bool
+        human_pose_path: str
+        device: str
+        evaluate_mode: EvaluateMode
+        weight_idx: int
+        backend: InferBackend (ONNX: run the exported graph with onnxruntime on CPU, INT8: run the quantized model on CPU)
+                 (KNN: retrieve the nearest training pairs of tools/build_knn_index.py)
+
+    Returns:
+        robot_angles: RobotMotion
+    """
+
+    output_dim = robot_config.angles_dim
+
     # Load SMPL parameters
     smpl_rep, _ = load_smpl_to_6D_reps(human_pose_path)
 
     # Predict robot angles
-    with torch.no_grad():
-        pred_angles = model(smpl_rep.to(device).float()).cpu().numpy()[:, :output_dim]
+    if backend == InferBackend.KNN:
+        # the retrieval of the training pairs doesn't depend on the model (tools/build_knn_index.py)
+        model = KnnRetargeter(knn_index_path(robot_config.robot_type.name, extreme_filter_off))
+        pred_angles = model(smpl_rep.numpy())
 
-    # Convert the predicted robot angles to a list of dictionaries
+    elif backend == InferBackend.ONNX:
+        onnx_path = onnx_model_path(robot_config, extreme_filter_off, True, evaluate_mode, weight_idx)
+        model = OnnxRetargeter(onnx_path)
+        pred_angles = model(smpl_rep.numpy())[:, :output_dim]
+
+    else:
+        # the int8 quantized model runs on CPU only
+        if backend == InferBackend.INT8:
+            device = "cpu"
+
+        model = load_one_stage_model(
+            robot_config=robot_config,
+            extreme_filter_off=extreme_filter_off,
+            device=device,
+            evaluate_mode=evaluate_mode,
+            weight_idx=weight_idx,
+            int8=backend == InferBackend.INT8,
+        )
+        with torch.no_grad():
+            pred_angles = model(smpl_rep.to(device).float()).cpu().numpy()[:, :output_dim]
+
+    # The predicted robot angles are ordered by the sorted joint keys
     JOINT_KEYS = sorted(robot_config.joi_keys)
-    robot_angles = []
-    for p in pred_angles:
-        robot_angles.append({k: p[i] for i, k in enumerate(JOINT_KEYS)})
 
-    return robot_angles
+    return RobotMotion(pred_angles, JOINT_KEYS)
@@ -6,36 +6,41 @@ Load a pre-trained model and given SMPL parameters, predict robot angles.
 import torch
 import sys
 import os.path as osp
+from typing import Tuple
 
 sys.path.append("./src")
 from utils.RobotConfig import RobotConfig
-from utils.types import EvaluateMode
+from utils.types import EvaluateMode, InferBackend
 from utils.consts import *
 from utils.data import load_smpl_to_6D_reps
-from model.net import MLP
+from utils.motion import RobotMotion
+from model.net import MLP, quantize_int8
+from model.onnx_backend import OnnxRetargeter, onnx_model_path
+from model.knn_retargeter import KnnRetargeter, knn_index_path
 
 
-def infer_two_stage(
+def load_two_stage_models(
     robot_config: RobotConfig,
     extreme_filter_off: bool,
-    human_pose_path: str,
     device: str,
     evaluate_mode: EvaluateMode = EvaluateMode.LINK,
     weight_idx: int = -1,
-):
+    int8: bool = False,
+) -> Tuple[MLP, MLP]:
     """
-    Predict robot angles from SMPL parameters with motion retargeting model.
+    Build the pre & post models of the two-stage network and load their trained weights.
 
     Args:
         robot_config: RobotConfig
-        extreme_filter: bool
-        human_pose_path: str
+        extreme_filter_off: bool
         device: str
         evaluate_mode: EvaluateMode
-        weight_idx: int
+        weight_idx: int (-1: use the best weight)
+        int8: bool (load the int8 dynamically quantized weights, see tools/quantize_model.py. runs on CPU only)
 
     Returns:
-        robot_angles: List[dict]
+        model_pre: MLP in eval mode (SMPL reps -> robot link reps)
+        model_post: MLP in eval mode (robot link reps -> robot joint angles)
     """
 
     # input & output dimensions
@@ -74,6 +79,13 @@ def infer_two_stage(
         pre_model_name = MODEL_WEIGHT_NAME(robot_name, "pre", weight_idx)
         post_model_name = MODEL_WEIGHT_NAME(robot_name, "post", weight_idx)
 
+    # The int8 weights are loaded into the quantized models
+    if int8:
+        model_pre = quantize_int8(model_pre)
+        model_post = quantize_int8(model_post)
+        weight_dir = MODEL_INT8_WEIGHTS_DIR(robot_name, False, extreme_filter_off)
+        device = "cpu"
+
     pre_model_path = osp.join(weight_dir, pre_model_name)
     post_model_path = osp.join(weight_dir, post_model_name)
 
@@ -83,19 +95,71 @@ def infer_two_stage(
     model_pre.eval()
     model_post.eval()
 
+    return model_pre, model_post
+
+
+def infer_two_stage(
+    robot_config: RobotConfig,
+    extreme_filter_off: bool,
+    human_pose_path: str,
+    device: str,
+    evaluate_mode: EvaluateMode = EvaluateMode.LINK,
+    weight_idx: int = -1,
+    backend: InferBackend = InferBackend.TORCH,
+) -> RobotMotion:
+    """
+    Predict robot angles from SMPL parameters with motion retargeting model.
+
+    Args:
+        robot_config: RobotConfig
+        extreme_filter: bool
+        human_pose_path: str
+        device: str
+        evaluate_mode: EvaluateMode
+        weight_idx: int
+        backend: InferBackend (ONNX: run the exported graph with onnxruntime on CPU, INT8: run the quantized models on CPU)
+                 (KNN: retrieve the nearest training pairs of tools/build_knn_index.py)
+
+    Returns:
+        robot_angles: RobotMotion
+    """
+
+    output_dim = robot_config.angles_dim
+
     # Load SMPL parameters
     smpl_rep, _ = load_smpl_to_6D_reps(human_pose_path)
 
     # Predict robot angles
-    with torch.no_grad():
-        pre_pred = model_pre(smpl_rep.to(device).float())
-        post_pred = model_post(pre_pred)
-        post_pred = post_pred.detach().cpu().numpy()[:, :output_dim]
+    if backend == InferBackend.KNN:
+        # the retrieval of the training pairs doesn't depend on the model (tools/build_knn_index.py)
+        model = KnnRetargeter(knn_index_path(robot_config.robot_type.name, extreme_filter_off))
+        post_pred = model(smpl_rep.numpy())
 
-    # Convert the predicted robot angles to a list of dictionaries
+    elif backend == InferBackend.ONNX:
+        # the exported graph fuses the pre & post networks
+        onnx_path = onnx_model_path(robot_config, extreme_filter_off, False, evaluate_mode, weight_idx)
+        model = OnnxRetargeter(onnx_path)
+        post_pred = model(smpl_rep.numpy())[:, :output_dim]
+
+    else:
+        # the int8 quantized models run on CPU only
+        if backend == InferBackend.INT8:
+            device = "cpu"
+
+        model_pre, model_post = load_two_stage_models(
+            robot_config=robot_config,
+            extreme_filter_off=extreme_filter_off,
+            device=device,
+            evaluate_mode=evaluate_mode,
+            weight_idx=weight_idx,
+            int8=backend == InferBackend.INT8,
+        )
+        with torch.no_grad():
+            pre_pred = model_pre(smpl_rep.to(device).float())
+            post_pred = model_post(pre_pred)
+            post_pred = post_pred.detach().cpu().numpy()[:, :output_dim]
+
+    # The predicted robot angles are ordered by the sorted joint keys
     JOINT_KEYS = sorted(robot_config.joi_keys)
-    robot_angles = []
-    for p in post_pred:
-        robot_angles.append({k: p[i] for i, k in enumerate(JOINT_KEYS)})
 
-    return robot_angles
+    return RobotMotion(post_pred, JOINT_KEYS)
@@ -0,0 +1,207 @@
+"""
+Nearest-neighbour retrieval retargeter: the robot angles of a SMPL pose are blended from the k training pairs whose
+SMPL reps are the nearest, without any network (a fast baseline of the MLP backends, `InferBackend.KNN`).
+
+The index (tools/build_knn_index.py) is an inverted file of the training pairs: the SMPL reps are clustered into
+k-means cells and stored grouped by their cell, in float32. A query searches only the points of its `nprobe` nearest
+cells (exact distances), so the neighbours are approximate unless nprobe is the number of the cells. A KD-tree prunes
+almost nothing in the 36-D reps space (slower than the brute force without a large approximation), while the cells
+turn the search into a few matrix products: the queries are grouped by the cells they probe.
+Like the NumPy runtime, this module must not import torch (directly or indirectly).
+"""
+
+import os
+import os.path as osp
+import sys
+import numpy as np
+from typing import List, Optional, Tuple
+
+sys.path.append("./src")
+from model.numpy_runtime import load_smpl_pose, smpl_pose_to_6D_reps
+from utils.motion import RobotMotion
+from utils.consts import *
+
+
+def knn_index_path(robot_name: str, extreme_filter_off: bool) -> str:
+    return MODEL_KNN_INDEX_PATH(robot_name, extreme_filter_off)
+
+
+def squared_distances(queries: np.ndarray, points: np.ndarray, points_sq: np.ndarray) -> np.ndarray:
+    """
+    Squared euclidean distances (M, N) of the queries (M, D) and the points (N, D) with their squared norms (N,)
+    """
+    dists = (queries * queries).sum(axis=1)[:, None] - 2 * queries @ points.T + points_sq[None, :]
+    return np.maximum(dists, 0)
+
+
+def build_knn_index(
+    path: str,
+    smpl_reps: np.ndarray,
+    robot_angles: np.ndarray,
+    joint_keys: List[str],
+    smpl_probs: Optional[np.ndarray] = None,
+    max_points: int = 0,
+    num_cells: int = KNN_NUM_CELLS,
+    seed: int = 0,
+) -> int:
+    """
+    Cluster the training pairs into the k-means cells and save the retrieval index.
+
+    Args:
+        path (str): path of the index (.npz)
+        smpl_reps (np.ndarray): SMPL reps of the training poses (N, SMPL_ARM_JOINT_REPS_DIM)
+        robot_angles (np.ndarray): robot angles of the training poses (N, J), joints in the order of joint_keys
+        joint_keys (List[str]): joint names of the robot angles (sorted)
+        smpl_probs (np.ndarray): probabilities of the extreme filter (N,): the extreme poses (0) are not indexed
+        max_points (int): maximum number of the indexed pairs (random subset, 0: all), trades accuracy for memory
+        num_cells (int): number of the k-means cells
+        seed (int): random seed of the subset and the k-means
+
+    Returns:
+        num_points (int): number of the indexed pairs
+    """
+    # scipy.cluster is only needed to build the index
+    from scipy.cluster.vq import kmeans2
+
+    rng = np.random.default_rng(seed)
+    keep = np.ones(len(smpl_reps), dtype=bool) if smpl_probs is None else np.asarray(smpl_probs) > 0
+    idxs = np.flatnonzero(keep)
+    if 0 < max_points < len(idxs):
+        idxs = np.sort(rng.choice(idxs, max_points, replace=False))
+    reps = np.asarray(smpl_reps, dtype=np.float32)[idxs]
+    angles = np.asarray(robot_angles, dtype=np.float32)[idxs]
+
+    # the centroids are trained on a subset (about 50 points per cell), which is enough for coarse cells
+    num_cells = max(1, min(num_cells, len(reps)))
+    train = reps[rng.choice(len(reps), min(len(reps), 50 * num_cells), replace=False)]
+    centroids, _ = kmeans2(train.astype(np.float64), num_cells, iter=10, minit="points", seed=seed)
+    centroids = centroids.astype(np.float32)
+
+    centroids_sq = (centroids * centroids).sum(axis=1)
+    cells = np.concatenate(
+        [
+            squared_distances(reps[i : i + KNN_CHUNK_SIZE], centroids, centroids_sq).argmin(axis=1)
+            for i in range(0, len(reps), KNN_CHUNK_SIZE)
+        ]
+    )
+    order = np.argsort(cells, kind="stable")
+    offsets = np.searchsorted(cells[order], np.arange(num_cells + 1))
+
+    os.makedirs(osp.dirname(path), exist_ok=True)
+    np.savez(
+        path,
+        smpl_reps=reps[order],
+        robot_angles=angles[order],
+        centroids=centroids,
+        offsets=offsets,
+        joint_keys=np.array(joint_keys),
+    )
+    return len(reps)
+
+
+class KnnRetargeter:
+    """
+    k-NN retrieval with inverse-distance blending of the robot angles of the neighbours.
+    """
+
+    def __init__(self, index_path: str, k: int = KNN_K, nprobe: int = KNN_NPROBE):
+        if not osp.exists(index_path):
+            raise FileNotFoundError(f"{index_path} does not exist. Build it first with tools/build_knn_index.py")
+
+        with np.load(index_path) as index:
+            self.smpl_reps: np.ndarray = index["smpl_reps"]
+            self.robot_angles: np.ndarray = index["robot_angles"]
+            self.centroids: np.ndarray = index["centroids"]
+            self.offsets: np.ndarray = index["offsets"]
+            self.joint_keys: List[str] = [str(k) for k in index["joint_keys"]]
+        self.k = min(k, len(self.smpl_reps))
+        self.nprobe = nprobe
+
+        # the k-means may leave cells empty: only the cells with points are probed
+        self.cells = np.flatnonzero(np.diff(self.offsets))
+
+        self.smpl_reps_sq = (self.smpl_reps * self.smpl_reps).sum(axis=1)
+        self.centroids_sq = (self.centroids * self.centroids).sum(axis=1)
+
+    @property
+    def memory_mb(self) -> float:
+        """
+        Memory of the index: the float32 pairs, their squared norms and the cells.
+        """
+        arrays = [self.smpl_reps, self.robot_angles, self.smpl_reps_sq, self.centroids, self.offsets]
+        return sum(a.nbytes for a in arrays) / 2**20
+
+    def search(self, queries: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Approximate k nearest neighbours of the queries (M, D) among the points of their nprobe nearest cells
+        (the empty cells are skipped).
+
+        Returns:
+            dists (np.ndarray): squared distances of the neighbours (M, k)
+            idxs (np.ndarray): indices of the neighbours in the index (M, k)
+        """
+        num_queries, num_cells = len(queries), len(self.cells)
+        nprobe = min(self.nprobe, num_cells)
+
+        centroid_dists = squared_distances(queries, self.centroids[self.cells], self.centroids_sq[self.cells])
+        if nprobe < num_cells:
+            probes = self.cells[np.argpartition(centroid_dists, nprobe - 1, axis=1)[:, :nprobe]]
+        else:
+            probes = np.broadcast_to(self.cells, (num_queries, num_cells))
+
+        # group the (query, cell) pairs by the cell: one matrix product per probed cell
+        cells = probes.ravel()
+        query_idxs = np.repeat(np.arange(num_queries), nprobe)
+        order = np.argsort(cells, kind="stable")
+        cells, query_idxs = cells[order], query_idxs[order]
+        bounds = np.flatnonzero(np.diff(cells)) + 1
+
+        best_dists = np.full((num_queries, self.k), np.inf, dtype=np.float32)
+        best_idxs = np.zeros((num_queries, self.k), dtype=np.int64)
+        for qs, cell in zip(np.split(query_idxs, bounds), cells[np.r_[0, bounds]]):
+            start, end = self.offsets[cell], self.offsets[cell + 1]
+
+            # merge the points of the cell into the running k nearest of its queries
+            dists = squared_distances(queries[qs], self.smpl_reps[start:end], self.smpl_reps_sq[start:end])
+            dists = np.concatenate([best_dists[qs], dists], axis=1)
+            idxs = np.broadcast_to(np.arange(start, end), (len(qs), end - start))
+            idxs = np.concatenate([best_idxs[qs], idxs], axis=1)
+            nearest = np.argpartition(dists, self.k - 1, axis=1)[:, : self.k]
+            best_dists[qs] = np.take_along_axis(dists, nearest, axis=1)
+            best_idxs[qs] = np.take_along_axis(idxs, nearest, axis=1)
+
+        return best_dists, best_idxs
+
+    def __call__(self, smpl_rep: np.ndarray) -> np.ndarray:
+        """
+        smpl_rep: (N, SMPL_ARM_JOINT_REPS_DIM) -> robot angles: (N, J)
+        """
+        sq_dists, idxs = self.search(np.asarray(smpl_rep, dtype=np.float32))
+
+        # inverse-distance weights (an exact match takes almost all the weight)
+        weights = 1.0 / (np.sqrt(sq_dists) + 1e-8)
+        weights /= weights.sum(axis=1, keepdims=True)
+        robot_angles = np.einsum("nk,nkj->nj", weights, self.robot_angles[idxs]).astype(np.float32)
+
+        # the probed cells are not empty, so each query has at least one neighbour
+        assert np.isfinite(robot_angles).all(), "The k-NN retrieval found no neighbours of some poses"
+        return robot_angles
+
+
+def infer_knn(index_path: str, human_pose_path: str, k: int = KNN_K, nprobe: int = KNN_NPROBE) -> RobotMotion:
+    """
+    Predict robot angles from SMPL parameters with the k-NN retrieval.
+
+    Args:
+        index_path: str (see tools/build_knn_index.py)
+        human_pose_path: str
+        k: int (number of the blended neighbours)
+        nprobe: int (number of the searched cells, KNN_NUM_CELLS: exact)
+
+    Returns:
+        robot_angles: RobotMotion
+    """
+    model = KnnRetargeter(index_path, k, nprobe)
+    smpl_rep = smpl_pose_to_6D_reps(load_smpl_pose(human_pose_path))
+
+    return RobotMotion(model(smpl_rep), model.joint_keys)
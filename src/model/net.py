@@ -1,3 +1,4 @@
+import torch
 import torch.nn as nn
 
 
@@ -17,3 +18,27 @@ class MLP(nn.Module):
         out = self.fc3(out)
 
         return out
+
+
+class TwoStageMLP(nn.Module):
+    """
+    Fuse the pre & post networks of the two-stage model into a single network.
+    (SMPL reps -> robot link reps -> robot joint angles)
+    """
+
+    def __init__(self, model_pre: MLP, model_post: MLP):
+        super(TwoStageMLP, self).__init__()
+
+        self.model_pre = model_pre
+        self.model_post = model_post
+
+    def forward(self, inp):
+        return self.model_post(self.model_pre(inp))
+
+
+def quantize_int8(model: nn.Module) -> nn.Module:
+    """
+    Int8 dynamic quantization of the linear layers (weights are stored in int8, activations are quantized on the fly).
+    The quantized model runs on CPU only.
+    """
+    return torch.quantization.quantize_dynamic(model.cpu(), {nn.Linear}, dtype=torch.qint8)
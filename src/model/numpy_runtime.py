@@ -0,0 +1,170 @@
+"""
+Dependency-light retargeting runtime which runs the MLP weights exported by tools/export_npz.py with NumPy only.
+
+Loading torch, pytorch3d and human_body_prior just to run three linear layers takes seconds of startup and hundreds
+of MB of memory on the deployment targets. This module must not import them (directly or indirectly).
+"""
+
+import os.path as osp
+import sys
+import numpy as np
+from typing import List
+
+sys.path.append("./src")
+from utils.types import EvaluateMode
+from utils.motion import RobotMotion
+from utils.consts import *
+
+
+def erf(x: np.ndarray) -> np.ndarray:
+    """
+    Error function (Abramowitz & Stegun 7.1.26, max absolute error 1.5e-7).
+    NumPy doesn't have erf, and we don't want to import scipy only for this.
+    """
+    # fmt: off
+    a1, a2, a3, a4, a5, p = 0.254829592, -0.284496736, 1.421413741, -1.453152027, 1.061405429, 0.3275911
+    # fmt: on
+    sign = np.sign(x)
+    x = np.abs(x)
+
+    t = 1.0 / (1.0 + p * x)
+    y = 1.0 - (((((a5 * t + a4) * t) + a3) * t + a2) * t + a1) * t * np.exp(-x * x)
+    return sign * y
+
+
+def gelu(x: np.ndarray) -> np.ndarray:
+    """
+    GELU activation (same as torch.nn.GELU, not the tanh approximation)
+    """
+    return 0.5 * x * (1.0 + erf(x / np.sqrt(2.0)))
+
+
+def axis_angle_to_matrix(axis_angle: np.ndarray, eps: float = 1e-6) -> np.ndarray:
+    """
+    Convert axis-angles (N, 3) into rotation matrices (N, 3, 3) with the Rodrigues' formula.
+    Same as `aa2matrot` of human_body_prior (first-order Taylor expansion for the small angles).
+    """
+    theta2 = np.sum(axis_angle * axis_angle, axis=1, keepdims=True)  # (N, 1)
+    theta = np.sqrt(theta2)
+    wx, wy, wz = np.split(axis_angle / (theta + eps), 3, axis=1)
+    rx, ry, rz = np.split(axis_angle, 3, axis=1)
+    cos, sin = np.cos(theta), np.sin(theta)
+    one = np.ones_like(theta)
+
+    # fmt: off
+    rotmat = np.concatenate([
+        cos + wx * wx * (1 - cos),      wx * wy * (1 - cos) - wz * sin, wy * sin + wx * wz * (1 - cos),
+        wz * sin + wx * wy * (1 - cos), cos + wy * wy * (1 - cos),      -wx * sin + wy * wz * (1 - cos),
+        -wy * sin + wx * wz * (1 - cos), wx * sin + wy * wz * (1 - cos), cos + wz * wz * (1 - cos),
+    ], axis=1)
+    rotmat_taylor = np.concatenate([
+        one, -rz, ry,
+        rz, one, -rx,
+        -ry, rx, one,
+    ], axis=1)
+    # fmt: on
+
+    rotmat = np.where(theta2 > eps, rotmat, rotmat_taylor)
+    return rotmat.reshape(-1, 3, 3)
+
+
+def matrix_to_rotation_6d(rotmat: np.ndarray) -> np.ndarray:
+    """
+    Convert rotation matrices (..., 3, 3) into 6D representations (..., 6) (first two rows, same as pytorch3d).
+    """
+    return rotmat[..., :2, :].reshape(rotmat.shape[:-2] + (6,))
+
+
+def npz_model_path(
+    robot_name: str,
+    extreme_filter_off: bool,
+    one_stage: bool,
+    evaluate_mode: EvaluateMode = EvaluateMode.LINK,
+    weight_idx: int = -1,
+) -> str:
+    weight_dir = MODEL_WEIGHTS_DIR(robot_name, one_stage, extreme_filter_off)
+    model_type = "os" if one_stage else "ts"
+    model_name = MODEL_NPZ_NAME(robot_name, model_type, MODEL_WEIGHT_TAG(evaluate_mode.value, weight_idx))
+
+    return osp.join(weight_dir, model_name)
+
+
+def load_smpl_pose(human_pose_path: str) -> np.ndarray:
+    """
+    Load the SMPL body pose (axis-angle format, shape: (num_poses, 63)) from a file.
+    """
+    if human_pose_path.endswith(".pkl"):
+        import joblib
+
+        return joblib.load(open(human_pose_path, "rb"))["pose"][:, 3:66]
+    elif human_pose_path.endswith(".npz"):
+        return np.load(human_pose_path)["pose_body"]
+
+    raise ValueError(f"Unsupported SMPL file: {human_pose_path}")
+
+
+def smpl_pose_to_6D_reps(human_pose: np.ndarray) -> np.ndarray:
+    """
+    Convert the SMPL body pose into the 6D representations of the arm joints.
+    NumPy version of `load_smpl_to_6D_reps` in utils/data.py.
+    """
+    # We only get the last 18 values, which is the axis-angle of the arm joints.
+    human_arm_pose = human_pose[:, -18:]
+    num_poses = len(human_arm_pose)
+
+    smpl_axis_angle = human_arm_pose.reshape(num_poses * SMPL_ARM_JOINT_NUMS, 3)
+    smpl_rep = matrix_to_rotation_6d(axis_angle_to_matrix(smpl_axis_angle))
+
+    return smpl_rep.reshape(num_poses, SMPL_ARM_JOINT_REPS_DIM).astype(np.float32)
+
+
+class NumpyRetargeter:
+    """
+    Run the exported MLP weights (one-stage, or pre + post of the two-stage) with NumPy.
+    """
+
+    def __init__(self, npz_path: str):
+        if not osp.exists(npz_path):
+            raise FileNotFoundError(f"{npz_path} does not exist. Export it first with tools/export_npz.py")
+
+        weights = np.load(npz_path)
+        self.joint_keys: List[str] = [str(k) for k in weights["joint_keys"]]
+
+        # layers of each stage: [(weight.T, bias), ...] (transposed once, so that the forward is `x @ W + b`)
+        self.stages = []
+        for stage in weights["stages"]:
+            layers = []
+            for fc in ["fc1", "fc2", "fc3"]:
+                w = np.ascontiguousarray(weights[f"{stage}.{fc}.weight"].T)
+                layers.append((w, weights[f"{stage}.{fc}.bias"]))
+            self.stages.append(layers)
+
+    def __call__(self, smpl_rep: np.ndarray) -> np.ndarray:
+        """
+        smpl_rep: (N, SMPL_ARM_JOINT_REPS_DIM) -> robot angles: (N, angles_dim)
+        """
+        out = np.asarray(smpl_rep, dtype=np.float32)
+        for (w1, b1), (w2, b2), (w3, b3) in self.stages:
+            out = gelu(out @ w1 + b1)
+            out = gelu(out @ w2 + b2)
+            out = out @ w3 + b3
+
+        return out[:, : len(self.joint_keys)]
+
+
+def infer_numpy(npz_path: str, human_pose_path: str) -> RobotMotion:
+    """
+    Predict robot angles from SMPL parameters with the NumPy runtime.
+
+    Args:
+        npz_path: str (exported weights, see tools/export_npz.py)
+        human_pose_path: str
+
+    Returns:
+        robot_angles: RobotMotion
+    """
+    model = NumpyRetargeter(npz_path)
+    smpl_rep = smpl_pose_to_6D_reps(load_smpl_pose(human_pose_path))
+    pred_angles = model(smpl_rep)
+
+    return RobotMotion(pred_angles, model.joint_keys)
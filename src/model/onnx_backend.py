@@ -0,0 +1,119 @@
+"""
+Export the retargeting models into ONNX graphs and run them with onnxruntime on CPU.
+
+The networks are tiny (3 linear layers), so at small batch sizes the eager overhead of PyTorch dominates their
+runtime on CPU. onnxruntime runs the whole graph in a single call, and the two-stage model is exported as a single
+graph fusing the pre & post networks.
+"""
+
+import os.path as osp
+import sys
+import numpy as np
+import torch
+
+sys.path.append("./src")
+from model.net import TwoStageMLP
+from utils.RobotConfig import RobotConfig
+from utils.types import EvaluateMode
+from utils.consts import *
+
+
+def onnx_weight_tag(evaluate_mode: EvaluateMode, weight_idx: int) -> str:
+    """
+    Tag of the weight in the ONNX model name (follows the naming of the torch weights).
+    """
+    return MODEL_WEIGHT_TAG(evaluate_mode.value, weight_idx)
+
+
+def onnx_model_path(
+    robot_config: RobotConfig,
+    extreme_filter_off: bool,
+    one_stage: bool,
+    evaluate_mode: EvaluateMode = EvaluateMode.LINK,
+    weight_idx: int = -1,
+) -> str:
+    robot_name = robot_config.robot_type.name
+    weight_dir = MODEL_WEIGHTS_DIR(robot_name, one_stage, extreme_filter_off)
+    model_type = "os" if one_stage else "ts"
+    model_name = MODEL_ONNX_NAME(robot_name, model_type, onnx_weight_tag(evaluate_mode, weight_idx))
+
+    return osp.join(weight_dir, model_name)
+
+
+def export_onnx(
+    robot_config: RobotConfig,
+    extreme_filter_off: bool,
+    one_stage: bool,
+    evaluate_mode: EvaluateMode = EvaluateMode.LINK,
+    weight_idx: int = -1,
+    opset: int = ONNX_OPSET,
+) -> str:
+    """
+    Export a trained model into an ONNX graph next to its torch weights.
+    The two-stage model is exported as a single graph (pre + post).
+
+    Args:
+        robot_config: RobotConfig
+        extreme_filter_off: bool
+        one_stage: bool
+        evaluate_mode: EvaluateMode
+        weight_idx: int (-1: use the best weight)
+        opset: int (ONNX opset version)
+
+    Returns:
+        onnx_path: str
+    """
+    # the inference modules import this module for the ONNX backend
+    from model.infer_with_one_stage import load_one_stage_model
+    from model.infer_with_two_stage import load_two_stage_models
+
+    if one_stage:
+        model = load_one_stage_model(robot_config, extreme_filter_off, "cpu", evaluate_mode, weight_idx)
+    else:
+        model_pre, model_post = load_two_stage_models(
+            robot_config, extreme_filter_off, "cpu", evaluate_mode, weight_idx
+        )
+        model = TwoStageMLP(model_pre, model_post).eval()
+
+    onnx_path = onnx_model_path(robot_config, extreme_filter_off, one_stage, evaluate_mode, weight_idx)
+    dummy_input = torch.zeros(1, SMPL_ARM_JOINT_REPS_DIM)
+
+    # the batch axis is dynamic, so that the same graph serves a single frame and a whole motion
+    torch.onnx.export(
+        model,
+        dummy_input,
+        onnx_path,
+        input_names=["smpl_rep"],
+        output_names=["robot_angles"],
+        dynamic_axes={"smpl_rep": {0: "batch"}, "robot_angles": {0: "batch"}},
+        opset_version=opset,
+    )
+
+    return onnx_path
+
+
+class OnnxRetargeter:
+    """
+    Run an exported retargeting model with onnxruntime on CPU.
+    """
+
+    def __init__(self, onnx_path: str, num_threads: int = 0):
+        # onnxruntime is only required for the ONNX backend
+        import onnxruntime as ort
+
+        if not osp.exists(onnx_path):
+            raise FileNotFoundError(f"{onnx_path} does not exist. Export it first with tools/export_onnx.py")
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        options.intra_op_num_threads = num_threads  # 0: let onnxruntime decide
+
+        self.session = ort.InferenceSession(onnx_path, options, providers=["CPUExecutionProvider"])
+        self.input_name = self.session.get_inputs()[0].name
+
+    def __call__(self, smpl_rep: np.ndarray) -> np.ndarray:
+        """
+        smpl_rep: (N, SMPL_ARM_JOINT_REPS_DIM) -> robot angles: (N, angles_dim)
+        """
+        smpl_rep = np.ascontiguousarray(smpl_rep, dtype=np.float32)
+        return self.session.run(None, {self.input_name: smpl_rep})[0]
@@ -3,12 +3,11 @@ This module is used to pick the best model from the trained models.
 The Best model is the one that has the lowest errors on the validation motion set of GT.
 """
 
-import pickle
 import sys
 import os.path as osp
 import os
-import matplotlib.pyplot as plt
 from shutil import copyfile
+import numpy as np
 from tqdm import tqdm
 
 sys.path.append("./src")
@@ -16,8 +15,9 @@ from model.infer_with_one_stage import infer_one_stage
 from model.infer_with_two_stage import infer_two_stage
 from utils.consts import *
 from utils.RobotConfig import RobotConfig
-from utils.types import EvaluateMode
+from utils.types import EvaluateMode, InferBackend
 from utils.calculate_error_from_motions import calculate_error
+from utils.motion import load_gt_motion
 
 
 def pick_best_model(
@@ -26,10 +26,9 @@ def pick_best_model(
     one_stage: bool,
     device: str,
     evaluate_mode: EvaluateMode,
+    backend: InferBackend = InferBackend.TORCH,
 ) -> int:
     robot_name = robot_config.robot_type.name
-    robot_name_for_gt = robot_name[0] + robot_name[1:].lower()
-    gt_motions = pickle.load(open(GT_PATH, "rb"))
 
     if extreme_filter_off:
         weight_num = EF_OFF_NUM_EPOCHS // MODEL_SAVE_EPOCH
@@ -37,7 +36,7 @@ def pick_best_model(
         weight_num = EF_EPOCHS // MODEL_SAVE_EPOCH
     all_motions_errors = []  # (2, 20)
     for val_motion_idx in VALID_GT_MOTION_IDXS:
-        gt_motion = gt_motions[robot_name_for_gt][val_motion_idx]["q"]
+        gt_motion = load_gt_motion(robot_config.robot_type, val_motion_idx)
         amass_data_path = osp.join(AMASS_DATA_PATH, f"{val_motion_idx}_stageii.npz")
         motion_errors = []  # (20,)
 
@@ -50,6 +49,7 @@ def pick_best_model(
                     human_pose_path=amass_data_path,
                     device=device,
                     weight_idx=weight_idx,
+                    backend=backend,
                 )
             else:
                 pred_motion = infer_two_stage(
@@ -58,6 +58,7 @@ def pick_best_model(
                     human_pose_path=amass_data_path,
                     device=device,
                     weight_idx=weight_idx,
+                    backend=backend,
                 )
 
             # calculate the error between the predicted motion and the ground truth motion
@@ -97,6 +98,9 @@ def pick_best_model(
         copyfile(best_post_model_weight_path, post_model_save_path)
 
     # Plot the errors (motion 1, motion 2, mean)
+    # matplotlib is imported only here, since it is slow to import and only used for this plot
+    import matplotlib.pyplot as plt
+
     x = range(weight_num)
     plt.plot(x, all_motions_errors[0], label="motion 1")
     plt.plot(x, all_motions_errors[1], label="motion 2")
@@ -0,0 +1,139 @@
+"""
+Int8 dynamic quantization of the retargeting models for robot-side CPUs.
+Quantize the best weights of each evaluate mode, and compare the size, latency and errors with the fp32 models.
+"""
+
+import os
+import os.path as osp
+import sys
+import time
+import numpy as np
+import torch
+from typing import List
+
+sys.path.append("./src")
+from model.net import quantize_int8
+from model.infer_with_one_stage import infer_one_stage, load_one_stage_model
+from model.infer_with_two_stage import infer_two_stage, load_two_stage_models
+from utils.RobotConfig import RobotConfig
+from utils.types import EvaluateMode, InferBackend
+from utils.consts import *
+from utils.calculate_error_from_motions import calculate_error
+from utils.motion import load_gt_motion
+
+
+def quantize_and_save(
+    robot_config: RobotConfig,
+    extreme_filter_off: bool,
+    one_stage: bool,
+    evaluate_mode: EvaluateMode,
+) -> List[str]:
+    """
+    Quantize the best weights of the evaluate mode and save them in the int8 weight directory.
+
+    Returns:
+        int8_weight_paths: list of the saved weight paths
+    """
+    robot_name = robot_config.robot_type.name
+    int8_weight_dir = MODEL_INT8_WEIGHTS_DIR(robot_name, one_stage, extreme_filter_off)
+    os.makedirs(int8_weight_dir, exist_ok=True)
+
+    if one_stage:
+        models = {"os": load_one_stage_model(robot_config, extreme_filter_off, "cpu", evaluate_mode)}
+    else:
+        model_pre, model_post = load_two_stage_models(robot_config, extreme_filter_off, "cpu", evaluate_mode)
+        models = {"pre": model_pre, "post": model_post}
+
+    int8_weight_paths = []
+    for model_type, model in models.items():
+        int8_weight_path = osp.join(
+            int8_weight_dir, MODEL_BEST_WEIGHT_NAME(robot_name, model_type, evaluate_mode.value)
+        )
+        torch.save(quantize_int8(model).state_dict(), int8_weight_path)
+        int8_weight_paths.append(int8_weight_path)
+
+    return int8_weight_paths
+
+
+def weights_size_mb(
+    robot_config: RobotConfig,
+    extreme_filter_off: bool,
+    one_stage: bool,
+    evaluate_mode: EvaluateMode,
+    int8: bool,
+) -> float:
+    robot_name = robot_config.robot_type.name
+    if int8:
+        weight_dir = MODEL_INT8_WEIGHTS_DIR(robot_name, one_stage, extreme_filter_off)
+    else:
+        weight_dir = MODEL_WEIGHTS_DIR(robot_name, one_stage, extreme_filter_off)
+
+    model_types = ["os"] if one_stage else ["pre", "post"]
+    weight_names = [MODEL_BEST_WEIGHT_NAME(robot_name, t, evaluate_mode.value) for t in model_types]
+
+    return sum(osp.getsize(osp.join(weight_dir, name)) for name in weight_names) / 1e6
+
+
+def measure_latency_ms(
+    robot_config: RobotConfig,
+    extreme_filter_off: bool,
+    one_stage: bool,
+    evaluate_mode: EvaluateMode,
+    int8: bool,
+    batch_size: int,
+    num_repeats: int,
+) -> float:
+    """
+    Measure the CPU latency of a single forward pass of the (fp32 or int8) model.
+    """
+    if one_stage:
+        models = [load_one_stage_model(robot_config, extreme_filter_off, "cpu", evaluate_mode, int8=int8)]
+    else:
+        models = load_two_stage_models(robot_config, extreme_filter_off, "cpu", evaluate_mode, int8=int8)
+
+    smpl_rep = torch.rand(batch_size, SMPL_ARM_JOINT_REPS_DIM)
+
+    def forward():
+        out = smpl_rep
+        for model in models:
+            out = model(out)
+        return out
+
+    with torch.no_grad():
+        # warm up
+        for _ in range(3):
+            forward()
+
+        start = time.perf_counter()
+        for _ in range(num_repeats):
+            forward()
+
+    return (time.perf_counter() - start) / num_repeats * 1000
+
+
+def evaluate_on_test_motions_error(
+    robot_config: RobotConfig,
+    extreme_filter_off: bool,
+    one_stage: bool,
+    evaluate_mode: EvaluateMode,
+    backend: InferBackend,
+) -> float:
+    """
+    Mean error of the best model of the evaluate mode on the test GT motions.
+    """
+    infer = infer_one_stage if one_stage else infer_two_stage
+
+    errors = []
+    for motion_idx in TEST_GT_MOTION_IDXS:
+        gt_motion = load_gt_motion(robot_config.robot_type, motion_idx)
+        pred_motion = infer(
+            robot_config=robot_config,
+            extreme_filter_off=extreme_filter_off,
+            human_pose_path=osp.join(AMASS_DATA_PATH, f"{motion_idx}_stageii.npz"),
+            device="cpu",
+            evaluate_mode=evaluate_mode,
+            backend=backend,
+        )
+        errors.append(calculate_error(robot_config, evaluate_mode, pred_motion, gt_motion))
+
+    return float(np.mean(errors))
@@ -0,0 +1,330 @@
+"""
+Local retargeting inference server.
+
+Host the retargeting models of every robot type in a single process and serve them over localhost HTTP.
+Concurrent requests for the same robot are coalesced into micro-batches, so that the model runs once for many
+requests instead of once per request.
+
+Endpoints:
+    POST /retarget  {"robot_type": "NAO", "smpl_rep": [[...36 values...], ...]}
+                    or {"robot_type": "NAO", "human_pose_path": "data/gt_motions/amass_data/02_05_stageii.npz"}
+                    (the human_pose_path must be a file under AMASS_DATA_PATH)
+                    (optional "smooth": true to smooth the predicted motion with the window of the robot)
+                    -> {"joint_keys": [...], "angles": [[...], ...]}
+    GET  /stats     -> throughput & latency counters of each robot's micro-batcher
+"""
+
+import json
+import os.path as osp
+import sys
+import time
+import threading
+import queue
+import numpy as np
+import torch
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, List
+
+sys.path.append("./src")
+from model.infer_with_one_stage import load_one_stage_model
+from model.infer_with_two_stage import load_two_stage_models
+from utils.RobotConfig import RobotConfig
+from utils.types import RobotType, EvaluateMode
+from utils.consts import *
+from utils.data import load_smpl_to_6D_reps
+from utils.smoothing import smooth_angles
+
+
+class RetargetJob:
+    """
+    A single retargeting request waiting in the micro-batching queue.
+    """
+
+    def __init__(self, smpl_rep: np.ndarray):
+        self.smpl_rep = smpl_rep  # shape: (num_frames, SMPL_ARM_JOINT_REPS_DIM)
+        self.enqueued_at = time.perf_counter()
+        self.done = threading.Event()
+        self.result: np.ndarray = None
+        self.error: Exception = None
+
+
+class BatcherStats:
+    """
+    Throughput & latency counters of a micro-batcher.
+    """
+
+    def __init__(self, window: int = 10000):
+        self.lock = threading.Lock()
+        self.started_at = time.perf_counter()
+        self.num_requests = 0
+        self.num_frames = 0
+        self.num_batches = 0
+        self.num_errors = 0
+        self.latencies_ms = deque(maxlen=window)  # latency of the recent requests
+        self.batch_sizes = deque(maxlen=window)  # number of requests of the recent batches
+
+    def record_batch(self, jobs: List[RetargetJob], num_frames: int):
+        now = time.perf_counter()
+        with self.lock:
+            self.num_batches += 1
+            self.num_requests += len(jobs)
+            self.num_frames += num_frames
+            self.batch_sizes.append(len(jobs))
+            for job in jobs:
+                self.latencies_ms.append((now - job.enqueued_at) * 1000)
+
+    def record_error(self, num_jobs: int):
+        with self.lock:
+            self.num_errors += num_jobs
+
+    def snapshot(self) -> dict:
+        with self.lock:
+            elapsed = time.perf_counter() - self.started_at
+            latencies = np.array(self.latencies_ms) if self.latencies_ms else np.zeros(1)
+            batch_sizes = np.array(self.batch_sizes) if self.batch_sizes else np.zeros(1)
+
+            return {
+                "uptime_s": elapsed,
+                "requests": self.num_requests,
+                "frames": self.num_frames,
+                "batches": self.num_batches,
+                "errors": self.num_errors,
+                "requests_per_s": self.num_requests / elapsed,
+                "frames_per_s": self.num_frames / elapsed,
+                "mean_requests_per_batch": float(batch_sizes.mean()),
+                "latency_ms_p50": float(np.percentile(latencies, 50)),
+                "latency_ms_p95": float(np.percentile(latencies, 95)),
+                "latency_ms_max": float(latencies.max()),
+            }
+
+
+class MicroBatcher:
+    """
+    Coalesce concurrent retargeting requests into micro-batches.
+
+    A background thread takes the first waiting job, then keeps collecting jobs until either `max_wait_ms` has
+    passed or `max_batch_frames` frames are gathered. The gathered frames are predicted with a single forward pass
+    and the result is split back to each job.
+    """
+
+    def __init__(
+        self,
+        predict_fn: Callable[[np.ndarray], np.ndarray],
+        max_batch_frames: int = SERVER_MAX_BATCH_FRAMES,
+        max_wait_ms: float = SERVER_MAX_WAIT_MS,
+    ):
+        self.predict_fn = predict_fn
+        self.max_batch_frames = max_batch_frames
+        self.max_wait_s = max_wait_ms / 1000
+        self.stats = BatcherStats()
+        self.jobs: "queue.Queue[RetargetJob]" = queue.Queue()
+
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+
+    def submit(self, smpl_rep: np.ndarray) -> np.ndarray:
+        """
+        Enqueue the SMPL reps and block until its predicted robot angles are ready.
+        """
+        job = RetargetJob(smpl_rep)
+        self.jobs.put(job)
+        job.done.wait()
+
+        if job.error is not None:
+            raise job.error
+        return job.result
+
+    def _collect(self) -> List[RetargetJob]:
+        # block until the first job arrives, then wait at most `max_wait_s` for the others
+        batch = [self.jobs.get()]
+        num_frames = len(batch[0].smpl_rep)
+        deadline = time.perf_counter() + self.max_wait_s
+
+        while num_frames < self.max_batch_frames:
+            timeout = deadline - time.perf_counter()
+            if timeout <= 0:
+                break
+            try:
+                job = self.jobs.get(timeout=timeout)
+            except queue.Empty:
+                break
+            batch.append(job)
+            num_frames += len(job.smpl_rep)
+
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._collect()
+            try:
+                # run a single forward pass for the whole batch and split the result back to each job
+                smpl_reps = np.concatenate([job.smpl_rep for job in batch], axis=0)
+                pred_angles = self.predict_fn(smpl_reps)
+                split_idxs = np.cumsum([len(job.smpl_rep) for job in batch])[:-1]
+
+                for job, angles in zip(batch, np.split(pred_angles, split_idxs)):
+                    job.result = angles
+                self.stats.record_batch(batch, len(smpl_reps))
+
+            except Exception as e:
+                for job in batch:
+                    job.error = e
+                self.stats.record_error(len(batch))
+
+            for job in batch:
+                job.done.set()
+
+
+class RetargetModelPool:
+    """
+    Keep the retargeting models of all the robot types in memory, each behind its own micro-batcher.
+    """
+
+    def __init__(
+        self,
+        robot_types: List[RobotType],
+        one_stage: bool,
+        extreme_filter_off: bool,
+        device: str,
+        evaluate_mode: EvaluateMode = EvaluateMode.LINK,
+        max_batch_frames: int = SERVER_MAX_BATCH_FRAMES,
+        max_wait_ms: float = SERVER_MAX_WAIT_MS,
+    ):
+        self.device = device
+        self.batchers: Dict[RobotType, MicroBatcher] = {}
+        self.joint_keys: Dict[RobotType, List[str]] = {}
+        self.smooth_windows: Dict[RobotType, int] = {}
+
+        for robot_type in robot_types:
+            robot_config = RobotConfig(robot_type)
+
+            if one_stage:
+                model = load_one_stage_model(
+                    robot_config=robot_config,
+                    extreme_filter_off=extreme_filter_off,
+                    device=device,
+                    evaluate_mode=evaluate_mode,
+                )
+                predict_fn = self._make_predict_fn([model], robot_config.angles_dim)
+            else:
+                model_pre, model_post = load_two_stage_models(
+                    robot_config=robot_config,
+                    extreme_filter_off=extreme_filter_off,
+                    device=device,
+                    evaluate_mode=evaluate_mode,
+                )
+                predict_fn = self._make_predict_fn([model_pre, model_post], robot_config.angles_dim)
+
+            self.joint_keys[robot_type] = sorted(robot_config.joi_keys)
+            self.smooth_windows[robot_type] = robot_config.smooth_window
+            self.batchers[robot_type] = MicroBatcher(predict_fn, max_batch_frames, max_wait_ms)
+
+    def _make_predict_fn(self, models: List[torch.nn.Module], output_dim: int):
+        def predict_fn(smpl_rep: np.ndarray) -> np.ndarray:
+            with torch.no_grad():
+                out = torch.from_numpy(smpl_rep).to(self.device).float()
+                for model in models:
+                    out = model(out)
+            return out.cpu().numpy()[:, :output_dim]
+
+        return predict_fn
+
+    def retarget(self, robot_type: RobotType, smpl_rep: np.ndarray) -> np.ndarray:
+        if robot_type not in self.batchers:
+            raise KeyError(f"The model for {robot_type.name} is not loaded.")
+        return self.batchers[robot_type].submit(smpl_rep)
+
+    def stats(self) -> dict:
+        return {robot_type.name: batcher.stats.snapshot() for robot_type, batcher in self.batchers.items()}
+
+
+def resolve_human_pose_path(path: str) -> str:
+    """
+    Real path of a requested SMPL file, which must be under AMASS_DATA_PATH (the server does not open other files).
+    """
+    amass_dir = osp.realpath(AMASS_DATA_PATH)
+    real_path = osp.realpath(path)
+    if osp.commonpath([amass_dir, real_path]) != amass_dir:
+        raise ValueError(f"human_pose_path should be a file under {AMASS_DATA_PATH}: {path}")
+    return real_path
+
+
+def make_request_handler(pool: RetargetModelPool):
+    class RetargetRequestHandler(BaseHTTPRequestHandler):
+        def _send_json(self, status: int, body: dict):
+            payload = json.dumps(body).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def do_GET(self):
+            if self.path == "/stats":
+                self._send_json(200, pool.stats())
+            else:
+                self._send_json(404, {"error": f"Unknown path: {self.path}"})
+
+        def do_POST(self):
+            if self.path != "/retarget":
+                self._send_json(404, {"error": f"Unknown path: {self.path}"})
+                return
+
+            try:
+                length = int(self.headers.get("Content-Length", 0))
+                request = json.loads(self.rfile.read(length))
+                robot_type = RobotType(request["robot_type"])
+
+                # the human pose is given either as the 6D reps of the arm joints or as a path of the SMPL file
+                if "smpl_rep" in request:
+                    smpl_rep = np.asarray(request["smpl_rep"], dtype=np.float32)
+                else:
+                    smpl_rep, _ = load_smpl_to_6D_reps(resolve_human_pose_path(request["human_pose_path"]))
+                    smpl_rep = smpl_rep.numpy().astype(np.float32)
+
+                if smpl_rep.ndim != 2 or smpl_rep.shape[1] != SMPL_ARM_JOINT_REPS_DIM:
+                    raise ValueError(f"smpl_rep should be shaped (N, {SMPL_ARM_JOINT_REPS_DIM}): {smpl_rep.shape}")
+
+            except (KeyError, ValueError, TypeError, OSError) as e:
+                self._send_json(400, {"error": str(e)})
+                return
+
+            try:
+                angles = pool.retarget(robot_type, smpl_rep)
+
+                # smooth the whole motion of the request (after the micro-batch is split back into the requests)
+                if request.get("smooth", False):
+                    angles = smooth_angles(angles, pool.smooth_windows[robot_type])
+            except Exception as e:
+                self._send_json(500, {"error": str(e)})
+                return
+
+            self._send_json(200, {"joint_keys": pool.joint_keys[robot_type], "angles": angles.tolist()})
+
+        def log_message(self, format, *args):
+            # do not print a log line for every request
+            pass
+
+    return RetargetRequestHandler
+
+
+def serve_retarget(
+    pool: RetargetModelPool,
+    host: str = SERVER_HOST,
+    port: int = SERVER_PORT,
+):
+    """
+    Serve the retargeting models of the pool over localhost HTTP until interrupted.
+    """
+    server = ThreadingHTTPServer((host, port), make_request_handler(pool))
+    server.daemon_threads = True
+    print(f"Serving retargeting models {[r.name for r in pool.batchers]} on http://{host}:{port}")
+
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        print(json.dumps(pool.stats(), indent=2))
@@ -2,7 +2,6 @@ import sys
 import torch
 import torch.optim as optim
 import torch.nn as nn
-import wandb
 import os
 from torch.utils.data import DataLoader
 from torch.distributions.bernoulli import Bernoulli
@@ -11,6 +10,8 @@ from tqdm import tqdm
 sys.path.append("./src")
 from model.net import MLP
 from utils.RobotConfig import RobotConfig
+from utils.torch_kinematics import TorchForwardKinematics, link_position_loss
+from utils.urdf import parse_urdf
 from utils.consts import *
 
 
@@ -22,6 +23,7 @@ def train_one_stage(
     test_dataloader: DataLoader,
     num_epochs: int,
     is_wandb: bool = False,
+    link_loss_weight: float = 0.0,
 ):
     """
     Train the one-stage model to predict robot joint angles from SMPL parameters.
@@ -35,7 +37,11 @@ def train_one_stage(
         test_dataloader (DataLoader): DataLoader for testing data
         num_epochs (int): Number of epochs
         is_wandb (bool): Whether to use wandb or not
+        link_loss_weight (float): Weight of the link-position loss of the evaluate links (0: joint angles MSE only)
     """
+    # wandb is imported only for logging, since it is slow to import
+    if is_wandb:
+        import wandb
 
     robot_name = robot_config.robot_type.name
 
@@ -62,10 +68,25 @@ def train_one_stage(
     optimizer = optim.Adam(model.parameters(), lr, weight_decay=1e-6)
     criterion = nn.MSELoss()
 
+    # differentiable FK of the evaluate links (the model predicts the joints in the sorted order of the data)
+    fk = None
+    if link_loss_weight > 0:
+        fk = TorchForwardKinematics(
+            parse_urdf(robot_config.URDF_PATH), sorted(robot_config.joi_keys), robot_config.evaluate_links
+        ).to(device)
+
+    def objective(pred_angle: torch.Tensor, gt_angle: torch.Tensor):
+        angle_loss = criterion(pred_angle, gt_angle)
+        if fk is None:
+            return angle_loss, 0.0
+        link_loss = link_position_loss(fk, pred_angle, gt_angle)
+        return angle_loss + link_loss_weight * link_loss, link_loss.item()
+
     # train the model
     print("Start training...")
     for epoch in tqdm(range(num_epochs)):
         train_loss = 0.0
+        train_link_loss = 0.0
         model.train()
 
         for sample in train_dataloader:
@@ -94,7 +115,7 @@ def train_one_stage(
             pred_angle: torch.Tensor = model(smpl_rep)
 
             # fmt: off
-            loss: torch.Tensor = criterion(pred_angle, gt_angle)
+            loss, link_loss = objective(pred_angle, gt_angle)
 
             # backprop and update parameters
             optimizer.zero_grad()
@@ -102,9 +123,11 @@ def train_one_stage(
             optimizer.step()
 
             train_loss += loss.item() / len(train_dataloader)
+            train_link_loss += link_loss / len(train_dataloader)
 
         # Get test loss
         test_loss = 0.0
+        test_link_loss = 0.0
         model.eval()
         for sample in test_dataloader:
             with torch.no_grad():
@@ -112,19 +135,23 @@ def train_one_stage(
                 pred_angle = model(smpl_rep)
                 gt_angle = sample["robot_angle"].float().to(device)
 
-                loss = criterion(pred_angle, gt_angle)
+                loss, link_loss = objective(pred_angle, gt_angle)
 
                 test_loss += loss.item() / len(test_dataloader)
+                test_link_loss += link_loss / len(test_dataloader)
 
         print(f"[EPOCH {epoch}] tr loss : {train_loss:.03f} te loss :{test_loss:.03f}")
+        if fk is not None:
+            print(f"[EPOCH {epoch}] tr link loss : {train_link_loss:.05f} te link loss :{test_link_loss:.05f}")
         if is_wandb:
             # log the loss values to wandb
-            wandb.log(
-                {
-                    "train_loss": train_loss,
-                    "test_loss": test_loss,
-                }
-            )
+            losses = {
+                "train_loss": train_loss,
+                "test_loss": test_loss,
+            }
+            if fk is not None:
+                losses.update({"train_link_loss": train_link_loss, "test_link_loss": test_link_loss})
+            wandb.log(losses)
 
         # Save the best model for every 50 epochs
         if epoch % MODEL_SAVE_EPOCH == 0:
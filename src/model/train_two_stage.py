@@ -2,7 +2,6 @@ import sys
 import torch
 import torch.optim as optim
 import torch.nn as nn
-import wandb
 import os
 from torch.utils.data import DataLoader
 from torch.distributions.bernoulli import Bernoulli
@@ -36,6 +35,10 @@ def train_two_stage(
         num_epochs (int): Number of epochs
         is_wandb (bool): Whether to use wandb or not
     """
+    # wandb is imported only for logging, since it is slow to import
+    if is_wandb:
+        import wandb
+
     robot_name = robot_config.robot_type.name
 
     # hyperparameters
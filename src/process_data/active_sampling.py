@@ -0,0 +1,271 @@
+"""
+Active data generation: the poses of the next generation round are biased toward the regions of the joint space where
+the retargeting error of the current model is high, instead of spending the IK where it already retargets well.
+
+A round: generate (tools/generate_data.py) -> train & pick the best model (tools/train.py, tools/evaluate_model.py)
+-> tools/active_round.py, which logs the validation error against the IK-hours spent so far and builds the error map of
+the next round (`tools/generate_data.py -emap`). tools/report_active_sampling.py compares the rounds with the uniform
+sampling.
+
+- ActiveErrorMap: retargeting errors of the held-out generated poses, which estimate the error of any pose by its
+  nearest held-out poses in the joint space (normalized by the joint ranges).
+- sample_active_joint_angles: a seed draws a pool of uniform candidates and keeps the candidates with the probability
+  of their estimated error (and a fraction of uniform poses, which keeps the coverage of the whole joint space).
+"""
+
+import sys
+import json
+import os
+import os.path as osp
+import numpy as np
+from typing import Dict, List, Tuple
+
+sys.path.append("./src")
+from utils.checkpoint import atomic_savez, atomic_json_dump, fingerprint
+from utils.RobotConfig import RobotConfig
+from utils.types import ActiveErrorSource, EvaluateMode
+from utils.consts import *
+
+
+class ActiveErrorMap:
+    """
+    Retargeting errors of the held-out poses over the joint space ([0, 1]^J, joints in the order of joi_keys).
+    """
+
+    def __init__(self, angles: np.ndarray, errors: np.ndarray, knn: int = ACTIVE_KNN):
+        # scipy.spatial is only needed for the active sampling
+        from scipy.spatial import cKDTree
+
+        self.angles = angles
+        self.errors = errors
+        self.knn = min(knn, len(angles))
+        self.tree = cKDTree(angles)
+
+    @classmethod
+    def from_joint_angles(cls, robot_config: RobotConfig, angles: np.ndarray, errors: np.ndarray) -> "ActiveErrorMap":
+        normalized = (angles - robot_config.joi_lower) / (robot_config.joi_upper - robot_config.joi_lower)
+        return cls(normalized, errors)
+
+    @classmethod
+    def load(cls, path: str) -> "ActiveErrorMap":
+        with np.load(path) as error_map:
+            return cls(error_map["angles"], error_map["errors"], int(error_map["knn"]))
+
+    def save(self, path: str):
+        os.makedirs(osp.dirname(path), exist_ok=True)
+        atomic_savez(path, angles=self.angles, errors=self.errors, knn=self.knn)
+
+    def fingerprint(self) -> str:
+        return fingerprint(np.concatenate([self.angles.ravel(), self.errors.ravel()]))
+
+    def estimate(self, normalized_angles: np.ndarray) -> np.ndarray:
+        """
+        Estimated error of the poses (M, J) in [0, 1]^J: mean error of their nearest held-out poses (M,)
+        """
+        _, idxs = self.tree.query(normalized_angles, k=self.knn)
+        return self.errors[idxs.reshape(len(normalized_angles), -1)].mean(axis=1)
+
+
+def sample_active_joint_angles(
+    robot_config: RobotConfig,
+    num_poses: int,
+    seed: int,
+    error_map: ActiveErrorMap,
+    uniform_frac: float = ACTIVE_UNIFORM_FRAC,
+    pool_factor: int = ACTIVE_POOL_FACTOR,
+) -> np.ndarray:
+    """
+    Sample the joint angles of a seed biased toward the high estimated errors: num_poses * uniform_frac poses are
+    uniform, and the others are drawn (without replacement) from num_poses * pool_factor uniform candidates with the
+    probability of their estimated errors. So the density of a region grows with its error, by pool_factor at most.
+
+    The poses depend only on the seed and the error map, so an interrupted seed is sampled again into the same poses.
+
+    Returns:
+        angles (ndarray): shape (num_poses, J), joints in the order of robot_config.joi_keys
+    """
+    num_joints = len(robot_config.joi_lower)
+    num_uniform = int(round(num_poses * uniform_frac))
+
+    # a child stream of the seed, not to be the same poses as the UNIFORM sampling
+    rng = np.random.default_rng(np.random.SeedSequence(seed, spawn_key=(2,)))
+    candidates = rng.random((num_poses * pool_factor, num_joints))
+
+    pool = candidates[num_uniform:]
+    weights = error_map.estimate(pool) + 1e-12
+    picked = rng.choice(len(pool), size=num_poses - num_uniform, replace=False, p=weights / weights.sum())
+    uniform = np.concatenate([candidates[:num_uniform], pool[np.sort(picked)]], axis=0)
+
+    return uniform * (robot_config.joi_upper - robot_config.joi_lower) + robot_config.joi_lower
+
+
+def angular_error(pred: np.ndarray, target: np.ndarray) -> np.ndarray:
+    """
+    Mean wrapped angular difference over the joints of each pose (same as the JOINT evaluation mode): (N, J) -> (N,)
+    """
+    diff = np.mod(pred - target, 2 * np.pi)
+    return np.minimum(diff, 2 * np.pi - diff).mean(axis=1)
+
+
+def heldout_pose_errors(
+    robot_config: RobotConfig,
+    num_data: int,
+    extreme_filter_off: bool,
+    one_stage: bool,
+    device: str,
+    evaluate_mode: EvaluateMode,
+    error_source: ActiveErrorSource,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Retargeting errors of the best model on the poses of the test seeds (stable split of utils/dataset_index.py).
+
+    HELDOUT: error of the predicted joint angles against the sampled joint angles.
+    DISAGREEMENT (two-stage model): post(pre(SMPL reps)) against post(robot reps), i.e. the error that the pre network
+        adds, which needs no labels.
+
+    Returns:
+        angles (np.ndarray): joint angles of the poses (N, J), joints in the order of robot_config.joi_keys
+        errors (np.ndarray): errors of the poses (N,)
+    """
+    # the models (torch) and the data loading (pytorch3d) are only needed to build the error map
+    import torch
+    from model.infer_with_one_stage import load_one_stage_model
+    from model.infer_with_two_stage import load_two_stage_models
+    from utils.data import load_seed_data
+    from utils.dataset_index import seed_split
+
+    if one_stage and error_source == ActiveErrorSource.DISAGREEMENT:
+        raise ValueError("The pre/post disagreement needs the two-stage model.")
+
+    seeds = [seed for seed in range(num_data) if seed_split(seed, DATA_SPLIT_RATIO) == "test"]
+    data = [
+        load_seed_data(seed, robot_config.SMPL_PARAMS_PATH, robot_config.XYZS_REPS_PATH, robot_config.ANGLES_PATH)
+        for seed in seeds
+    ]
+    smpl_reps = torch.from_numpy(np.concatenate([d["smpl_reps"] for d in data])).float().to(device)
+    robot_reps = torch.from_numpy(np.concatenate([d["robot_reps"] for d in data])).float().to(device)
+    robot_angles = np.concatenate([d["robot_angles"] for d in data])  # joints in the sorted order
+
+    with torch.no_grad():
+        if one_stage:
+            model = load_one_stage_model(robot_config, extreme_filter_off, device, evaluate_mode)
+            pred = model(smpl_reps)
+        else:
+            model_pre, model_post = load_two_stage_models(robot_config, extreme_filter_off, device, evaluate_mode)
+            pred = model_post(model_pre(smpl_reps))
+            teacher = model_post(robot_reps).cpu().numpy()[:, : robot_config.angles_dim]
+    pred = pred.cpu().numpy()[:, : robot_config.angles_dim]
+
+    target = teacher if error_source == ActiveErrorSource.DISAGREEMENT else robot_angles
+    errors = angular_error(pred, target)
+
+    # the data (and the models) order the joints by their sorted names
+    sorted_keys = sorted(robot_config.joi_keys)
+    angles = robot_angles[:, [sorted_keys.index(k) for k in robot_config.joi_keys]]
+
+    return angles, errors
+
+
+def validation_error(
+    robot_config: RobotConfig,
+    extreme_filter_off: bool,
+    one_stage: bool,
+    device: str,
+    evaluate_mode: EvaluateMode,
+) -> float:
+    """
+    Mean error of the best model on the validation GT motions (the motions which pick the best model).
+    """
+    from model.infer_with_one_stage import infer_one_stage
+    from model.infer_with_two_stage import infer_two_stage
+    from utils.calculate_error_from_motions import calculate_error
+    from utils.motion import load_gt_motion
+
+    infer = infer_one_stage if one_stage else infer_two_stage
+    errors = []
+    for motion_idx in VALID_GT_MOTION_IDXS:
+        pred_motion = infer(
+            robot_config=robot_config,
+            extreme_filter_off=extreme_filter_off,
+            human_pose_path=osp.join(AMASS_DATA_PATH, f"{motion_idx}_stageii.npz"),
+            device=device,
+            evaluate_mode=evaluate_mode,
+        )
+        gt_motion = load_gt_motion(robot_config.robot_type, motion_idx)
+        errors.append(calculate_error(robot_config, evaluate_mode, pred_motion, gt_motion))
+
+    return float(np.mean(errors))
+
+
+def ik_hours(robot_config: RobotConfig, num_data: int) -> Tuple[float, int]:
+    """
+    IK wall time (hours) of the seeds from their IK reports.
+
+    Returns:
+        hours (float): IK-hours of the seeds
+        num_missing (int): seeds without the IK wall time (generated before it was recorded: first pass time instead)
+    """
+    hours, num_missing = 0.0, 0
+    for seed in range(num_data):
+        with open(osp.join(robot_config.SMPL_PARAMS_PATH, ik_report_path(seed))) as f:
+            ik_report = json.load(f)
+        if "ik_wall_time" in ik_report:
+            hours += ik_report["ik_wall_time"] / 3600
+        else:
+            hours += ik_report.get("first_pass", {}).get("wall_time", 0.0) / 3600
+            num_missing += 1
+
+    return hours, num_missing
+
+
+def log_active_round(log_path: str, record: dict) -> List[dict]:
+    """
+    Append the record of a round to the log of the arm (JSON list of the rounds).
+    """
+    rounds = []
+    if osp.exists(log_path):
+        with open(log_path) as f:
+            rounds = json.load(f)
+    rounds.append({"round": len(rounds), **record})
+
+    os.makedirs(osp.dirname(log_path), exist_ok=True)
+    atomic_json_dump(rounds, log_path)
+    return rounds
+
+
+def active_sampling_report(arms: Dict[str, List[dict]], baseline: str = "uniform") -> List[str]:
+    """
+    Report lines of the rounds of each arm: validation error per IK-hour, and the validation error of the baseline arm
+    (uniform sampling) at the same IK-hours (linear interpolation between its rounds).
+    """
+    lines = []
+    for arm, rounds in arms.items():
+        lines.append(f"[{arm}]")
+        lines.append(
+            f"{'round':>5} | {'seeds':>6} | {'IK-hours':>9} | {'val error':>10} | {'d error / IK-hour':>17} | "
+            f"{f'vs. {baseline}':>12}"
+        )
+
+        prev = None
+        for r in rounds:
+            # the error reduction per IK-hour since the previous round
+            rate = "-"
+            if prev is not None and r["ik_hours"] > prev["ik_hours"]:
+                rate = f"{(prev['val_error'] - r['val_error']) / (r['ik_hours'] - prev['ik_hours']):.6f}"
+
+            # the error of the baseline at the same IK-hours (only within the IK-hours of its rounds)
+            delta = "-"
+            if arm != baseline and baseline in arms and len(arms[baseline]) > 0:
+                base_hours = [b["ik_hours"] for b in arms[baseline]]
+                if base_hours[0] <= r["ik_hours"] <= base_hours[-1]:
+                    base_error = np.interp(r["ik_hours"], base_hours, [b["val_error"] for b in arms[baseline]])
+                    delta = f"{(r['val_error'] - base_error) / base_error * 100:+.1f}%"
+
+            lines.append(
+                f"{r['round']:>5} | {r['num_data']:>6} | {r['ik_hours']:>9.3f} | {r['val_error']:>10.6f} | "
+                f"{rate:>17} | {delta:>12}"
+            )
+            prev = r
+        lines.append("")
+
+    return lines
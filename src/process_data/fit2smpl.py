@@ -1,10 +1,59 @@
 import numpy as np
 import sys
+from typing import Optional, Tuple
 
 sys.path.append("./src")
-from utils.hbp import run_ik_engine
 from utils.consts import *
 from utils.RobotConfig import RobotConfig
+from utils.checkpoint import IkCheckpoint
+
+
+def dedup_keypoints(xyzs4smpl: np.ndarray, tol: float) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Cluster the near-duplicate poses: a pose joins the cluster of the first representative pose whose SMPL keypoints
+    are all within tol (per coordinate, Chebyshev distance) of its keypoints. So sharing the IK result of the
+    representative moves the keypoints of a pose by tol at most.
+
+    Args:
+        xyzs4smpl (np.ndarray): SMPL keypoints of the poses (N, num_joints, 3)
+        tol (float): tolerance (m)
+
+    Returns:
+        representative_idxs (np.ndarray): indices of the representative poses (M,)
+        cluster_idxs (np.ndarray): cluster (index in representative_idxs) of each pose (N,)
+    """
+    # scipy.spatial is only needed for the dedup
+    from scipy.spatial import cKDTree
+
+    keypoints = xyzs4smpl.reshape(len(xyzs4smpl), -1)
+    neighbors = cKDTree(keypoints).query_ball_point(keypoints, r=tol, p=np.inf)
+
+    representative_idxs = []
+    cluster_idxs = np.full(len(keypoints), -1, dtype=np.int64)
+    for i in range(len(keypoints)):
+        if cluster_idxs[i] != -1:
+            continue
+
+        # neighbors of the representative, which are not in a cluster yet
+        members = np.asarray(neighbors[i], dtype=np.int64)
+        members = members[cluster_idxs[members] == -1]
+        cluster_idxs[members] = len(representative_idxs)
+        representative_idxs.append(i)
+
+    return np.asarray(representative_idxs, dtype=np.int64), cluster_idxs
+
+
+def xyzs_to_ik_frame(original_xyzs4smpl: np.ndarray) -> np.ndarray:
+    """
+    Convert the SMPL keypoints of the robot poses into the frame of the IK: (x, y, z) => (y, z, x)
+    """
+    xyzs4smpl = np.zeros_like(original_xyzs4smpl)
+
+    xyzs4smpl[:, :, 0] = original_xyzs4smpl[:, :, 1]
+    xyzs4smpl[:, :, 1] = original_xyzs4smpl[:, :, 2]
+    xyzs4smpl[:, :, 2] = original_xyzs4smpl[:, :, 0]
+
+    return xyzs4smpl
 
 
 def fit2smpl(
@@ -12,7 +61,17 @@ def fit2smpl(
     original_xyzs4smpl: np.ndarray,
     device: str,
     verbosity: int = 0,
-) -> dict:
+    dedup_tol: float = IK_DEDUP_TOL,
+    max_retries: int = IK_MAX_RETRIES,
+    quarantine: bool = True,
+    ik_checkpoint: Optional[IkCheckpoint] = None,
+    ik_regressor=None,
+    refine_iters: int = IK_REGRESSOR_REFINE_ITERS,
+    continuous: bool = False,
+    round_iters: int = IK_ROUND_ITERS,
+    batch_size: int = VPOSER_BATCH_SIZE,
+    worker_pool=None,
+) -> Tuple[dict, dict]:
     """
     Fit robot's pose data to SMPL parameters by running VPoser's Inverse Kinematics Engine.
 
@@ -21,28 +80,90 @@ def fit2smpl(
         original_xyzs4smpl (np.ndarray): Original xyzs4smpl data
         device (str): Device for running the code
         verbosity (int): Verbosity level
+        dedup_tol (float): Tolerance (m) of the near-duplicate poses which share a single IK solve (0: no dedup)
+        max_retries (int): Number of retries of the poses whose IK results are NaN
+        quarantine (bool): Drop the poses which are still NaN after the retries (otherwise, raise ValueError)
+        ik_checkpoint (IkCheckpoint): Batch-level checkpoints of the IK results (None: no checkpoints)
+        ik_regressor (process_data.ik_regressor.IkRegressor): Learned IK whose predictions start the LBFGS
+            (None: the LBFGS starts from the rest pose and runs in full)
+        refine_iters (int): LBFGS iterations after the learned IK (0: use its predictions as they are)
+        continuous (bool): Retire the converged poses from the IK batch and refill their slots (continuous batching)
+        round_iters (int): LBFGS iterations between the convergence checks of the continuous batching
+        batch_size (int): IK batch size (or the number of slots of the continuous batching)
+        worker_pool (utils.hbp.IkWorkerPool): Worker processes which fit the IK batches in parallel (None: in process)
 
     Returns:
-        smpl_data (dict): SMPL parameters
+        smpl_data (dict): SMPL parameters (without the quarantined poses)
+        ik_report (dict): IK counters of the poses (quarantined_poses: indices of the dropped poses)
     """
 
+    # the IK engine (torch, human_body_prior) is not needed for the dedup
+    from utils.hbp import run_ik_engine
+
     # Convert (x, y, z) => (y, z, x)
-    xyzs4smpl = np.zeros_like(original_xyzs4smpl)
+    xyzs4smpl = xyzs_to_ik_frame(original_xyzs4smpl)
 
-    xyzs4smpl[:, :, 0] = original_xyzs4smpl[:, :, 1]
-    xyzs4smpl[:, :, 1] = original_xyzs4smpl[:, :, 2]
-    xyzs4smpl[:, :, 2] = original_xyzs4smpl[:, :, 0]
+    # Fit only a representative of each cluster of the near-duplicate poses
+    num_poses = len(xyzs4smpl)
+    if dedup_tol > 0:
+        representative_idxs, cluster_idxs = dedup_keypoints(xyzs4smpl, dedup_tol)
+        num_skipped = len(xyzs4smpl) - len(representative_idxs)
+        print(
+            f"IK dedup (tol {dedup_tol} m): fitting {len(representative_idxs)} of {len(xyzs4smpl)} poses, "
+            f"skipped {num_skipped} IK solves ({num_skipped / len(xyzs4smpl) * 100:.1f}%)"
+        )
+        xyzs4smpl = xyzs4smpl[representative_idxs]
+
+    # The learned IK predicts the SMPL parameters, which are refined by a few LBFGS iterations
+    ik_kwargs = {}
+    if ik_regressor is not None:
+        ik_kwargs = {"initial_params": ik_regressor.predict(xyzs4smpl), "max_iter": refine_iters}
 
     # Run VPoser's Inverse Kinematics Engine to fit the robot's pose data to SMPL parameters
-    smpl_data = run_ik_engine(
+    # (the poses whose results are NaN are retried, and quarantined if they are still NaN)
+    smpl_data, ik_report = run_ik_engine(
         motion=xyzs4smpl,
-        batch_size=VPOSER_BATCH_SIZE,
+        batch_size=batch_size,
         smpl_path=SMPL_PATH,
         vposer_path=VPOSER_PATH,
         num_betas=NUM_BETAS,
         device=device,
         verbosity=verbosity,
         smpl_joint_idx=robot_config.smpl_joint_idx,
+        max_retries=max_retries,
+        retry_lr_decay=IK_RETRY_LR_DECAY,
+        retry_init_std=IK_RETRY_INIT_STD,
+        quarantine=quarantine,
+        checkpoint=ik_checkpoint,
+        continuous=continuous,
+        round_iters=round_iters,
+        worker_pool=worker_pool,
+        **ik_kwargs,
     )
+    quarantined_frames = np.asarray(ik_report.pop("quarantined_frames"), dtype=np.int64)
+
+    # Share the results of the representatives with the members of their clusters
+    # (betas are shared by all the poses: median of the representatives)
+    if dedup_tol > 0:
+        # a quarantined representative quarantines its whole cluster
+        representative_valid = np.ones(len(representative_idxs), dtype=bool)
+        representative_valid[quarantined_frames] = False
+        valid = representative_valid[cluster_idxs]
+
+        # index of each valid pose's representative in the results (which exclude the quarantined representatives)
+        result_idxs = (np.cumsum(representative_valid) - 1)[cluster_idxs[valid]]
+        num_results = int(representative_valid.sum())
+        for k, v in smpl_data.items():
+            if k != "betas" and isinstance(v, np.ndarray) and v.ndim > 0 and len(v) == num_results:
+                smpl_data[k] = v[result_idxs]
+
+        ik_report["num_dedup_skipped"] = num_poses - len(representative_idxs)
+        quarantined_poses = np.flatnonzero(~valid)
+    else:
+        quarantined_poses = quarantined_frames
+
+    ik_report["num_poses"] = num_poses
+    ik_report["num_quarantined_poses"] = len(quarantined_poses)
+    ik_report["quarantined_poses"] = quarantined_poses.tolist()
 
-    return smpl_data
+    return smpl_data, ik_report
@@ -0,0 +1,166 @@
+"""
+Autotuner of the IK on CPU nodes: benchmarks the IK batch size, the torch threads of an IK process and the number of
+IK worker processes (which shard the batches of a seed) on the detected CPU topology, and persists the fastest
+configuration for `tools/generate_data.py -at`.
+
+The configurations are saved per CPU topology in IK_AUTOTUNE_PATH, so a shared file serves the different nodes.
+"""
+
+import sys
+import os
+import os.path as osp
+import json
+import platform
+from typing import List, Optional
+
+sys.path.append("./src")
+from process_data.fit2smpl import xyzs_to_ik_frame
+from process_data.sample_robot_data import sample_robot_data
+from utils.checkpoint import atomic_json_dump
+from utils.RobotConfig import RobotConfig
+from utils.consts import *
+
+
+def cpu_topology() -> dict:
+    """
+    CPU topology of the node: model, usable logical CPUs (affinity), physical cores, and sockets.
+    """
+    logical_cpus = sorted(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else list(range(os.cpu_count()))
+
+    # physical cores: distinct (socket, core) pairs of the usable logical CPUs (SMT siblings share a core)
+    cores = set()
+    for cpu in logical_cpus:
+        topology_dir = f"/sys/devices/system/cpu/cpu{cpu}/topology"
+        try:
+            with open(osp.join(topology_dir, "physical_package_id")) as f:
+                socket = int(f.read())
+            with open(osp.join(topology_dir, "core_id")) as f:
+                cores.add((socket, int(f.read())))
+        except (OSError, ValueError):
+            cores.add((0, cpu))
+
+    cpu_model = platform.processor()
+    if osp.exists("/proc/cpuinfo"):
+        with open("/proc/cpuinfo") as f:
+            model_names = [line.split(":", 1)[1].strip() for line in f if line.startswith("model name")]
+        cpu_model = model_names[0] if len(model_names) > 0 else cpu_model
+
+    return {
+        "cpu_model": cpu_model,
+        "logical_cpus": len(logical_cpus),
+        "physical_cores": len(cores),
+        "sockets": len({socket for socket, _ in cores}),
+    }
+
+
+def topology_key(topology: dict) -> str:
+    return f"{topology['cpu_model']} / {topology['physical_cores']} cores / {topology['logical_cpus']} cpus"
+
+
+def candidate_configs(topology: dict, batch_sizes: List[int], max_workers: int) -> List[dict]:
+    """
+    (num_workers, num_threads, batch_size) candidates: the workers split the physical cores evenly (powers of two up
+    to max_workers), each with a thread per core.
+    """
+    configs = []
+    num_workers = 1
+    while num_workers <= min(max_workers, topology["physical_cores"]):
+        num_threads = topology["physical_cores"] // num_workers
+        for batch_size in batch_sizes:
+            configs.append({"num_workers": num_workers, "num_threads": num_threads, "batch_size": batch_size})
+        num_workers *= 2
+    return configs
+
+
+def autotune_ik(
+    robot_config: RobotConfig,
+    batch_sizes: List[int],
+    num_poses: int,
+    max_iter: int,
+    max_workers: int,
+) -> dict:
+    """
+    Benchmark the candidate configurations with the first pass IK of `num_poses` poses (LBFGS of `max_iter`
+    iterations, which is enough to compare the throughput), and save the fastest configuration.
+
+    Returns:
+        config (dict): {num_workers, num_threads, batch_size, poses_per_s, topology, results}
+    """
+    # the IK engine (torch, human_body_prior) is needed only for the benchmark
+    import torch
+    from utils.hbp import run_ik_engine, IkWorkerPool
+
+    topology = cpu_topology()
+    print(f"CPU: {topology_key(topology)} ({topology['sockets']} sockets)")
+
+    _, _, _, xyzs4smpl = sample_robot_data(robot_config.robot_type, num_poses, NUM_SEEDS)
+    motion = xyzs_to_ik_frame(xyzs4smpl)
+
+    results = []
+    for config in candidate_configs(topology, batch_sizes, max_workers):
+        torch.set_num_threads(config["num_threads"])
+        worker_pool = None
+        if config["num_workers"] > 1:
+            worker_pool = IkWorkerPool(
+                num_workers=config["num_workers"],
+                num_threads=config["num_threads"],
+                vposer_path=VPOSER_PATH,
+                smpl_path=SMPL_PATH,
+                num_betas=NUM_BETAS,
+                smpl_joint_idx=robot_config.smpl_joint_idx,
+                device="cpu",
+            )
+
+        # warm up the workers (loading VPoser and SMPL-X) before the measurement
+        # (a single process loads VPoser within the measurement, which is small against the IK of num_poses poses)
+        if worker_pool is not None:
+            list(worker_pool.imap_unordered([(-1, motion[:1], {}, max_iter)] * 2 * config["num_workers"]))
+
+        _, ik_report = run_ik_engine(
+            motion=motion,
+            batch_size=config["batch_size"],
+            smpl_path=SMPL_PATH,
+            vposer_path=VPOSER_PATH,
+            num_betas=NUM_BETAS,
+            device="cpu",
+            verbosity=0,
+            smpl_joint_idx=robot_config.smpl_joint_idx,
+            quarantine=True,
+            max_iter=max_iter,
+            worker_pool=worker_pool,
+        )
+        if worker_pool is not None:
+            worker_pool.close()
+
+        poses_per_s = num_poses / ik_report["first_pass"]["wall_time"]
+        results.append({**config, "poses_per_s": poses_per_s})
+        print(
+            f"workers {config['num_workers']:>3} | threads {config['num_threads']:>3} | "
+            f"batch {config['batch_size']:>5} | {poses_per_s:>8.1f} poses/s"
+        )
+
+    best = max(results, key=lambda r: r["poses_per_s"])
+    config = {**best, "topology": topology, "max_iter": max_iter, "results": results}
+
+    # save the configuration of this topology (keeping the other topologies)
+    configs = {}
+    if osp.exists(IK_AUTOTUNE_PATH):
+        with open(IK_AUTOTUNE_PATH) as f:
+            configs = json.load(f)
+    configs[topology_key(topology)] = config
+    os.makedirs(osp.dirname(IK_AUTOTUNE_PATH), exist_ok=True)
+    atomic_json_dump(configs, IK_AUTOTUNE_PATH)
+
+    return config
+
+
+def load_ik_config() -> Optional[dict]:
+    """
+    Load the autotuned IK configuration of this node's CPU topology (None if it is not tuned yet).
+    """
+    if not osp.exists(IK_AUTOTUNE_PATH):
+        return None
+
+    with open(IK_AUTOTUNE_PATH) as f:
+        configs = json.load(f)
+    return configs.get(topology_key(cpu_topology()))
@@ -0,0 +1,180 @@
+"""
+Learned IK: a regressor from the SMPL keypoints of the robot poses (IK frame) to the SMPL parameters of their IK
+results (root_orient, pose_body, trans), trained on the generated data.
+
+Its predictions replace the LBFGS of VPoser's IK engine (refine_iters = 0) or start a few LBFGS iterations instead of
+the full 500 iterations from the rest pose (see fit2smpl).
+"""
+
+import sys
+import os
+import os.path as osp
+import numpy as np
+import torch
+import torch.nn as nn
+import torch.optim as optim
+from typing import Dict, Tuple
+from tqdm import tqdm
+
+sys.path.append("./src")
+from model.net import MLP
+from process_data.fit2smpl import xyzs_to_ik_frame
+from utils.RobotConfig import RobotConfig
+from utils.dataset_index import seed_split
+from utils.consts import *
+
+# SMPL parameters predicted by the regressor (name, dim)
+IK_REGRESSOR_PARAMS = [("root_orient", 3), ("pose_body", 63), ("trans", 3)]
+
+
+def load_ik_training_data(
+    robot_config: RobotConfig, num_data: int
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Load the SMPL keypoints of the robot poses and the SMPL parameters of their IK results (both in the IK frame).
+
+    Args:
+        robot_config (RobotConfig): Robot configuration
+        num_data (int): Number of the seeds to load
+
+    Returns:
+        x (np.ndarray): SMPL keypoints (N, num_joints * 3)
+        y (np.ndarray): root_orient, pose_body, trans (N, 69)
+        betas (np.ndarray): betas of the seeds (num_data, num_betas)
+        num_poses (np.ndarray): number of the poses of the seeds (num_data,)
+    """
+    # the coordinate transform of the IK results needs the SMPL-X body model
+    from utils.hbp import transform_smpl_coordinate
+
+    xs, ys, betas = [], [], []
+    for idx in tqdm(range(num_data), desc="Loading IK data"):
+        xyzs4smpl = np.load(osp.join(robot_config.XYZS_REPS_PATH, robot_xyzs_reps_path(idx)))["xyzs4smpl"]
+        smpl_params = dict(np.load(osp.join(robot_config.SMPL_PARAMS_PATH, smpl_params_path(idx))))
+
+        # undo the coordinate transform of run_ik_engine (rotation about the pelvis by 90 degrees around X)
+        smpl_params.update(
+            transform_smpl_coordinate(
+                bm_fname=SMPL_PATH,
+                trans=smpl_params["trans"],
+                root_orient=smpl_params["root_orient"],
+                betas=smpl_params["betas"],
+                rotxyz=[-90, 0, 0],
+            )
+        )
+
+        xs.append(xyzs_to_ik_frame(xyzs4smpl).reshape(len(xyzs4smpl), -1))
+        ys.append(np.concatenate([smpl_params[k] for k, _ in IK_REGRESSOR_PARAMS], axis=1))
+        betas.append(smpl_params["betas"])
+
+    num_poses = np.array([len(x) for x in xs])
+    return np.concatenate(xs, axis=0), np.concatenate(ys, axis=0), np.stack(betas, axis=0), num_poses
+
+
+class IkRegressor:
+    """
+    Learned IK model (MLP) with the normalization of its inputs and outputs, and the betas of its training data.
+    """
+
+    def __init__(self, model: MLP, stats: Dict[str, np.ndarray], device: str):
+        self.model = model.to(device).eval()
+        self.stats = stats
+        self.device = device
+
+    @classmethod
+    def load(cls, path: str, device: str) -> "IkRegressor":
+        ckpt = torch.load(path, map_location="cpu")
+        stats = {k: v.numpy() for k, v in ckpt["stats"].items()}
+
+        model = MLP(
+            dim_input=len(stats["x_mean"]),
+            dim_output=len(stats["y_mean"]),
+            dim_hidden=ckpt["dim_hidden"],
+        )
+        model.load_state_dict(ckpt["state_dict"])
+        return cls(model, stats, device)
+
+    def predict(self, motion: np.ndarray) -> Dict[str, np.ndarray]:
+        """
+        motion: SMPL keypoints in the IK frame (N, num_joints, 3) -> {root_orient, pose_body, trans, betas} (N, dim)
+        """
+        x = (motion.reshape(len(motion), -1) - self.stats["x_mean"]) / self.stats["x_std"]
+        with torch.no_grad():
+            y = self.model(torch.from_numpy(x).float().to(self.device)).cpu().numpy()
+        y = y * self.stats["y_std"] + self.stats["y_mean"]
+
+        params, i = {}, 0
+        for k, dim in IK_REGRESSOR_PARAMS:
+            params[k] = y[:, i : i + dim]
+            i += dim
+        params["betas"] = np.repeat(self.stats["betas"][None], len(motion), axis=0)
+
+        return params
+
+
+def train_ik_regressor(robot_config: RobotConfig, device: str, num_data: int, num_epochs: int):
+    """
+    Train the learned IK on the generated data and save the weights of the best test loss.
+
+    Args:
+        robot_config (RobotConfig): Robot configuration
+        device (str): Device for running the code
+        num_data (int): Number of the seeds to train on (every DATA_SPLIT_RATIO-th seed is the test data)
+        num_epochs (int): Number of epochs
+    """
+    x, y, betas, num_poses = load_ik_training_data(robot_config, num_data)
+
+    # the test seeds of the stable split of the retargeting models (utils/dataset_index.py)
+    is_test = np.repeat([seed_split(seed, DATA_SPLIT_RATIO) == "test" for seed in range(num_data)], num_poses)
+    stats = {
+        "x_mean": x.mean(0),
+        "x_std": x.std(0) + 1e-6,
+        "y_mean": y.mean(0),
+        "y_std": y.std(0) + 1e-6,
+        "betas": np.median(betas, axis=0),
+    }
+    x = torch.from_numpy((x - stats["x_mean"]) / stats["x_std"]).float()
+    y = torch.from_numpy((y - stats["y_mean"]) / stats["y_std"]).float()
+    is_test = torch.from_numpy(is_test)
+    x_test, y_test = x[is_test].to(device), y[is_test].to(device)
+    x_train, y_train = x[~is_test], y[~is_test]
+
+    # define model, optimizer, and loss function
+    model = MLP(dim_input=x.shape[1], dim_output=y.shape[1], dim_hidden=HIDDEN_DIM).to(device)
+    optimizer = optim.Adam(model.parameters(), LEARNING_RATE, weight_decay=1e-6)
+    criterion = nn.MSELoss()
+
+    weight_path = IK_REGRESSOR_PATH(robot_config.robot_type.name)
+    os.makedirs(osp.dirname(weight_path), exist_ok=True)
+
+    print("Start training...")
+    best_loss = np.inf
+    for epoch in tqdm(range(num_epochs)):
+        train_loss = 0.0
+        model.train()
+
+        batches = torch.randperm(len(x_train)).split(IK_REGRESSOR_BATCH_SIZE)
+        for batch in batches:
+            loss: torch.Tensor = criterion(model(x_train[batch].to(device)), y_train[batch].to(device))
+
+            optimizer.zero_grad()
+            loss.backward()
+            optimizer.step()
+
+            train_loss += loss.item() / len(batches)
+
+        model.eval()
+        with torch.no_grad():
+            test_loss = criterion(model(x_test), y_test).item()
+
+        print(f"[EPOCH {epoch}] tr loss : {train_loss:.04f} te loss :{test_loss:.04f}")
+
+        if test_loss < best_loss:
+            best_loss = test_loss
+            torch.save(
+                {
+                    "state_dict": model.state_dict(),
+                    "stats": {k: torch.from_numpy(v) for k, v in stats.items()},
+                    "dim_hidden": HIDDEN_DIM,
+                },
+                weight_path,
+            )
@@ -1,21 +1,98 @@
 import numpy as np
-import kinpy as kp
 import sys
+import warnings
+from typing import Dict
 
 sys.path.append("./src")
 from utils.consts import *
-from utils.types import RobotType
+from utils.types import RobotType, SamplingMode
 from utils.RobotConfig import RobotConfig
-from utils.forward_kinematics import forward_kinematics
 
 
-def sample_robot_data(robot_type: RobotType, num_poses: int, seed: int):
+def sample_joint_angles(
+    robot_config: RobotConfig, num_poses: int, seed: int, sampling_mode: SamplingMode = SamplingMode.UNIFORM
+) -> np.ndarray:
+    """
+    Sample random joint angles in the ranges of the joints of interest, drawn as a single (num_poses, J) block.
+
+    UNIFORM: draw from the per-seed np.random.Generator (independent streams, safe for parallel workers).
+    LEGACY: draw from np.random.RandomState(seed). The legacy sampling drew a scalar np.random.rand() per joint and
+            per pose after np.random.seed(seed), which is the same stream in the same (row-major) order, so the angles
+            are bit-exactly the same. The global random state is not touched.
+    SOBOL, HALTON: the poses of a seed are the block [seed * num_poses, (seed + 1) * num_poses) of a single scrambled
+            low-discrepancy sequence, so that the union of all the seeds covers the joint space evenly while each
+            seed can still be generated independently.
+    LHS: Latin hypercube of the seed (each joint range is split into num_poses strata, one pose per stratum).
+
+    Returns:
+        angles (ndarray): shape (num_poses, J), joints in the order of robot_config.joi_keys
+    """
+    if sampling_mode == SamplingMode.UNIFORM:
+        uniform = np.random.default_rng(seed).random((num_poses, len(robot_config.joi_lower)))
+    elif sampling_mode == SamplingMode.LEGACY:
+        uniform = np.random.RandomState(seed).random_sample((num_poses, len(robot_config.joi_lower)))
+    elif sampling_mode in [SamplingMode.SOBOL, SamplingMode.HALTON, SamplingMode.LHS]:
+        # scipy.stats is slow to import, and only needed for the quasi-random sampling
+        from scipy.stats import qmc
+
+        num_joints = len(robot_config.joi_lower)
+        if sampling_mode == SamplingMode.LHS:
+            uniform = qmc.LatinHypercube(num_joints, seed=seed).random(num_poses)
+        else:
+            engine_class = qmc.Sobol if sampling_mode == SamplingMode.SOBOL else qmc.Halton
+            engine = engine_class(num_joints, scramble=True, seed=QMC_SCRAMBLE_SEED)
+            # Sobol' warns if the block is not a power of 2, but the balance holds for the union of the blocks
+            with warnings.catch_warnings():
+                warnings.simplefilter("ignore", UserWarning)
+                if seed > 0:  # fast_forward(0) overflows in scipy's Sobol'
+                    engine.fast_forward(seed * num_poses)
+                uniform = engine.random(num_poses)
+    else:
+        raise ValueError(f"Unsupported sampling mode: {sampling_mode}")
+
+    # U(0, 1) * (MAX - MIN) + MIN: Random value in range (MIN, MAX).
+    return uniform * (robot_config.joi_upper - robot_config.joi_lower) + robot_config.joi_lower
+
+
+def joint_space_coverage(
+    robot_config: RobotConfig, angles: np.ndarray, num_probes: int = COVERAGE_NUM_PROBES, seed: int = 0
+) -> Dict[str, float]:
+    """
+    Coverage of the joint space by the sampled poses: the distance from uniform random probe poses to their nearest
+    sampled pose, in the joint space normalized by the joint ranges ([0, 1]^J). Smaller gaps mean fewer holes.
+
+    Returns:
+        coverage: {"mean_gap": mean distance, "max_gap": max distance (estimate of the covering radius)}
+    """
+    from scipy.spatial import cKDTree
+
+    normalized = (angles - robot_config.joi_lower) / (robot_config.joi_upper - robot_config.joi_lower)
+
+    # the probes are drawn from a child stream of the seed, not to be the same poses as the UNIFORM sampling
+    probe_rng = np.random.default_rng(np.random.SeedSequence(seed, spawn_key=(1,)))
+    probes = probe_rng.random((num_probes, normalized.shape[1]))
+    gaps, _ = cKDTree(normalized).query(probes)
+
+    return {"mean_gap": float(gaps.mean()), "max_gap": float(gaps.max())}
+
+
+def sample_robot_data(
+    robot_type: RobotType,
+    num_poses: int,
+    seed: int,
+    sampling_mode: SamplingMode = SamplingMode.UNIFORM,
+    error_map=None,
+):
     """
     Sample random robot poses for each seed.
 
     Args:
         robot_type (RobotType): Robot type
         num_poses (int): Number of motions to be sampled
+        seed (int): Random seed
+        sampling_mode (SamplingMode): Random stream of the joint angles (LEGACY: same poses as the legacy sampling)
+        error_map (process_data.active_sampling.ActiveErrorMap): Retargeting errors of the current model, which bias the poses toward the high
+            errors (active sampling, see process_data/active_sampling.py). None: sample by the sampling mode
 
     Returns:
         angles_list (list): List of joint angles
@@ -24,44 +101,41 @@ def sample_robot_data(robot_type: RobotType, num_poses: int, seed: int):
         xyzs4smpl_array (ndarray): Numpy array of xyz positions of SMPL joints
     """
 
-    # set the random seed
-    np.random.seed(seed)
+    # kinpy & the forward kinematics (torch, pytorch3d) are not needed for sampling the joint angles only
+    import kinpy as kp
+    from utils.forward_kinematics import link_poses
 
     # load the robot configurations and build a kinematic chain
     robot_config = RobotConfig(robot_type)
     chain = kp.build_chain_from_urdf(open(robot_config.URDF_PATH).read())
 
-    angles_list = []
+    # Sample robot poses as many as num_poses
+    # angles_list: list of joints angle dicts (num_poses, joint_num) of {k: joint, v: angle}
+    #              (roll, pitch, yaw of joints)
+    if error_map is not None:
+        from process_data.active_sampling import sample_active_joint_angles
+
+        angles_array = sample_active_joint_angles(robot_config, num_poses, seed, error_map)
+    else:
+        angles_array = sample_joint_angles(robot_config, num_poses, seed, sampling_mode)
+    angles_list = [dict(zip(robot_config.joi_keys, angles)) for angles in angles_array.tolist()]
+
     xyzs_list = []
     reps_list = []
-    xyzs4smpl_list = []
 
-    # Sample robot poses as many as num_poses
-    for i in range(num_poses):
-        # fmt: off
-        # angles: list of joints angle dicts (num_iter, joint_num) of {k: joint, v: angle}
-        #         (roll, pitch, yaw of joints)
-        # k: joint key, v[0]: MIN, v[1]: MAX,
-        # v[1] - v[0]: Maximum range of each joint key.
-        # np.random.rand() * (MAX - MIN) + MIN: Random value in range (MIN, MAX).
-        angles = {
-            k: ((np.random.rand() * (v[1] - v[0])) + v[0])
-            for k, v in robot_config.joi_range.items()
-        }
-        # fmt: on
-
-        xyzs, reps, xyzs4smpl = forward_kinematics(robot_config, chain, angles)
-
-        angles_list.append(angles)
+    for angles in angles_list:
+        xyzs, reps = link_poses(chain, angles)
+
         xyzs_list.append(xyzs)
         reps_list.append(reps)
-        xyzs4smpl_list.append(xyzs4smpl)
 
     # Convert the pos & reps lists into numpy arrays
     # fmt: off
     xyzs_array = np.asarray(xyzs_list)            # shape: (NUM_POSES, # of robot links, 3)
     reps_array = np.asarray(reps_list)            # shape: (NUM_POSES, # of robot links, 6)
-    xyzs4smpl_array = np.asarray(xyzs4smpl_list)  # shape: (NUM_POSES, 21, 3)
     # fmt: on
 
+    # Convert the link xyzs of all the poses into SMPL joint xyzs at once
+    xyzs4smpl_array = robot_config.convert_xyzs.batch(xyzs_array)  # shape: (NUM_POSES, # of SMPL joints, 3)
+
     return angles_list, xyzs_array, reps_array, xyzs4smpl_array
@@ -1,7 +1,10 @@
 import sys
+import numpy as np
 
 sys.path.append("./src")
 from utils.types import RobotType
+from utils.urdf import parse_urdf
+from utils.robot_spec import load_robot_spec, check_link_names, SmplKeypointConverter
 from utils.consts import *
 
 
@@ -14,70 +17,49 @@ class RobotConfig:
 
         self.robot_type = robot_type
 
-        # Set the config as the reachy robot
-        if robot_type == RobotType.REACHY:
-            self.URDF_PATH = REACHY_URDF_PATH
-            self.ANGLES_PATH = REACHY_ANGLES_PATH
-            self.XYZS_REPS_PATH = REACHY_XYZS_REPS_PATH
-            self.SMPL_PARAMS_PATH = REACHY_SMPL_PARAMS_PATH
+        # Load the robot from its spec (data/ROBOT/ROBOT.yaml) and URDF
+        # To add a new robot, add a member to RobotType and write its spec (see utils/robot_spec.py)
+        spec = load_robot_spec(robot_type)
 
-            self.joi_range = REACHY_JOI_RANGE
-            self.joi_keys = REACHY_JOI_KEYS
-            self.cf_joi_keys = REACHY_CF_JOI_KEYS
-            self.smpl_joint_idx = REACHY_SMPL_JOINT_IDX
-            self.convert_xyzs = reachy_xyzs_to_smpl_xyzs
-            self.xyzs_dim = REACHY_XYZS_DIM
-            self.reps_dim = REACHY_REPS_DIM
-            self.angles_dim = REACHY_ANGLES_DIM
-            self.smpl_reps_dim = REACHY_SMPL_REPS_DIM
-            self.cf_angles_dim = REACHY_CF_ANGLES_DIM
-            self.evaluate_links = REACHY_EVALUATE_LINKS
-            self.joint_vectors = REACHY_JOINT_VECTORS
+        self.URDF_PATH = spec["urdf"]
+        self.URDF_4_RENDER_PATH = spec.get("urdf_4_render", spec["urdf"])
+        self.ANGLES_PATH = spec["angles_path"]
+        self.XYZS_REPS_PATH = spec["xyzs_reps_path"]
+        self.SMPL_PARAMS_PATH = spec["smpl_params_path"]
 
-        elif robot_type == RobotType.COMAN:
-            self.URDF_PATH = COMAN_URDF_PATH
-            self.URDF_4_RENDER_PATH = COMAN_URDF_4_RENDER_PATH
-            self.ANGLES_PATH = COMAN_ANGLES_PATH
-            self.XYZS_REPS_PATH = COMAN_XYZS_REPS_PATH
-            self.SMPL_PARAMS_PATH = COMAN_SMPL_PARAMS_PATH
+        # Link indices are the indices in the forward kinematics order of the URDF
+        chain = parse_urdf(self.URDF_PATH)
+        self.link_names = chain.link_names
+        self.link_index = chain.link_index
 
-            self.joi_range = COMAN_JOI_RANGE
-            self.joi_keys = COMAN_JOI_KEYS
-            self.cf_joi_keys = COMAN_CF_JOI_KEYS
-            self.smpl_joint_idx = COMAN_SMPL_JOINT_IDX
-            self.convert_xyzs = coman_xyzs_to_smpl_xyzs
-            self.xyzs_dim = COMAN_XYZS_DIM
-            self.reps_dim = COMAN_REPS_DIM
-            self.angles_dim = COMAN_ANGLES_DIM
-            self.smpl_reps_dim = COMAN_SMPL_REPS_DIM
-            self.cf_angles_dim = COMAN_CF_ANGLES_DIM
-            self.evaluate_links = COMAN_EVALUATE_LINKS
-            self.joint_vectors = COMAN_JOINT_VECTORS
+        # RANGE: {k: joint, v: range} (range: null in the spec -> limit of the joint in the URDF)
+        unknown_joints = [name for name in spec["joints_of_interest"] if name not in chain.joints]
+        if len(unknown_joints) > 0:
+            raise ValueError(f"Unknown joints in `joints_of_interest` of the robot spec: {unknown_joints}")
+        self.joi_range = {
+            k: list(v) if v is not None else list(chain.joints[k].limit) for k, v in spec["joints_of_interest"].items()
+        }
+        self.joi_keys = self.joi_range.keys()
+        self.joi_lower = np.array([v[0] for v in self.joi_range.values()], dtype=np.float64)  # (J,)
+        self.joi_upper = np.array([v[1] for v in self.joi_range.values()], dtype=np.float64)  # (J,)
+        self.cf_joi_keys = spec["cf_joints_of_interest"]
 
-        elif robot_type == RobotType.NAO:
-            self.URDF_PATH = NAO_URDF_PATH
-            self.ANGLES_PATH = NAO_ANGLES_PATH
-            self.XYZS_REPS_PATH = NAO_XYZS_REPS_PATH
-            self.SMPL_PARAMS_PATH = NAO_SMPL_PARAMS_PATH
+        # robot's link xyzs -> SMPL-X joint xyzs
+        self.convert_xyzs = SmplKeypointConverter(spec["smpl_keypoints"], chain)
+        self.smpl_joint_idx = self.convert_xyzs.smpl_joint_idx
 
-            self.joi_range = NAO_JOI_RANGE
-            self.joi_keys = NAO_JOI_KEYS
-            self.cf_joi_keys = NAO_CF_JOI_KEYS
-            self.smpl_joint_idx = NAO_SMPL_JOINT_IDX
-            self.convert_xyzs = nao_xyzs_to_smpl_xyzs
-            self.exclude_links = NAO_EXCLUDE_LINKS
-            self.xyzs_dim = NAO_XYZS_DIM
-            self.reps_dim = NAO_REPS_DIM
-            self.angles_dim = NAO_ANGLES_DIM
-            self.smpl_reps_dim = NAO_SMPL_REPS_DIM
-            self.cf_angles_dim = NAO_CF_ANGLES_DIM
-            self.evaluate_links = NAO_EVALUATE_LINKS
-            self.joint_vectors = NAO_JOINT_VECTORS
+        self.evaluate_links = spec["evaluate_links"]
+        self.joint_vectors = spec["joint_vectors"]
+        self.exclude_links = spec.get("exclude_links", [])
+        check_link_names(chain, self.evaluate_links, "evaluate_links")
+        check_link_names(chain, [v[k] for v in self.joint_vectors for k in ["from", "to"]], "joint_vectors")
 
-        # Please add here if you want to add a new robot type
-        # elif robot_type == RobotType.NEW_ROBOT:
-        #     ...
+        # Train Parameters
+        self.xyzs_dim = len(self.link_names) * 3
+        self.reps_dim = len(self.link_names) * 6
+        self.angles_dim = len(self.joi_range)
+        self.smpl_reps_dim = len(self.smpl_joint_idx) * 6
+        self.cf_angles_dim = len(self.cf_joi_keys)
 
-        # If the robot type is not a member of the robot types
-        else:
-            print("Warning: It must be a problem !!")
+        # Smoothing Parameters (Savitzky-Golay filter window of the motions, in frames)
+        self.smooth_window = spec["smooth_window"]
@@ -5,52 +5,52 @@ Compare the predicted robot joint angles or link position distance with the grou
 
 import math
 import sys
-import kinpy as kp
 import numpy as np
-from typing import List
+from typing import List, Union
 
 sys.path.append("src")
 from utils.types import EvaluateMode
 from utils.RobotConfig import RobotConfig
+from utils.motion import RobotMotion, as_robot_motion
 
 
 def calculate_error(
     robot_config: RobotConfig,
     evaluate_mode: EvaluateMode,
-    pred_motion: List[dict],
-    gt_motion: List[dict],
+    pred_motion: Union[RobotMotion, List[dict]],
+    gt_motion: Union[RobotMotion, List[dict]],
 ) -> float:
+    # adapt the legacy motions (list of per-frame dicts) into RobotMotion
+    pred_motion = as_robot_motion(pred_motion)
+    gt_motion = as_robot_motion(gt_motion)
+
     # obtain the joint keys of the predicted and ground truth motions and find the common keys
-    pred_motion_joint_keys = list(pred_motion[0].keys())
-    gt_motion_joint_keys = list(gt_motion[0].keys())
-    common_joint_keys = list(
-        set(pred_motion_joint_keys).intersection(gt_motion_joint_keys)
-    )
+    common_joint_keys = [k for k in pred_motion.joint_names if k in gt_motion.joint_names]
 
     # initialize the motion error (average of the pose errors)
     motion_error = 0.0
 
     # calculate the angular difference between the predicted and ground truth joint angles
     if evaluate_mode == EvaluateMode.JOINT:
-        for pose_idx in range(len(pred_motion)):
-            pose_loss = 0.0
+        # fmt: off
+        pred_values = pred_motion.select(common_joint_keys).angles.astype(np.float64)   # (T, J)
+        gt_values = gt_motion.select(common_joint_keys).angles.astype(np.float64)       # (T', J)
+        # fmt: on
 
-            for key in common_joint_keys:
-                pred_value = pred_motion[pose_idx][key]
-                gt_value = gt_motion[pose_idx][key]
+        # the poses of the predicted motion are evaluated (a longer GT motion is cut, like the LINK & COS modes)
+        gt_values = gt_values[: len(pred_values)]
 
-                joint_loss = min(
-                    (pred_value - gt_value) % (2 * math.pi),
-                    (2 * math.pi) - ((pred_value - gt_value) % (2 * math.pi)),
-                )
-                pose_loss += joint_loss
+        diff = np.mod(pred_values - gt_values, 2 * math.pi)
+        joint_loss = np.minimum(diff, (2 * math.pi) - diff)
 
-            pose_loss /= len(common_joint_keys)
-            motion_error += pose_loss
-        motion_error /= len(pred_motion)
+        # mean over the joints of each pose, and then mean over the poses
+        motion_error = float(joint_loss.mean(axis=1).mean())
 
     # calculate the l2 distance between the predicted and ground truth link positions
     elif evaluate_mode == EvaluateMode.LINK:
+        # kinpy is only needed for the forward kinematics (not for the JOINT mode)
+        import kinpy as kp
+
         # build the kinematic chain of the robot to calculate the forward kinematics
         # (obtain the link positions from the joint angles)
         chain = kp.build_chain_from_urdf(open(robot_config.URDF_PATH).read())
@@ -58,8 +58,8 @@ def calculate_error(
         for pose_idx in range(len(pred_motion)):
             pose_loss = 0.0
 
-            pred_joints = pred_motion[pose_idx]
-            gt_joints = gt_motion[pose_idx]
+            pred_joints = pred_motion.frame(pose_idx)
+            gt_joints = gt_motion.frame(pose_idx)
 
             pred_fk_result = chain.forward_kinematics(pred_joints)
             gt_fk_result = chain.forward_kinematics(gt_joints)
@@ -79,6 +79,8 @@ def calculate_error(
 
     # calculate the cosine distance between the predicted and ground truth link vectors
     elif evaluate_mode == EvaluateMode.COS:
+        import kinpy as kp
+
         # build the kinematic chain of the robot to calculate the forward kinematics
         # (obtain the link positions from the joint angles)
         chain = kp.build_chain_from_urdf(open(robot_config.URDF_PATH).read())
@@ -87,8 +89,8 @@ def calculate_error(
             pose_loss = 0.0
 
             # Get the forward kinematics result of preds & GT
-            pred_joints = pred_motion[pose_idx]
-            gt_joints = gt_motion[pose_idx]
+            pred_joints = pred_motion.frame(pose_idx)
+            gt_joints = gt_motion.frame(pose_idx)
             pred_fk_result = chain.forward_kinematics(pred_joints)
             gt_fk_result = chain.forward_kinematics(gt_joints)
 
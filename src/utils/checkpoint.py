@@ -0,0 +1,122 @@
+"""
+Crash-safe files of the data generation.
+
+- Atomic writes: a file is written to a temp file next to it and renamed, so a crash never leaves a half-written file.
+- IkCheckpoint: IK results of each batch of a seed, so that a restarted seed skips its finished batches.
+- DataManifest: the seeds whose files are all written, so that a restart resumes exactly where it stopped.
+"""
+
+import hashlib
+import json
+import os
+import os.path as osp
+import pickle
+import shutil
+import numpy as np
+from typing import Callable, Dict, List, Optional
+
+
+def atomic_write(path: str, write_fn: Callable, mode: str = "wb"):
+    """
+    Write a file with write_fn(file) to `path.tmp` and rename it to `path` (atomic on the same file system).
+    """
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, mode) as f:
+        write_fn(f)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+def atomic_savez(path: str, **arrays):
+    # np.savez appends .npz to the file names, but not to the file objects
+    atomic_write(path, lambda f: np.savez(f, **arrays))
+
+
+def atomic_pickle_dump(obj, path: str):
+    atomic_write(path, lambda f: pickle.dump(obj, f))
+
+
+def atomic_json_dump(obj, path: str):
+    atomic_write(path, lambda f: json.dump(obj, f, indent=2), mode="w")
+
+
+def fingerprint(array: np.ndarray) -> str:
+    return hashlib.sha1(np.ascontiguousarray(array).tobytes()).hexdigest()
+
+
+class IkCheckpoint:
+    """
+    Batch-level checkpoints of the IK results of a seed: CKPT_DIR/batch_000.npz, ...
+
+    Each checkpoint holds the fingerprint of the target keypoints of its batch, so a checkpoint is used only for the
+    same batch of the same poses (e.g. not after changing the sampling mode or the dedup tolerance).
+    """
+
+    def __init__(self, ckpt_dir: str):
+        self.ckpt_dir = ckpt_dir
+
+    def batch_path(self, batch_idx: int) -> str:
+        return osp.join(self.ckpt_dir, f"batch_{batch_idx:03}.npz")
+
+    def load(self, batch_idx: int, target: np.ndarray) -> Optional[Dict[str, np.ndarray]]:
+        """
+        Load the IK results of the batch, or None if the batch has no (matching) checkpoint.
+        """
+        path = self.batch_path(batch_idx)
+        if not osp.exists(path):
+            return None
+
+        with np.load(path) as ckpt:
+            if str(ckpt["fingerprint"]) != fingerprint(target):
+                return None
+            return {k: ckpt[k] for k in ckpt.files if k != "fingerprint"}
+
+    def save(self, batch_idx: int, target: np.ndarray, ik_res: Dict[str, np.ndarray]):
+        os.makedirs(self.ckpt_dir, exist_ok=True)
+        atomic_savez(self.batch_path(batch_idx), fingerprint=fingerprint(target), **ik_res)
+
+    def clear(self):
+        """
+        Remove the checkpoints (once the outputs of the seed are written).
+        """
+        shutil.rmtree(self.ckpt_dir, ignore_errors=True)
+
+
+class DataManifest:
+    """
+    Manifest (JSON) of the generated data: the generation settings and the seeds whose output files are all written.
+
+    A seed is recorded only after all its files are renamed into place, so a seed in the manifest is complete, and a
+    seed not in the manifest is generated again (its finished IK batches are restored from the IkCheckpoint).
+    """
+
+    def __init__(self, path: str, settings: dict, overwrite: bool = False):
+        """
+        Args:
+            path (str): path of the manifest
+            settings (dict): generation settings of the data (poses per seed, sampling mode, ...)
+            overwrite (bool): ignore the existing manifest (generate all the seeds again)
+        """
+        self.path = path
+        self.manifest = {"settings": settings, "seeds": {}}
+
+        if osp.exists(path) and not overwrite:
+            with open(path) as f:
+                manifest = json.load(f)
+            if manifest["settings"] != settings:
+                raise ValueError(
+                    f"The data in {osp.dirname(path)} was generated with other settings: {manifest['settings']} "
+                    f"(current: {settings}). Use --overwrite to generate it again."
+                )
+            self.manifest = manifest
+
+    def is_done(self, seed: int, file_paths: List[str]) -> bool:
+        """
+        Whether the seed is recorded and all its files exist.
+        """
+        return str(seed) in self.manifest["seeds"] and all(osp.exists(p) for p in file_paths)
+
+    def mark_done(self, seed: int, record: dict):
+        self.manifest["seeds"][str(seed)] = record
+        atomic_json_dump(self.manifest, self.path)
@@ -1,5 +1,2 @@
-from utils.consts.coman import *
-from utils.consts.reachy import *
-from utils.consts.nao import *
 from utils.consts.smpl import *
 from utils.consts.common import *
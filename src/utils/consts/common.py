@@ -4,6 +4,33 @@ from typing import Callable
 NUM_SEEDS = 1000
 POSE_PER_SEED = 2000
 
+# Constants for quasi-random sampling (scrambling seed of the Sobol' / Halton sequences shared by all the seeds)
+QMC_SCRAMBLE_SEED = 0
+COVERAGE_NUM_PROBES = 20000  # number of the uniform probe poses to measure the coverage of the joint space
+
+# Constants for the IK fitting (tolerance (m) of the near-duplicate SMPL keypoints sharing an IK solve, 0: no dedup)
+IK_DEDUP_TOL = 0.0
+# retries of the NaN IK results (retry k: learning rate * decay^k, random initial pose of the std (rad))
+IK_MAX_RETRIES = 3
+IK_RETRY_LR_DECAY = 0.5
+IK_RETRY_INIT_STD = 0.1
+# continuous batching of the IK: LBFGS iterations of a round, after which the converged poses leave their slots
+IK_ROUND_ITERS = 10
+# autotuning of the IK on CPU nodes (batch sizes to try, LBFGS iterations of the benchmark, see tools/autotune_ik.py)
+IK_AUTOTUNE_BATCH_SIZES = [125, 250, 500, 1000]
+IK_AUTOTUNE_ITERS = 10
+IK_AUTOTUNE_PATH = "./out/ik_autotune.json"  # tuned configurations per CPU topology
+
+# Constants for the learned IK (SMPL keypoints -> SMPL parameters regressor, see tools/train_ik_regressor.py)
+IK_REGRESSOR_REFINE_ITERS = 20  # LBFGS iterations after the prediction (full LBFGS: 500 iterations)
+IK_REGRESSOR_EPOCHS = 100
+IK_REGRESSOR_BATCH_SIZE = 2048
+
+# Constants for the active data generation (see process_data/active_sampling.py)
+ACTIVE_KNN = 8  # held-out poses which estimate the retargeting error of a pose (nearest in the joint space)
+ACTIVE_POOL_FACTOR = 8  # uniform candidate poses per generated pose
+ACTIVE_UNIFORM_FRAC = 0.2  # poses of a seed drawn uniformly (keeps the coverage of the whole joint space)
+
 # Constants for training
 DATA_SPLIT_RATIO = 50
 HIDDEN_DIM = 512
@@ -16,7 +43,25 @@ EF_EPOCHS = 300
 
 MODEL_SAVE_EPOCH = 5
 
+# Constants for the nearest-neighbour retrieval retargeter (blended neighbours, k-means cells of the index, and the
+# nearest cells searched by a query: KNN_NUM_CELLS is exact)
+KNN_K = 4
+KNN_NUM_CELLS = 1024
+KNN_NPROBE = 16
+KNN_CHUNK_SIZE = 65536  # points assigned to the cells at once when the index is built
+
+# Constants for the inference server
+SERVER_HOST = "127.0.0.1"
+SERVER_PORT = 8765
+SERVER_MAX_BATCH_FRAMES = 8192  # maximum number of frames in a micro-batch
+SERVER_MAX_WAIT_MS = 5.0  # maximum waiting time to gather a micro-batch
+
 # fmt: off
+# Robot specs (see utils/robot_spec.py), e.g. ./data/nao/nao.yaml
+ROBOT_SPEC_PATH: Callable[[str], str] = (
+    lambda robot_name: f"./data/{robot_name.lower()}/{robot_name.lower()}.yaml"
+)
+
 # Path rules for data
 robot_xyzs_reps_path = (lambda data_idx: f"xyzs+reps_{data_idx:04}.npz"
                         if type(data_idx) == int
@@ -27,6 +72,13 @@ robot_angles_path    = (lambda data_idx: f"angles_{data_idx:04}.pkl"
 smpl_params_path     = (lambda data_idx: f"params_{data_idx:04}.npz"
                         if type(data_idx) == int
                         else f"params_{data_idx}.npz")
+ik_report_path       = (lambda data_idx: f"ik_report_{data_idx:04}.json"
+                        if type(data_idx) == int
+                        else f"ik_report_{data_idx}.json")
+ik_checkpoint_dir    = (lambda data_idx: f"ik_ckpt_{data_idx:04}"
+                        if type(data_idx) == int
+                        else f"ik_ckpt_{data_idx}")
+DATA_MANIFEST_NAME = "manifest.json"  # manifest of the finished seeds, next to the data directories of the robot
 
 # Constants for model weights
 MODEL_WEIGHTS_DIR: Callable[[str, bool, bool], str] = (
@@ -39,16 +91,57 @@ MODEL_WEIGHT_NAME: Callable[[str, str, int], str] = (
 MODEL_BEST_WEIGHT_NAME: Callable[[str, str, str], str] = (
     lambda robot_name, model_type, evaluation_mode: f"human2{robot_name}_{model_type}_best_{evaluation_mode}.pth"
 )
+# Append-only index of the compiled training data (see utils/dataset_index.py)
+DATASET_INDEX_DIR: Callable[[str, bool], str] = (
+    lambda robot_name, extreme_filter_off: f"./out/datasets/{robot_name}/{'no_ex' if extreme_filter_off else 'ex'}"
+)
+ACTIVE_ERROR_MAP_PATH: Callable[[str], str] = lambda robot_name: f"./out/active/{robot_name}/error_map.npz"
+ACTIVE_ROUNDS_LOG_PATH: Callable[[str, str], str] = (
+    lambda robot_name, arm: f"./out/active/{robot_name}/rounds_{arm}.json"
+)
+IK_REGRESSOR_PATH: Callable[[str], str] = (
+    lambda robot_name: f"./out/models/{robot_name}/ik_regressor.pth"
+)
+
+# Retrieval index of the training pairs (see model/knn_retargeter.py)
+MODEL_KNN_INDEX_PATH: Callable[[str, bool], str] = (
+    lambda robot_name, extreme_filter_off:
+        f"./out/models/{robot_name}/knn/knn_index_{'no_ex' if extreme_filter_off else 'ex'}.npz"
+)
+
+# Int8 dynamically quantized weights are saved in the "int8" sub-directory with the same names as the fp32 weights
+MODEL_INT8_WEIGHTS_DIR: Callable[[str, bool, bool], str] = (
+    lambda robot_name, one_stage, extreme_filter_off:
+        f"{MODEL_WEIGHTS_DIR(robot_name, one_stage, extreme_filter_off)}/int8"
+)
+
+# Constants for exported models (ONNX graphs, NumPy weights)
+# model_type: "os" for the one-stage model, "ts" for the fused pre + post model of the two-stage model
+# weight_tag: weight index or "best_{evaluation_mode}" (same as the name of the torch weight)
+MODEL_WEIGHT_TAG: Callable[[str, int], str] = (
+    lambda evaluation_mode, weight_idx: f"best_{evaluation_mode}" if weight_idx == -1 else str(weight_idx)
+)
+ONNX_OPSET = 13
+MODEL_ONNX_NAME: Callable[[str, str, str], str] = (
+    lambda robot_name, model_type, weight_tag: f"human2{robot_name}_{model_type}_{weight_tag}.onnx"
+)
+MODEL_NPZ_NAME: Callable[[str, str, str], str] = (
+    lambda robot_name, model_type, weight_tag: f"human2{robot_name}_{model_type}_{weight_tag}.npz"
+)
 
 # Constants for evaluation path
 PRED_MOTIONS_DIR: Callable[[str, bool, bool], str] = (
     lambda robot_name, one_stage, extreme_filter_off:
         f"./out/pred_motions/{robot_name}/{'os' if one_stage else 'ts'}/{'no_ex' if extreme_filter_off else 'ex'}"
 )
-EVAL_RESULT_TXT_NAME: Callable[[str], str] = lambda evaluation_mode: f"result_{evaluation_mode}.txt"
-PRED_MOTION_NAME: Callable[[str, bool, str], str] = (
-    lambda robot_name, extreme_filter_off, motion_idx:
-        f"pred_{robot_name}_{'no_ex' if extreme_filter_off else 'ex'}_{motion_idx}.pkl"
+# the predictions & results of each inference backend (InferBackend value), smoothed or not, are kept side by side
+PRED_VARIANT: Callable[[str, bool], str] = lambda backend, smooth: f"{backend}{'_smooth' if smooth else ''}"
+EVAL_RESULT_TXT_NAME: Callable[[str, str], str] = (
+    lambda evaluation_mode, variant: f"result_{evaluation_mode}_{variant}.txt"
+)
+PRED_MOTION_NAME: Callable[[str, bool, str, str], str] = (
+    lambda robot_name, extreme_filter_off, motion_idx, variant:
+        f"pred_{robot_name}_{'no_ex' if extreme_filter_off else 'ex'}_{motion_idx}_{variant}.npz"
 )
 
 # Constants for rendered video files
@@ -58,15 +151,31 @@ PYBULLET_PRED_VID_DIR: Callable[[str, bool, bool], str] = (
 )
 PYBULLET_GT_VID_DIR: Callable[[str], str] = lambda robot_name: f"./out/pybullet/{robot_name}/gt"
 
-PYBULLET_PRED_VID_NAME: Callable[[str, bool, str, str], str] = (
-    lambda robot_name, extreme_filter_off, motion_idx, extention:
-        f"{robot_name}_{'no_ex' if extreme_filter_off else 'ex'}_{motion_idx}.{extention}"
+PYBULLET_PRED_VID_NAME: Callable[[str, bool, str, str, str], str] = (
+    lambda robot_name, extreme_filter_off, motion_idx, backend, extention:
+        f"{robot_name}_{'no_ex' if extreme_filter_off else 'ex'}_{motion_idx}_{backend}.{extention}"
 )
 PYBULLET_GT_VID_NAME: Callable[[str, str, str], str] = (
     lambda robot_name, motion_idx, extention: f"{robot_name}_gt_{motion_idx}.{extention}"
 )
 # fmt: on
 
+# Constants for motion smoothing (Savitzky-Golay filter, the window is set per robot)
+SMOOTH_POLYORDER = 2
+
+# Constants for online (causal) smoothing of the streaming motions
+MOTION_FPS = 120  # frame rate of the GT motions
+ONE_EURO_MIN_CUTOFF = 1.0  # Hz
+ONE_EURO_BETA = 1.0  # cutoff increase per the speed (rad/s)
+ONE_EURO_D_CUTOFF = 1.0  # Hz
+CAUSAL_SAVGOL_WINDOW = 15  # frames
+CAUSAL_SAVGOL_LOOKAHEAD = 3  # frames
+
+# Constants for pybullet rendering
+PYBULLET_IMG_WIDTH = 640
+PYBULLET_IMG_HEIGHT = 480
+PYBULLET_CAMERA_FOV = 60
+
 ################################
 
 # Constants for Ground Truth Motions
@@ -7,12 +7,9 @@ import joblib
 import sys
 from tqdm import tqdm
 from torch.utils.data import Dataset
-from pytorch3d.transforms import matrix_to_rotation_6d
-from human_body_prior.tools.rotation_tools import aa2matrot
-from human_body_prior.tools.model_loader import load_model
-from human_body_prior.models.vposer_model import VPoser
-from sklearn.metrics import mean_squared_error as mse
 
+# pytorch3d, human_body_prior and sklearn are imported in the functions which use them,
+# so that the tools which only run the inference don't pay for their import time
 sys.path.append("./src")
 from utils.consts import *
 
@@ -31,6 +28,9 @@ def load_smpl_to_6D_reps(human_pose_path: str):
     """
     load SMPL parameters from a file and convert it to SMPL joint 6D representations.
     """
+    from pytorch3d.transforms import matrix_to_rotation_6d
+    from human_body_prior.tools.rotation_tools import aa2matrot
+
     # fmt: off
     if human_pose_path.endswith(".pkl"):
         human_pose: np.ndarray = joblib.load(open(human_pose_path, "rb"))["pose"][:, 3:66]
@@ -59,6 +59,123 @@ def load_smpl_to_6D_reps(human_pose_path: str):
     return smpl_rep, human_pose
 
 
+def load_extreme_filter_vposer():
+    """
+    load the VPoser model of the extreme filter.
+    """
+    from human_body_prior.tools.model_loader import load_model
+    from human_body_prior.models.vposer_model import VPoser
+
+    vp, _ = load_model(
+        VPOSER_PATH,
+        model_code=VPoser,
+        remove_words_in_model_weights="vp_model.",
+        disable_grad=True,
+    )
+    return vp.to(DEVICE)
+
+
+def load_seed_data(idx: int, input_path: str, reps_path: str, target_path: str, vp=None) -> dict:
+    """
+    Load SMPL reps, robot xyzs, reps, and joint angles of a seed.
+
+    Args:
+    ----------
+    idx (int): index of the seed
+    input_path (str): path to load SMPL parameters
+    reps_path (str): path to load robot xyzs and reps
+    target_path (str): path to load robot joint angles
+    vp (VPoser): VPoser model of the extreme filter (None: no extreme filter)
+
+    Returns:
+    ----------
+    seed_data (dict): robot_xyzs, robot_reps, robot_angles, smpl_reps (and smpl_probs with the extreme filter)
+    """
+    # load human pose (rep: 6D representation of arm joints, pose: original human pose in axis-angle format)
+    # fmt: off
+    smpl_rep, smpl_pose = load_smpl_to_6D_reps(osp.join(input_path, smpl_params_path(idx)))
+    num_poses = len(smpl_rep)
+    # fmt: on
+
+    seed_data = {}
+
+    # if extreme filter is on, calculate the reconstruction error
+    if vp is not None:
+        from sklearn.metrics import mean_squared_error as mse
+
+        z: torch.Tensor = vp.encode(torch.from_numpy(smpl_pose[:]).to(DEVICE))
+        z_mean = z.mean
+
+        reconstructed_smpl: torch.Tensor = (
+            vp.decode(z_mean)["pose_body"].contiguous().view(-1, 63)
+        )
+        rec_errors = []
+
+        for i in range(num_poses):  # 2000
+            # fmt: off
+            original_pose = smpl_pose[i]                        # Tensor shaped (63,)
+            reconstructed_pose = reconstructed_smpl[i].cpu()    # Tensor shaped (63,)
+
+            rec_error = mse(original_pose, reconstructed_pose)  # float value (non-negative value)
+            rec_errors.append(rec_error)                        # List of float values
+            # fmt: on
+
+        rec_errors = np.array(rec_errors)
+        rec_errors = torch.from_numpy(rec_errors)
+
+        # Threshold value for the reconstruction error.
+        # If the reconstruction error is greater than this value, it is considered as an extreme value.
+        threshold = 0.005
+
+        probs = torch.zeros_like(rec_errors)
+        probs[rec_errors > threshold] = 0
+        probs[rec_errors <= threshold] = 1
+
+        # probs = 1 - (rec_errors / threshold)
+        # probs[probs < 0] = 0
+        # probs[probs > 0] = 1
+
+        # use the sigmoid function to make the probability values between 0 and 1
+        # p = lambda e: torch.sigmoid((0.003 - e) * 1000) + 0.04
+        # probs = p(rec_errors)
+
+        seed_data["smpl_probs"] = probs.numpy()
+
+    # Robot data processing
+    robot_angle = pickle.load(open(osp.join(target_path, robot_angles_path(idx)), "rb"))
+    angle_chunk = []
+    for ra in robot_angle:
+        values = []
+        for k in sorted(list(ra.keys())):
+            values.append(ra[k])
+        angle_chunk.append(np.array(values))
+    angle_chunk = np.asarray(angle_chunk)
+
+    robot_xyzrep = np.load(osp.join(reps_path, robot_xyzs_reps_path(idx)))
+    robot_xyzs: np.ndarray = robot_xyzrep["xyzs"]
+    robot_reps: np.ndarray = robot_xyzrep["reps"]
+
+    seed_data["robot_xyzs"] = robot_xyzs.reshape(num_poses, -1)
+    seed_data["robot_reps"] = robot_reps.reshape(num_poses, -1)
+    seed_data["robot_angles"] = angle_chunk
+    seed_data["smpl_reps"] = smpl_rep.numpy()
+
+    return seed_data
+
+
+def split_to_outputs(data: dict, extreme_filter_off: bool):
+    """
+    {split: {name: array}} -> (robot xyzs, robot reps, robot angles, SMPL reps, SMPL probs), each {split: array}
+    """
+    names = ["robot_xyzs", "robot_reps", "robot_angles", "smpl_reps", "smpl_probs"]
+    outputs = {name: {"train": [], "test": []} for name in names}
+    for target in ["test", "train"]:
+        for name in names:
+            if name != "smpl_probs" or not extreme_filter_off:
+                outputs[name][target] = data[target][name]
+    return tuple(outputs[name] for name in names)
+
+
 def load_and_split_train_test(
     input_path: str,
     reps_path: str,
@@ -69,6 +186,7 @@ def load_and_split_train_test(
 ):
     """
     Load SMPL parameters, robot xyzs, reps, and joint angles, and split them into train and test.
+    (legacy split: the first num_data // split_ratio seeds are the test data, see load_indexed_train_test)
 
     Args:
     ----------
@@ -80,93 +198,17 @@ def load_and_split_train_test(
     extreme_filter (bool): whether to apply extreme filter to the data
     """
     # if use extreme filter, load VPoser model
-    if not extreme_filter_off:
-        vp, _ = load_model(
-            VPOSER_PATH,
-            model_code=VPoser,
-            remove_words_in_model_weights="vp_model.",
-            disable_grad=True,
-        )
-        vp = vp.to(DEVICE)
+    vp = None if extreme_filter_off else load_extreme_filter_vposer()
 
     # set the number of test data
     test_num = num_data // split_ratio
 
     # initialize the data
-    all_robot_xyzs = {"train": [], "test": []}
-    all_robot_reps = {"train": [], "test": []}
-    all_robot_angles = {"train": [], "test": []}
-    all_smpl_reps = {"train": [], "test": []}
-    all_smpl_probs = {"train": [], "test": []}
+    all_data = {"train": [], "test": []}
 
     print("Loading data...")
     for idx in tqdm(range(num_data)):
-
-        # load human pose (rep: 6D representation of arm joints, pose: original human pose in axis-angle format)
-        # fmt: off
-        smpl_rep, smpl_pose = load_smpl_to_6D_reps(osp.join(input_path, f"params_{idx:04}.npz"))
-        num_poses = len(smpl_rep)
-        # fmt: on
-
-        # if extreme filter is on, calculate the reconstruction error
-        if not extreme_filter_off:
-            z: torch.Tensor = vp.encode(torch.from_numpy(smpl_pose[:]).to(DEVICE))
-            z_mean = z.mean
-
-            reconstructed_smpl: torch.Tensor = (
-                vp.decode(z_mean)["pose_body"].contiguous().view(-1, 63)
-            )
-            rec_errors = []
-
-            for i in range(num_poses):  # 2000
-                # fmt: off
-                original_pose = smpl_pose[i]                        # Tensor shaped (63,)
-                reconstructed_pose = reconstructed_smpl[i].cpu()    # Tensor shaped (63,)
-
-                rec_error = mse(original_pose, reconstructed_pose)  # float value (non-negative value)
-                rec_errors.append(rec_error)                        # List of float values
-                # fmt: on
-
-            rec_errors = np.array(rec_errors)
-            rec_errors = torch.from_numpy(rec_errors)
-
-            # Threshold value for the reconstruction error.
-            # If the reconstruction error is greater than this value, it is considered as an extreme value.
-            threshold = 0.005
-
-            probs = torch.zeros_like(rec_errors)
-            probs[rec_errors > threshold] = 0
-            probs[rec_errors <= threshold] = 1
-
-            # probs = 1 - (rec_errors / threshold)
-            # probs[probs < 0] = 0
-            # probs[probs > 0] = 1
-
-            # use the sigmoid function to make the probability values between 0 and 1
-            # p = lambda e: torch.sigmoid((0.003 - e) * 1000) + 0.04
-            # probs = p(rec_errors)
-
-            smpl_probs = probs.numpy()
-
-        # Robot data processing
-        angles_file_name = f"angles_{idx:04}.pkl"
-        xyzs_reps_file_name = f"xyzs+reps_{idx:04}.npz"
-
-        robot_angle = pickle.load(open(osp.join(target_path, angles_file_name), "rb"))
-        angle_chunk = []
-        for ra in robot_angle:
-            values = []
-            for k in sorted(list(ra.keys())):
-                values.append(ra[k])
-            angle_chunk.append(np.array(values))
-        angle_chunk = np.asarray(angle_chunk)
-
-        robot_xyzrep = np.load(osp.join(reps_path, xyzs_reps_file_name))
-        robot_xyzs: np.ndarray = robot_xyzrep["xyzs"]
-        robot_reps: np.ndarray = robot_xyzrep["reps"]
-
-        robot_xyzs = robot_xyzs.reshape(num_poses, -1)
-        robot_reps = robot_reps.reshape(num_poses, -1)
+        seed_data = load_seed_data(idx, input_path, reps_path, target_path, vp)
 
         # Split the data into train and test
         if idx < test_num:
@@ -174,29 +216,74 @@ def load_and_split_train_test(
         else:
             target = "train"
 
-        all_robot_xyzs[target].append(robot_xyzs)
-        all_robot_reps[target].append(robot_reps)
-        all_robot_angles[target].append(angle_chunk)
-        all_smpl_reps[target].append(smpl_rep)
-        if not extreme_filter_off:
-            all_smpl_probs[target].append(smpl_probs)
+        all_data[target].append(seed_data)
 
-    for target in ["test", "train"]:
-        all_robot_xyzs[target] = np.concatenate(all_robot_xyzs[target], axis=0)
-        all_robot_reps[target] = np.concatenate(all_robot_reps[target], axis=0)
-        all_robot_angles[target] = np.concatenate(all_robot_angles[target], axis=0)
-        all_smpl_reps[target] = np.concatenate(all_smpl_reps[target], axis=0)
-        if not extreme_filter_off:
-            all_smpl_probs[target] = np.concatenate(all_smpl_probs[target], axis=0)
-
-    return (
-        all_robot_xyzs,
-        all_robot_reps,
-        all_robot_angles,
-        all_smpl_reps,
-        all_smpl_probs,
+    data = {
+        target: {k: np.concatenate([d[k] for d in all_data[target]], axis=0) for k in all_data[target][0]}
+        for target in ["test", "train"]
+    }
+    return split_to_outputs(data, extreme_filter_off)
+
+
+def load_indexed_train_test(
+    input_path: str,
+    reps_path: str,
+    target_path: str,
+    num_data: int,
+    index_dir: str,
+    split_ratio: int = 10,
+    extreme_filter_off: bool = True,
+    rebuild: bool = False,
+):
+    """
+    Load the data of the seeds 0, ..., num_data - 1 from the append-only dataset index (utils/dataset_index.py), and
+    split them into train and test by the stable split of each seed.
+    Only the seeds which are not in the index yet are loaded from the data files (and appended to the index).
+
+    Args:
+    ----------
+    input_path (str): path to load SMPL parameters
+    reps_path (str): path to load robot xyzs and reps
+    target_path (str): path to load robot joint angles
+    num_data (int): number of total data
+    index_dir (str): directory of the dataset index
+    split_ratio (int): ratio of train/test split
+    extreme_filter (bool): whether to apply extreme filter to the data
+    rebuild (bool): compile the index again from all the data files
+    """
+    from utils.dataset_index import DatasetIndex
+
+    index = DatasetIndex(
+        index_dir,
+        settings={"split_ratio": split_ratio, "extreme_filter_off": extreme_filter_off},
+        rebuild=rebuild,
     )
 
+    seeds = list(range(num_data))
+    seed_files = {
+        idx: [
+            osp.join(input_path, smpl_params_path(idx)),
+            osp.join(reps_path, robot_xyzs_reps_path(idx)),
+            osp.join(target_path, robot_angles_path(idx)),
+        ]
+        for idx in seeds
+    }
+    index.check_signatures(seed_files)
+
+    new_seeds = index.missing_seeds(seeds)
+    print(f"Dataset index: {num_data - len(new_seeds)} compiled seeds, loading {len(new_seeds)} new seeds...")
+    if len(new_seeds) > 0:
+        # if use extreme filter, load VPoser model
+        vp = None if extreme_filter_off else load_extreme_filter_vposer()
+
+        seed_data = {
+            idx: load_seed_data(idx, input_path, reps_path, target_path, vp) for idx in tqdm(new_seeds)
+        }
+        index.append(seed_data, {idx: seed_files[idx] for idx in new_seeds})
+
+    data = index.load(seeds)
+    return split_to_outputs(data, extreme_filter_off)
+
 
 class H2RMotionData(Dataset):
     def __init__(
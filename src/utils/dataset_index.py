@@ -0,0 +1,150 @@
+"""
+Append-only index of the compiled training data.
+
+The loaded data of the seeds (robot xyzs, reps, angles, SMPL reps, ...) is compiled into chunks (chunk_0000.npz, ...),
+and the index (index.json) records the split and the chunk of each seed. So a training run with new seeds only loads
+the new seeds and appends them as a new chunk, and the split of a seed never changes with the number of seeds.
+"""
+
+import json
+import os
+import os.path as osp
+import shutil
+import sys
+import numpy as np
+from typing import Dict, List
+
+sys.path.append("./src")
+from utils.checkpoint import atomic_savez, atomic_json_dump
+
+SPLITS = ["train", "test"]
+
+
+def seed_split(seed: int, split_ratio: int) -> str:
+    """
+    Stable split of a seed: every split_ratio-th seed (0, split_ratio, ...) is a test seed, whatever the number of the
+    seeds, so adding seeds never moves the existing seeds between the splits.
+    """
+    return "test" if seed % split_ratio == 0 else "train"
+
+
+def file_signature(paths: List[str]) -> List[List[int]]:
+    """
+    (size, mtime) of the files of a seed, to find the seeds which are generated again after they are compiled.
+    """
+    return [[os.stat(p).st_size, os.stat(p).st_mtime_ns] for p in paths]
+
+
+class DatasetIndex:
+    """
+    Append-only index of the compiled data: INDEX_DIR/index.json and INDEX_DIR/chunk_0000.npz, ...
+
+    A chunk holds the arrays of its seeds per split ("train/robot_xyzs", ..., "train/seed": seed of each row). The
+    chunk is written before the index, so a crash leaves at most an unindexed chunk, which the next append overwrites.
+    """
+
+    def __init__(self, index_dir: str, settings: dict, rebuild: bool = False):
+        """
+        Args:
+            index_dir (str): directory of the index and its chunks
+            settings (dict): settings of the compiled data (split ratio, extreme filter, ...)
+            rebuild (bool): remove the existing index and compile all the seeds again
+        """
+        self.index_dir = index_dir
+        self.index_path = osp.join(index_dir, "index.json")
+        self.index = {"settings": settings, "seeds": {}, "chunks": []}
+
+        if rebuild:
+            shutil.rmtree(index_dir, ignore_errors=True)
+
+        if osp.exists(self.index_path):
+            with open(self.index_path) as f:
+                index = json.load(f)
+            if index["settings"] != settings:
+                raise ValueError(
+                    f"The dataset index in {index_dir} was compiled with other settings: {index['settings']} "
+                    f"(current: {settings}). Use --rebuild-index to compile it again."
+                )
+            self.index = index
+
+    def missing_seeds(self, seeds: List[int]) -> List[int]:
+        return [seed for seed in seeds if str(seed) not in self.index["seeds"]]
+
+    def check_signatures(self, seed_files: Dict[int, List[str]]):
+        """
+        Raise ValueError if the files of an indexed seed changed after it was compiled (e.g. generated again with -ow).
+        """
+        stale = [
+            seed
+            for seed, paths in seed_files.items()
+            if str(seed) in self.index["seeds"]
+            and self.index["seeds"][str(seed)]["signature"] != file_signature(paths)
+        ]
+        if len(stale) > 0:
+            raise ValueError(
+                f"The data files of {len(stale)} compiled seeds changed (e.g. seeds {stale[:5]}). "
+                "Use --rebuild-index to compile the data again."
+            )
+
+    def append(self, seed_data: Dict[int, Dict[str, np.ndarray]], seed_files: Dict[int, List[str]]):
+        """
+        Compile the data of the new seeds into a chunk and record them in the index.
+
+        Args:
+            seed_data (Dict[int, Dict[str, np.ndarray]]): {seed: {name: array (num_poses, dim)}}
+            seed_files (Dict[int, List[str]]): {seed: data files of the seed}
+        """
+        if len(seed_data) == 0:
+            return
+
+        split_ratio = self.index["settings"]["split_ratio"]
+        splits = {seed: seed_split(seed, split_ratio) for seed in seed_data}
+        num_poses = {seed: len(next(iter(data.values()))) for seed, data in seed_data.items()}
+
+        arrays = {}
+        for split in SPLITS:
+            seeds = [seed for seed in seed_data if splits[seed] == split]
+            if len(seeds) == 0:
+                continue
+            for k in seed_data[seeds[0]]:
+                arrays[f"{split}/{k}"] = np.concatenate([seed_data[seed][k] for seed in seeds], axis=0)
+            arrays[f"{split}/seed"] = np.concatenate(
+                [np.full(num_poses[seed], seed, dtype=np.int64) for seed in seeds]
+            )
+
+        chunk_name = f"chunk_{len(self.index['chunks']):04}.npz"
+        os.makedirs(self.index_dir, exist_ok=True)
+        atomic_savez(osp.join(self.index_dir, chunk_name), **arrays)
+
+        self.index["chunks"].append(chunk_name)
+        for seed in seed_data:
+            self.index["seeds"][str(seed)] = {
+                "split": splits[seed],
+                "chunk": chunk_name,
+                "num_poses": num_poses[seed],
+                "signature": file_signature(seed_files[seed]),
+            }
+        atomic_json_dump(self.index, self.index_path)
+
+    def load(self, seeds: List[int]) -> Dict[str, Dict[str, np.ndarray]]:
+        """
+        Load the compiled data of the seeds (which must be indexed) from the chunks.
+
+        Returns:
+            data (Dict[str, Dict[str, np.ndarray]]): {split: {name: array}} (rows in the order of the chunks)
+        """
+        wanted = np.asarray(seeds, dtype=np.int64)
+        chunks = sorted({self.index["seeds"][str(seed)]["chunk"] for seed in seeds})
+
+        parts = {split: {} for split in SPLITS}
+        for chunk_name in chunks:
+            with np.load(osp.join(self.index_dir, chunk_name)) as chunk:
+                for split in SPLITS:
+                    if f"{split}/seed" not in chunk.files:
+                        continue
+                    rows = np.isin(chunk[f"{split}/seed"], wanted)
+                    for name in chunk.files:
+                        if name.startswith(f"{split}/"):
+                            parts[split].setdefault(name.split("/", 1)[1], []).append(chunk[name][rows])
+
+        return {split: {k: np.concatenate(v, axis=0) for k, v in parts[split].items()} for split in SPLITS}
@@ -5,18 +5,38 @@ and then use the forward kinematics to return the link positions and orientation
 
 import kinpy as kp
 import sys
+import numpy as np
 
 sys.path.append("./src")
-from utils.transform import quat2rep
 from utils.consts import *
 from utils.RobotConfig import RobotConfig
 
 
-def forward_kinematics(robot_config: RobotConfig, chain: kp.Chain, angles: dict):
+def link_xyzs(chain: kp.Chain, angles: dict) -> np.ndarray:
     """
     Input: robot's joint angles of a single pose (dict)
-    Output: robot's link positions and orientations (list of xyzs, reps, xyzs4smpl)
+    Output: robot's link positions (num_links, 3)
+    """
+    return np.array([v.pos for v in chain.forward_kinematics(angles).values()])
+
+
+def smpl_xyzs(robot_config: RobotConfig, chain: kp.Chain, angles: np.ndarray) -> np.ndarray:
+    """
+    Input: robot's joint angles of poses (N, J) (joints in the order of robot_config.joi_keys)
+    Output: SMPL joint xyzs of the poses (N, num_smpl_joints, 3)
+    """
+    joint_names = list(robot_config.joi_keys)
+    xyzs = np.array([link_xyzs(chain, dict(zip(joint_names, pose))) for pose in np.asarray(angles).tolist()])
+    return robot_config.convert_xyzs.batch(xyzs)
+
+
+def link_poses(chain: kp.Chain, angles: dict):
     """
+    Input: robot's joint angles of a single pose (dict)
+    Output: robot's link positions and orientations (list of xyzs, reps)
+    """
+    # torch & pytorch3d are only needed for the orientations (6D representations)
+    from utils.transform import quat2rep
 
     # fk_result: forward kinematics result of chain (Robot)
     #            keys of each element: pos (xyz position), rot (rotation vector: quaternion representation)
@@ -37,6 +57,15 @@ def forward_kinematics(robot_config: RobotConfig, chain: kp.Chain, angles: dict)
         xyzs.append(curr_xyz)
         reps.append(curr_rep)
 
+    return xyzs, reps
+
+
+def forward_kinematics(robot_config: RobotConfig, chain: kp.Chain, angles: dict):
+    """
+    Input: robot's joint angles of a single pose (dict)
+    Output: robot's link positions and orientations (list of xyzs, reps, xyzs4smpl)
+    """
+    xyzs, reps = link_poses(chain, angles)
     xyzs4smpl = robot_config.convert_xyzs(xyzs)
 
     return xyzs, reps, xyzs4smpl
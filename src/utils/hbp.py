@@ -1,5 +1,7 @@
+import time
 from pathlib import Path
-from typing import List, Dict, Union
+from collections import deque
+from typing import Callable, List, Dict, Optional, Tuple, Union
 from scipy.spatial.transform import Rotation as R
 
 import numpy as np
@@ -8,14 +10,14 @@ import torch.nn as nn
 from torch.nn import MSELoss
 from tqdm import tqdm
 
-from colour import Color
 from human_body_prior.body_model.body_model import BodyModel
 from human_body_prior.models.ik_engine import IK_Engine
 
 from human_body_prior.tools.omni_tools import copy2cpu as c2c
 from human_body_prior.tools.omni_tools import create_list_chunks
-from body_visualizer.tools.vis_tools import render_smpl_params
-from body_visualizer.tools.vis_tools import imagearray2file
+
+# colour and body_visualizer (pyrender, trimesh) are imported in the functions which use them,
+# so that the IK without rendering doesn't pay for their import time
 
 
 class SourceKeyPoints(nn.Module):
@@ -26,6 +28,7 @@ class SourceKeyPoints(nn.Module):
         joint_idx: list = [i for i in range(21)],
     ):
         super(SourceKeyPoints, self).__init__()
+        from colour import Color
 
         self.bm = (
             BodyModel(bm, num_betas=num_betas, persistant_buffer=False)
@@ -100,6 +103,295 @@ def transform_smpl_coordinate(
     }
 
 
+def nan_sample_mask(ik_res: Dict[str, np.ndarray], num_samples: int) -> np.ndarray:
+    """
+    Per-sample NaN detection of the IK results: a sample fails if any of its values (trans, root_orient, pose_body,
+    betas, ...) is not finite.
+
+    Returns:
+    -------
+    nan_mask (np.ndarray): (num_samples,) bool
+    """
+    nan_mask = np.zeros(num_samples, dtype=bool)
+    for v in ik_res.values():
+        if isinstance(v, np.ndarray) and v.ndim > 0 and len(v) == num_samples:
+            nan_mask |= ~np.isfinite(v.reshape(num_samples, -1)).all(-1)
+    return nan_mask
+
+
+def retry_chunks(frame_ids: np.ndarray, attempt: int, max_retries: int) -> List[np.ndarray]:
+    """
+    Split the failing frames of a retry attempt into batches.
+
+    The data loss is summed over the batch, so a single diverging pose can turn the whole batch into NaN. The failing
+    frames are split into 2^attempt batches, and the last attempt fits each frame alone, so that a pose is never
+    quarantined because of the other poses of its batch.
+    """
+    num_chunks = len(frame_ids) if attempt == max_retries else min(len(frame_ids), 2**attempt)
+    return np.array_split(frame_ids, num_chunks)
+
+
+# Settings of VPoser's IK engine (weights of the loss terms, and the LBFGS of the first pass)
+IK_STEPWISE_WEIGHTS = [
+    {"data": 100.0, "poZ_body": 0.01, "betas": 0.5},
+]
+IK_OPTIMIZER_ARGS = {
+    "type": "LBFGS",
+    "max_iter": 500,
+    "lr": 1,
+    "tolerance_change": 1e-4,
+}
+
+
+def ik_engine_kwargs(vposer_path: str, num_betas: int, verbosity: int, lr: float, max_iter: int) -> dict:
+    return {
+        "vposer_expr_dir": vposer_path,
+        "verbosity": verbosity,
+        "display_rc": (2, 2),
+        "data_loss": MSELoss(reduction="sum"),
+        "num_betas": num_betas,
+        "stepwise_weights": IK_STEPWISE_WEIGHTS,
+        "optimizer_args": {**IK_OPTIMIZER_ARGS, "lr": lr, "max_iter": max_iter},
+    }
+
+
+# state of an IK worker process (see IkWorkerPool)
+_IK_WORKER = {}
+
+
+def _init_ik_worker(num_threads: int, vposer_path: str, smpl_path: str, num_betas: int, smpl_joint_idx, device):
+    torch.set_num_threads(num_threads)
+    _IK_WORKER.update(
+        {
+            "vposer_path": vposer_path,
+            "num_betas": num_betas,
+            "device": device,
+            "source_pts": SourceKeyPoints(bm=smpl_path, joint_idx=smpl_joint_idx).to(device),
+            "ik_engines": {},
+        }
+    )
+
+
+def _fit_ik_batch(task: tuple) -> Tuple[int, Dict[str, np.ndarray]]:
+    batch_idx, target, initial_params, max_iter = task
+    device = _IK_WORKER["device"]
+
+    if max_iter not in _IK_WORKER["ik_engines"]:
+        engine_kwargs = ik_engine_kwargs(
+            _IK_WORKER["vposer_path"], _IK_WORKER["num_betas"], 0, IK_OPTIMIZER_ARGS["lr"], max_iter
+        )
+        _IK_WORKER["ik_engines"][max_iter] = IK_Engine(**engine_kwargs).to(device)
+
+    initial_body_params = {k: torch.from_numpy(v).float().to(device) for k, v in initial_params.items()}
+    target_pts = torch.from_numpy(target).float().to(device)
+    ik_res = _IK_WORKER["ik_engines"][max_iter](_IK_WORKER["source_pts"], target_pts, initial_body_params)
+    return batch_idx, {k: c2c(v) for k, v in ik_res.items()}
+
+
+class IkWorkerPool:
+    """
+    Worker processes which fit the first pass IK batches of a seed in parallel. Each worker has its own IK engine and
+    torch threads, so that a CPU node runs several smaller IK processes instead of a single one which doesn't scale
+    over all the cores. The pool is started once and shared by the seeds (starting a worker loads VPoser and SMPL-X).
+    """
+
+    def __init__(
+        self,
+        num_workers: int,
+        num_threads: int,
+        vposer_path: str,
+        smpl_path: str,
+        num_betas: int,
+        smpl_joint_idx: List[int],
+        device: str,
+    ):
+        # the workers are spawned: torch and its thread pools are not fork-safe
+        import multiprocessing as mp
+
+        self.num_workers = num_workers
+        self.pool = mp.get_context("spawn").Pool(
+            num_workers,
+            initializer=_init_ik_worker,
+            initargs=(num_threads, vposer_path, smpl_path, num_betas, smpl_joint_idx, device),
+        )
+
+    def imap_unordered(self, tasks: List[tuple]):
+        """
+        tasks: [(batch_idx, target (B, num_joints, 3), initial params {k: (B, dim)}, max_iter)] -> (batch_idx, ik_res)
+        """
+        return self.pool.imap_unordered(_fit_ik_batch, tasks)
+
+    def close(self):
+        self.pool.close()
+        self.pool.join()
+
+
+def keypoint_residual(
+    source_pts: SourceKeyPoints,
+    smpl_params: Dict[str, np.ndarray],
+    motion: np.ndarray,
+    batch_size: int,
+    device: str,
+) -> float:
+    """
+    Mean distance (m) between the SMPL-X keypoints of the IK results and the target keypoints (both in the IK frame).
+    """
+    residuals = []
+    frames = create_list_chunks(np.arange(len(motion)), batch_size, overlap_size=0, cut_smaller_batches=False)
+    with torch.no_grad():
+        for frame_ids in frames:
+            body_params = {k: smpl_params[k][frame_ids] for k in ["root_orient", "pose_body", "trans"]}
+            body_params["betas"] = np.repeat(smpl_params["betas"][None], len(frame_ids), axis=0)
+            body_params = {k: torch.from_numpy(v).float().to(device) for k, v in body_params.items()}
+
+            source_kpts = c2c(source_pts(body_params)["source_kpts"])
+            residuals.append(np.linalg.norm(source_kpts - motion[frame_ids], axis=-1).mean(-1))
+
+    return float(np.concatenate(residuals).mean())
+
+
+class ContinuousBatchIk:
+    """
+    VPoser IK with per-sample convergence and continuous batching.
+
+    The IK loss (data + VPoser latent + betas) is a sum of per-sample losses, so the samples are independent. They run
+    LBFGS in rounds of `round_iters` iterations on a batch of `num_slots` slots. After each round, the samples whose
+    loss changed less than `tolerance_change` in the round (or which used `max_iter` iterations) are retired, and the
+    freed slots are refilled with the pending samples. The LBFGS history is shared by the batch, so the optimizer
+    restarts every round. With round_iters >= max_iter, this is the batch-level LBFGS of IK_Engine.
+    """
+
+    def __init__(
+        self,
+        ik_engine: IK_Engine,
+        source_pts: SourceKeyPoints,
+        weights: Dict[str, float],
+        num_betas: int,
+        num_slots: int,
+        round_iters: int,
+        max_iter: int,
+        lr: float,
+        tolerance_change: float,
+        device: str,
+    ):
+        self.vp_model = ik_engine.vp_model
+        self.source_pts = source_pts
+        self.weights = weights
+        self.num_betas = num_betas
+        self.num_slots = num_slots
+        self.round_iters = round_iters
+        self.max_iter = max_iter
+        self.lr = lr
+        self.tolerance_change = tolerance_change
+        self.device = device
+
+    def sample_losses(self, free_vars: Dict[str, torch.Tensor], target_pts: torch.Tensor) -> torch.Tensor:
+        """
+        Per-sample IK losses (num_slots,), the same terms as the loss of IK_Engine.
+        """
+        pose_body = self.vp_model.decode(free_vars["poZ_body"])["pose_body"].contiguous().view(-1, 63)
+        body_params = {k: free_vars[k] for k in ["root_orient", "trans", "betas"]}
+        source_kpts = self.source_pts({**body_params, "pose_body": pose_body})["source_kpts"]
+
+        return (
+            self.weights["data"] * torch.pow(source_kpts - target_pts, 2).sum((1, 2))
+            + self.weights["poZ_body"] * torch.pow(free_vars["poZ_body"], 2).sum(-1)
+            + self.weights["betas"] * torch.pow(free_vars["betas"], 2).sum(-1)
+        )
+
+    def initial_vars(self, frame_ids: np.ndarray, initial_params: Optional[Dict[str, np.ndarray]]):
+        init = {
+            "root_orient": torch.zeros(len(frame_ids), 3),
+            "trans": torch.zeros(len(frame_ids), 3),
+            "betas": torch.zeros(len(frame_ids), self.num_betas),
+            "pose_body": torch.zeros(len(frame_ids), 63),
+        }
+        if initial_params is not None:
+            init.update({k: torch.from_numpy(v[frame_ids]).float() for k, v in initial_params.items() if k in init})
+        init = {k: v.to(self.device) for k, v in init.items()}
+
+        with torch.no_grad():
+            poZ_body = self.vp_model.encode(init.pop("pose_body")).mean
+        return {"poZ_body": poZ_body, **init}
+
+    def run(
+        self,
+        motion: np.ndarray,
+        frame_ids: np.ndarray,
+        initial_params: Optional[Dict[str, np.ndarray]] = None,
+        on_done: Optional[Callable[[np.ndarray, Dict[str, np.ndarray]], None]] = None,
+    ) -> int:
+        """
+        Fit the frames of the motion, calling on_done(frame_ids, ik_res) with the results of the retired samples.
+
+        Returns:
+        -------
+        sample_iters (int): total LBFGS iterations of all the samples
+        """
+        pending = deque(frame_ids)
+        slots = np.zeros(0, dtype=np.int64)  # frame index of each slot
+        slot_iters = np.zeros(0, dtype=np.int64)  # LBFGS iterations of each slot
+        prev_losses = np.zeros(0)
+        params: Dict[str, torch.Tensor] = {}
+        sample_iters = 0
+
+        progress = tqdm(total=len(frame_ids), desc="VPoser Continuous IK")
+        while len(pending) > 0 or len(slots) > 0:
+            # refill the free slots with the pending samples
+            new_ids = np.array([pending.popleft() for _ in range(min(self.num_slots - len(slots), len(pending)))])
+            if len(new_ids) > 0:
+                new_vars = self.initial_vars(new_ids, initial_params)
+                params = {k: torch.cat([params[k], v]) if k in params else v for k, v in new_vars.items()}
+                slots = np.concatenate([slots, new_ids]).astype(np.int64)
+                slot_iters = np.concatenate([slot_iters, np.zeros(len(new_ids), dtype=np.int64)])
+                prev_losses = np.concatenate([prev_losses, np.full(len(new_ids), np.inf)])
+
+            # a round of LBFGS on the slots
+            target_pts = torch.from_numpy(motion[slots]).float().to(self.device)
+            free_vars = {k: nn.Parameter(v.detach(), requires_grad=True) for k, v in params.items()}
+            optimizer = torch.optim.LBFGS(
+                list(free_vars.values()),
+                lr=self.lr,
+                max_iter=self.round_iters,
+                tolerance_change=self.tolerance_change,
+                history_size=100,
+                line_search_fn="strong_wolfe",
+            )
+
+            def closure():
+                optimizer.zero_grad()
+                loss = self.sample_losses(free_vars, target_pts).sum()
+                loss.backward()
+                return loss
+
+            optimizer.step(closure)
+            num_iters = optimizer.state[optimizer.param_groups[0]["params"][0]].get("n_iter", 0)
+            slot_iters += num_iters
+            sample_iters += num_iters * len(slots)
+
+            # retire the converged (or diverged) samples
+            with torch.no_grad():
+                losses = c2c(self.sample_losses(free_vars, target_pts))
+            converged = prev_losses - losses < self.tolerance_change
+            done = ~np.isfinite(losses) | converged | (slot_iters >= self.max_iter)
+            done_mask = torch.from_numpy(done).to(self.device)
+
+            if done.any():
+                ik_res = {k: c2c(v[done_mask]) for k, v in free_vars.items()}
+                with torch.no_grad():
+                    pose_body = self.vp_model.decode(free_vars["poZ_body"][done_mask])["pose_body"]
+                ik_res["pose_body"] = c2c(pose_body.contiguous().view(-1, 63))
+                if on_done is not None:
+                    on_done(slots[done], ik_res)
+                progress.update(int(done.sum()))
+
+            params = {k: v.detach()[~done_mask] for k, v in free_vars.items()}
+            slots, slot_iters, prev_losses = slots[~done], slot_iters[~done], losses[~done]
+
+        progress.close()
+        return sample_iters
+
+
 def run_ik_engine(
     motion: np.ndarray,
     batch_size: int,
@@ -109,7 +401,17 @@ def run_ik_engine(
     device: str,
     verbosity: int,
     smpl_joint_idx: List[int],
-):
+    max_retries: int = 0,
+    retry_lr_decay: float = 0.5,
+    retry_init_std: float = 0.1,
+    quarantine: bool = False,
+    checkpoint=None,
+    initial_params: Optional[Dict[str, np.ndarray]] = None,
+    max_iter: int = 500,
+    continuous: bool = False,
+    round_iters: int = 10,
+    worker_pool: Optional[IkWorkerPool] = None,
+) -> Tuple[dict, dict]:
     """
     Args:
     ----------
@@ -121,62 +423,184 @@ def run_ik_engine(
     num_betas (int): number of betas
     device (str): device to run the code
     verbosity (int): 0: silent, 1: text, 2: text/visual. running 2 over ssh would need extra work
+    max_retries (int): number of retries of the frames whose results are NaN
+    retry_lr_decay (float): learning rate of the retry k is lr * retry_lr_decay^k
+    retry_init_std (float): std (rad) of the random initial root_orient & pose_body of the retries (0: zero init)
+    quarantine (bool): drop the frames which are still NaN after the retries (otherwise, raise ValueError)
+    checkpoint (utils.checkpoint.IkCheckpoint): checkpoints of the first pass batches (restored batches are skipped)
+    initial_params (dict): initial root_orient, pose_body, trans, betas of the first pass (N x dim, e.g. predictions of
+        the learned IK), otherwise the first pass starts from the rest pose
+    max_iter (int): LBFGS iterations of the first pass (0: the initial params are the results, retries run in full)
+    continuous (bool): run the first pass with the per-sample convergence and continuous batching (ContinuousBatchIk)
+    round_iters (int): LBFGS iterations of a round of the continuous batching
+    worker_pool (IkWorkerPool): worker processes which fit the first pass batches in parallel (not with continuous)
 
     Returns:
     -------
-    smpl_params (dict): dictionary of smpl parameters
+    smpl_params (dict): dictionary of smpl parameters (without the quarantined frames)
+    ik_report (dict): counters of the NaN frames, the retries and the quarantined frames (indices in the motion),
+        the wall time (and the LBFGS iterations of the continuous batching) of the first pass, and the mean keypoint
+        residual (m)
     """
 
-    data_loss = MSELoss(reduction="sum")
+    # IK engines of the attempts (0: first pass, k: retry k with a smaller learning rate), built on demand
+    ik_engines: Dict[int, IK_Engine] = {}
+
+    def get_ik_engine(attempt: int) -> IK_Engine:
+        if attempt not in ik_engines:
+            engine_kwargs = ik_engine_kwargs(
+                vposer_path,
+                num_betas,
+                verbosity,
+                lr=IK_OPTIMIZER_ARGS["lr"] * retry_lr_decay**attempt,
+                max_iter=max_iter if attempt == 0 else IK_OPTIMIZER_ARGS["max_iter"],
+            )
+            ik_engines[attempt] = IK_Engine(**engine_kwargs).to(device)
+        return ik_engines[attempt]
+
+    source_pts = SourceKeyPoints(bm=smpl_path, joint_idx=smpl_joint_idx).to(device)
+    generator = torch.Generator().manual_seed(0)
+
+    def fit(frame_ids: np.ndarray, attempt: int) -> Dict[str, np.ndarray]:
+        target_pts = torch.from_numpy(motion[frame_ids]).to(device).float()
+
+        # the first pass starts from the initial params (if any)
+        initial_body_params = {}
+        if attempt == 0 and initial_params is not None:
+            if max_iter == 0:
+                return {k: v[frame_ids].astype(np.float32) for k, v in initial_params.items()}
+            for k, v in initial_params.items():
+                initial_body_params[k] = torch.from_numpy(v[frame_ids]).float().to(device)
+
+        # retries start from a random pose near the rest pose instead of the rest pose
+        if attempt > 0 and retry_init_std > 0:
+            for k, dim in [("root_orient", 3), ("pose_body", 63)]:
+                init = torch.randn(len(frame_ids), dim, generator=generator) * retry_init_std
+                initial_body_params[k] = init.to(device)
+
+        ik_res = get_ik_engine(attempt)(source_pts, target_pts, initial_body_params)
+        return {k: c2c(v) for k, v in ik_res.items()}
+
+    # results of all the frames, filled by frame index
+    d: Dict[str, np.ndarray] = {}
+    nan_mask = np.zeros(len(motion), dtype=bool)
+
+    def merge(frame_ids: np.ndarray, ik_res: Dict[str, np.ndarray]):
+        for k, v in ik_res.items():
+            if k not in d:
+                d[k] = np.full((len(motion),) + v.shape[1:], np.nan, dtype=v.dtype)
+            d[k][frame_ids] = v
+        nan_mask[frame_ids] = nan_sample_mask(ik_res, len(frame_ids))
 
-    stepwise_weights = [
-        {"data": 100.0, "poZ_body": 0.01, "betas": 0.5},
-    ]
-
-    optimizer_args = {
-        "type": "LBFGS",
-        "max_iter": 500,
-        "lr": 1,
-        "tolerance_change": 1e-4,
-    }
-    ik_engine = IK_Engine(
-        vposer_expr_dir=vposer_path,
-        verbosity=verbosity,
-        display_rc=(2, 2),
-        data_loss=data_loss,
-        num_betas=num_betas,
-        stepwise_weights=stepwise_weights,
-        optimizer_args=optimizer_args,
-    ).to(device)
-
-    all_results: dict[any, List] = {}
     batched_frames = create_list_chunks(
         np.arange(len(motion)), batch_size, overlap_size=0, cut_smaller_batches=False
     )
-    batched_frames = tqdm(batched_frames, desc="VPoser Advanced IK")
-
-    for cur_frame_ids in batched_frames:
-        # fmt: off
-        target_pts = torch.from_numpy(motion[cur_frame_ids]).to(device).float()
-        source_pts = SourceKeyPoints(
-            bm=smpl_path,
-            joint_idx=smpl_joint_idx
-        ).to(device)
-        # fmt: on
-
-        ik_res = ik_engine(source_pts, target_pts, {})
-        ik_res_detached = {k: c2c(v) for k, v in ik_res.items()}
-        nan_mask = np.isnan(ik_res_detached["trans"]).sum(-1) != 0
-        if nan_mask.sum() != 0:
-            raise ValueError("Sum results were NaN!")
-        for k, v in ik_res_detached.items():
-            if k not in all_results:
-                all_results[k] = []
-            all_results[k].append(v)
-
-    d = {k: np.concatenate(v, axis=0) for k, v in all_results.items()}
+    batched_frames = [np.asarray(cur_frame_ids) for cur_frame_ids in batched_frames]
+
+    # restore the checkpointed batches
+    pending_batches = []
+    for batch_idx, cur_frame_ids in enumerate(batched_frames):
+        ik_res = checkpoint.load(batch_idx, motion[cur_frame_ids]) if checkpoint is not None else None
+        if ik_res is None:
+            pending_batches.append(batch_idx)
+        else:
+            merge(cur_frame_ids, ik_res)
+
+    first_pass = {"continuous": continuous and max_iter > 0}
+    start = time.perf_counter()
+    if first_pass["continuous"] and len(pending_batches) > 0:
+        # the samples of all the pending batches share the slots, and a batch is checkpointed once all its samples are
+        # retired
+        batch_of_frame = np.zeros(len(motion), dtype=np.int64)
+        num_remaining = {}
+        for batch_idx in pending_batches:
+            batch_of_frame[batched_frames[batch_idx]] = batch_idx
+            num_remaining[batch_idx] = len(batched_frames[batch_idx])
+
+        def on_done(frame_ids: np.ndarray, ik_res: Dict[str, np.ndarray]):
+            merge(frame_ids, ik_res)
+            for batch_idx, count in zip(*np.unique(batch_of_frame[frame_ids], return_counts=True)):
+                num_remaining[batch_idx] -= count
+                if num_remaining[batch_idx] == 0 and checkpoint is not None:
+                    cur_frame_ids = batched_frames[batch_idx]
+                    checkpoint.save(batch_idx, motion[cur_frame_ids], {k: v[cur_frame_ids] for k, v in d.items()})
+
+        driver = ContinuousBatchIk(
+            ik_engine=get_ik_engine(0),
+            source_pts=source_pts,
+            weights=IK_STEPWISE_WEIGHTS[-1],
+            num_betas=num_betas,
+            num_slots=batch_size,
+            round_iters=round_iters,
+            max_iter=max_iter,
+            lr=IK_OPTIMIZER_ARGS["lr"],
+            tolerance_change=IK_OPTIMIZER_ARGS["tolerance_change"],
+            device=device,
+        )
+        pending_frames = np.concatenate([batched_frames[batch_idx] for batch_idx in pending_batches])
+        first_pass["sample_iters"] = driver.run(motion, pending_frames, initial_params, on_done)
+    elif worker_pool is not None and max_iter > 0 and len(pending_batches) > 0:
+        # the batches are fitted by the worker processes, and checkpointed as they finish
+        first_pass["num_workers"] = worker_pool.num_workers
+        tasks = []
+        for batch_idx in pending_batches:
+            cur_frame_ids = batched_frames[batch_idx]
+            init = {} if initial_params is None else {k: v[cur_frame_ids] for k, v in initial_params.items()}
+            tasks.append((batch_idx, motion[cur_frame_ids], init, max_iter))
+
+        results = worker_pool.imap_unordered(tasks)
+        for batch_idx, ik_res in tqdm(results, total=len(tasks), desc="VPoser Advanced IK"):
+            cur_frame_ids = batched_frames[batch_idx]
+            if checkpoint is not None:
+                checkpoint.save(batch_idx, motion[cur_frame_ids], ik_res)
+            merge(cur_frame_ids, ik_res)
+    else:
+        for batch_idx in tqdm(pending_batches, desc="VPoser Advanced IK"):
+            cur_frame_ids = batched_frames[batch_idx]
+            ik_res = fit(cur_frame_ids, attempt=0)
+            if checkpoint is not None:
+                checkpoint.save(batch_idx, motion[cur_frame_ids], ik_res)
+            merge(cur_frame_ids, ik_res)
+    first_pass["wall_time"] = time.perf_counter() - start
+    first_pass["num_restored_batches"] = len(batched_frames) - len(pending_batches)
+
+    # retry only the NaN frames, the healthy frames are never fitted again
+    ik_report = {
+        "num_frames": len(motion),
+        "first_pass": first_pass,
+        "num_nan_first_pass": int(nan_mask.sum()),
+        "retries": [],
+    }
+    for attempt in range(1, max_retries + 1):
+        failing_ids = np.flatnonzero(nan_mask)
+        if len(failing_ids) == 0:
+            break
+
+        for cur_frame_ids in tqdm(retry_chunks(failing_ids, attempt, max_retries), desc=f"IK retry {attempt}"):
+            merge(cur_frame_ids, fit(cur_frame_ids, attempt))
+
+        ik_report["retries"].append(
+            {
+                "attempt": attempt,
+                "num_retried": len(failing_ids),
+                "num_recovered": len(failing_ids) - int(nan_mask[failing_ids].sum()),
+            }
+        )
+
+    quarantined_ids = np.flatnonzero(nan_mask)
+    ik_report["num_recovered"] = ik_report["num_nan_first_pass"] - len(quarantined_ids)
+    ik_report["num_quarantined"] = len(quarantined_ids)
+    ik_report["quarantined_frames"] = quarantined_ids.tolist()
+    if len(quarantined_ids) > 0:
+        if not quarantine or nan_mask.all():
+            raise ValueError(f"IK results of {len(quarantined_ids)} frames were NaN after {max_retries} retries!")
+        d = {k: v[~nan_mask] for k, v in d.items()}
+
     d["betas"] = np.median(d["betas"], axis=0)
 
+    # fitting quality of the results (IK frame, before the coordinate transform)
+    ik_report["keypoint_residual"] = keypoint_residual(source_pts, d, motion[~nan_mask], batch_size, device)
+
     transformed_d = transform_smpl_coordinate(
         bm_fname=smpl_path,
         trans=d["trans"],
@@ -193,7 +617,7 @@ def run_ik_engine(
     d["mocap_frame_rate"] = 30
     d["num_betas"] = num_betas
 
-    return d
+    return d, ik_report
 
 
 def make_vids(
@@ -218,6 +642,8 @@ def make_vids(
     fps (int): frame per second
     rotate (bool): whether to rotate the video or not
     """
+    from body_visualizer.tools.vis_tools import render_smpl_params
+    from body_visualizer.tools.vis_tools import imagearray2file
 
     bm = BodyModel(bm_fname=smpl_path, num_betas=num_betas)
     smpl_dict: dict = np.load(smpl_path)  # smpl body model
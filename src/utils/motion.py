@@ -0,0 +1,121 @@
+"""
+Array-native representation of robot motions.
+
+A robot motion used to be a list of per-frame dicts ({joint_name: angle}), which means millions of small dicts and
+slow pickles for long motions. `RobotMotion` keeps the joint angles in a single (T, J) float32 array with a tuple of
+the joint names, and provides adapters from/to the legacy format.
+"""
+
+import os.path as osp
+import pickle
+import sys
+import numpy as np
+from functools import lru_cache
+from typing import Dict, Iterator, List, Sequence, Union
+
+sys.path.append("./src")
+from utils.types import RobotType
+from utils.consts import *
+
+
+class RobotMotion:
+    """
+    Robot motion backed by a (T, J) float32 array of joint angles and a tuple of J joint names.
+
+    Indexing a frame (`motion[i]`) or iterating over the motion returns the legacy per-frame dicts, so that the codes
+    which need a dict of a single pose (e.g. kinpy's forward kinematics) still work.
+    """
+
+    def __init__(self, angles: np.ndarray, joint_names: Sequence[str]):
+        angles = np.asarray(angles, dtype=np.float32)
+        joint_names = tuple(joint_names)
+
+        if angles.ndim != 2 or angles.shape[1] != len(joint_names):
+            raise ValueError(f"angles should be shaped (T, {len(joint_names)}): {angles.shape}")
+
+        self.angles = np.ascontiguousarray(angles)  # shape: (T, J)
+        self.joint_names = joint_names  # (J,)
+
+    # Adapters for the legacy format (list of per-frame dicts)
+    @classmethod
+    def from_dicts(cls, motion: List[Dict[str, float]], joint_names: Sequence[str] = None) -> "RobotMotion":
+        if joint_names is None:
+            joint_names = list(motion[0].keys())
+        angles = np.array([[pose[k] for k in joint_names] for pose in motion], dtype=np.float32)
+
+        return cls(angles.reshape(len(motion), len(joint_names)), joint_names)
+
+    def to_dicts(self) -> List[Dict[str, float]]:
+        return [self.frame(i) for i in range(len(self))]
+
+    def frame(self, idx: int) -> Dict[str, float]:
+        return dict(zip(self.joint_names, self.angles[idx].tolist()))
+
+    def __len__(self) -> int:
+        return len(self.angles)
+
+    def __getitem__(self, idx: Union[int, slice]) -> Union[Dict[str, float], "RobotMotion"]:
+        if isinstance(idx, slice):
+            return RobotMotion(self.angles[idx], self.joint_names)
+        return self.frame(idx)
+
+    def __iter__(self) -> Iterator[Dict[str, float]]:
+        for i in range(len(self)):
+            yield self.frame(i)
+
+    def joint_indices(self, joint_names: Sequence[str]) -> np.ndarray:
+        name_to_idx = {name: i for i, name in enumerate(self.joint_names)}
+        return np.array([name_to_idx[name] for name in joint_names], dtype=np.int64)
+
+    def select(self, joint_names: Sequence[str]) -> "RobotMotion":
+        """
+        Return the motion of the given joints (in the given order).
+        """
+        return RobotMotion(self.angles[:, self.joint_indices(joint_names)], joint_names)
+
+    def save(self, path: str):
+        np.savez(path, angles=self.angles, joint_names=np.array(self.joint_names))
+
+    @classmethod
+    def load(cls, path: str) -> "RobotMotion":
+        data = np.load(path)
+        return cls(data["angles"], [str(k) for k in data["joint_names"]])
+
+
+def as_robot_motion(motion: Union[RobotMotion, List[Dict[str, float]]]) -> RobotMotion:
+    """
+    Adapt the legacy format (list of per-frame dicts) into RobotMotion.
+    """
+    if isinstance(motion, RobotMotion):
+        return motion
+    return RobotMotion.from_dicts(motion)
+
+
+def load_robot_motion(path: str) -> RobotMotion:
+    """
+    Load a robot motion file (.npz: RobotMotion, .pkl: legacy list of per-frame dicts).
+    If the .npz file doesn't exist, the legacy .pkl file with the same name is loaded.
+    """
+    legacy_path = osp.splitext(path)[0] + ".pkl"
+    if path.endswith(".npz") and not osp.exists(path) and osp.exists(legacy_path):
+        path = legacy_path
+
+    if path.endswith(".pkl"):
+        return RobotMotion.from_dicts(pickle.load(open(path, "rb")))
+    return RobotMotion.load(path)
+
+
+@lru_cache(maxsize=1)
+def _load_gt_motions(gt_path: str) -> dict:
+    return pickle.load(open(gt_path, "rb"))
+
+
+def load_gt_motion(robot_type: RobotType, motion_idx: str, gt_path: str = GT_PATH) -> RobotMotion:
+    """
+    Load the ground truth motion (joint angles q) of the robot from the GT pickle file.
+    The GT pickle file is loaded only once per process.
+    """
+    robot_name = robot_type.name
+    robot_name_for_gt = robot_name[0] + robot_name[1:].lower()
+
+    return RobotMotion.from_dicts(_load_gt_motions(gt_path)[robot_name_for_gt][motion_idx]["q"])
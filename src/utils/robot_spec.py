@@ -0,0 +1,105 @@
+"""
+Data-driven robot registry: a robot is defined by its URDF and a small YAML spec (`data/ROBOT/ROBOT.yaml`).
+
+Spec format:
+    urdf, urdf_4_render (optional): URDF paths (the render URDF defaults to the URDF)
+    angles_path, xyzs_reps_path, smpl_params_path: data directories of the robot
+    joints_of_interest: {joint name: [lower, upper] or null (use the limit in the URDF)}
+    cf_joints_of_interest: [joint names]
+    smpl_keypoints: conversion of the robot's link xyzs into SMPL-X joint xyzs
+        joints: {SMPL-X joint name: {links: {link name: weight}, vectors: {vector name: weight}, offset: [x, y, z]}}
+        vectors (optional): {vector name: {from: link name, to: link name}} (link differences shared by the joints)
+        offset, scale (optional): the keypoints are (keypoint + offset) * scale
+    evaluate_links: [link names]
+    joint_vectors: [{from: link name, to: link name}]
+    exclude_links (optional): [link names] (links to exclude while visualizing)
+    smooth_window: int
+
+The link indices and the dims are derived from the kinematic chain of the URDF. Specs and chains are loaded only for
+the requested robot and cached, so that adding a robot is a data change (a new RobotType member + URDF + spec).
+"""
+
+import sys
+import numpy as np
+from functools import lru_cache
+from typing import List, Sequence
+
+sys.path.append("./src")
+from utils.types import RobotType
+from utils.urdf import UrdfChain
+from utils.consts import *
+
+
+@lru_cache(maxsize=None)
+def load_robot_spec(robot_type: RobotType) -> dict:
+    """
+    Load the YAML spec of the robot (cached per robot).
+    """
+    # only needed once a robot is loaded (not for the startup of the tools)
+    import yaml
+
+    with open(ROBOT_SPEC_PATH(robot_type.name)) as f:
+        return yaml.safe_load(f)
+
+
+def check_link_names(chain: UrdfChain, link_names: Sequence[str], field: str):
+    unknown_links = [name for name in link_names if name not in chain.link_index]
+    if len(unknown_links) > 0:
+        raise ValueError(f"Unknown links in `{field}` of the robot spec: {unknown_links}")
+
+
+class SmplKeypointConverter:
+    """
+    Convert the robot's link xyzs (num_links, 3) into SMPL-X joint xyzs (num_joints, 3) with the linear map of the
+    `smpl_keypoints` spec: smpl_xyzs = weights @ link_xyzs + offsets.
+
+    The weights (num_joints, num_links) and offsets (num_joints, 3) are precomputed once, so that a batch of poses is
+    converted with a single matmul. (Gathering only the few links of each joint with index tables is slower than the
+    dense matmul at these sizes.)
+    """
+
+    def __init__(self, keypoints_spec: dict, chain: UrdfChain):
+        joints: dict = keypoints_spec["joints"]
+        vectors: dict = keypoints_spec.get("vectors", {})
+        scale = float(keypoints_spec.get("scale", 1.0))
+        global_offset = np.asarray(keypoints_spec.get("offset", [0.0, 0.0, 0.0]), dtype=np.float64)
+
+        unknown_joints = [name for name in joints if name not in SMPLX_JOINT_INDEX.__members__]
+        if len(unknown_joints) > 0:
+            raise ValueError(f"Unknown SMPL-X joints in `smpl_keypoints` of the robot spec: {unknown_joints}")
+        for vector in vectors.values():
+            check_link_names(chain, [vector["from"], vector["to"]], "smpl_keypoints.vectors")
+
+        self.joint_names: List[str] = list(joints.keys())
+        self.smpl_joint_idx: List[int] = [SMPLX_JOINT_INDEX[name].value for name in self.joint_names]
+
+        self.weights = np.zeros((len(joints), len(chain)), dtype=np.float64)  # (num_joints, num_links)
+        self.offsets = np.zeros((len(joints), 3), dtype=np.float64)  # (num_joints, 3)
+        for i, joint in enumerate(joints.values()):
+            links = joint.get("links", {})
+            check_link_names(chain, links.keys(), "smpl_keypoints.joints")
+
+            for link, weight in links.items():
+                self.weights[i, chain.link_index[link]] += weight
+            for vector_name, weight in joint.get("vectors", {}).items():
+                vector = vectors[vector_name]
+                self.weights[i, chain.link_index[vector["to"]]] += weight
+                self.weights[i, chain.link_index[vector["from"]]] -= weight
+
+            self.offsets[i] = joint.get("offset", [0.0, 0.0, 0.0])
+
+        # fold the global offset & scale into the map
+        self.weights *= scale
+        self.offsets = (self.offsets + global_offset) * scale
+
+    def __call__(self, xyzs: List[np.ndarray]) -> np.ndarray:
+        """
+        xyzs: link xyzs of a single pose (num_links, 3) -> smpl_xyzs: (num_joints, 3)
+        """
+        return self.weights @ np.asarray(xyzs, dtype=np.float64) + self.offsets
+
+    def batch(self, xyzs: np.ndarray) -> np.ndarray:
+        """
+        xyzs: link xyzs of the poses (N, num_links, 3) -> smpl_xyzs: (N, num_joints, 3)
+        """
+        return np.matmul(self.weights, np.asarray(xyzs, dtype=np.float64)) + self.offsets
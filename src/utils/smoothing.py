@@ -0,0 +1,192 @@
+"""
+Smoothing stage of the robot motions.
+Filter all the joints of a motion ((T, J) joint angles array) at once along the time axis
+with the Savitzky-Golay filter.
+The filter window is set per robot (RobotConfig.smooth_window).
+
+For the live operation, the online filters (OneEuroFilter, CausalSavgolFilter) smooth a stream of frames with a
+bounded latency.
+"""
+
+import sys
+import numpy as np
+from abc import ABC, abstractmethod
+from collections import deque
+from typing import List, Optional, Union
+
+sys.path.append("./src")
+from utils.motion import RobotMotion
+from utils.consts import *
+
+
+def smooth_angles(angles: np.ndarray, window: int, polyorder: int = SMOOTH_POLYORDER) -> np.ndarray:
+    """
+    Smooth the joint angles with the Savitzky-Golay filter along the time axis.
+    The window is clamped to the number of frames, and too short motions are returned as they are.
+
+    Args:
+        angles: np.ndarray (T, J)
+        window: int (filter window in frames)
+        polyorder: int
+
+    Returns:
+        smoothed_angles: np.ndarray (T, J)
+    """
+    # scipy.signal is slow to import, so it is imported only when a motion is smoothed
+    from scipy.signal import savgol_filter
+
+    window = min(window, len(angles))
+    if window <= polyorder:
+        return angles.copy()
+
+    return savgol_filter(angles, window, polyorder, axis=0).astype(angles.dtype)
+
+
+def smooth_motion(motion: RobotMotion, window: int, polyorder: int = SMOOTH_POLYORDER) -> RobotMotion:
+    """
+    Smooth all the joints of the motion in a single filter call.
+
+    Args:
+        motion: RobotMotion
+        window: int (filter window in frames, e.g. RobotConfig.smooth_window)
+        polyorder: int
+
+    Returns:
+        smoothed_motion: RobotMotion
+    """
+    return RobotMotion(smooth_angles(motion.angles, window, polyorder), motion.joint_names)
+
+
+class OnlineFilter(ABC):
+    """
+    Causal smoothing of a stream of joint-angle vectors (one frame at a time, O(1) work per frame).
+
+    Push the frames with `filter(angles)`. The smoothed frame of `latency_frames` frames before is returned
+    (None until the first `latency_frames` frames are pushed), and `flush()` returns the remaining frames.
+    """
+
+    latency_frames = 0
+
+    @abstractmethod
+    def __call__(self, angles: np.ndarray) -> Optional[np.ndarray]:
+        pass
+
+    def flush(self) -> List[np.ndarray]:
+        return []
+
+    @abstractmethod
+    def reset(self):
+        pass
+
+
+class OneEuroFilter(OnlineFilter):
+    """
+    One Euro filter (Casiez et al., CHI 2012): an adaptive low-pass filter whose cutoff frequency increases with
+    the speed, so that the slow motions are smoothed strongly and the fast motions are followed with little lag.
+    No lookahead (latency_frames = 0), the lag comes from the low-pass filtering only.
+    """
+
+    def __init__(
+        self,
+        freq: float = MOTION_FPS,
+        min_cutoff: float = ONE_EURO_MIN_CUTOFF,
+        beta: float = ONE_EURO_BETA,
+        d_cutoff: float = ONE_EURO_D_CUTOFF,
+    ):
+        self.freq = freq
+        self.min_cutoff = min_cutoff
+        self.beta = beta
+        self.d_cutoff = d_cutoff
+        self.reset()
+
+    def reset(self):
+        self.prev_angles = None
+        self.prev_velocity = None
+
+    def _alpha(self, cutoff: Union[float, np.ndarray]) -> Union[float, np.ndarray]:
+        tau = 1.0 / (2 * np.pi * cutoff)
+        return 1.0 / (1.0 + tau * self.freq)
+
+    def __call__(self, angles: np.ndarray) -> np.ndarray:
+        angles = np.asarray(angles, dtype=np.float64)
+        if self.prev_angles is None:
+            self.prev_angles = angles
+            self.prev_velocity = np.zeros_like(angles)
+            return angles.copy()
+
+        # low-pass filtered velocity
+        velocity = (angles - self.prev_angles) * self.freq
+        a_d = self._alpha(self.d_cutoff)
+        velocity = a_d * velocity + (1 - a_d) * self.prev_velocity
+
+        # low-pass filtered angles with the speed adaptive cutoff
+        a = self._alpha(self.min_cutoff + self.beta * np.abs(velocity))
+        smoothed = a * angles + (1 - a) * self.prev_angles
+
+        self.prev_angles = smoothed
+        self.prev_velocity = velocity
+        return smoothed
+
+
+class CausalSavgolFilter(OnlineFilter):
+    """
+    Savitzky-Golay filter with a fixed lookahead.
+    A polynomial is fitted on the last `window` frames and evaluated `lookahead` frames before the newest frame,
+    so every frame is delayed by `lookahead` frames (lookahead = 0: fully causal, lookahead = window // 2: offline).
+    """
+
+    def __init__(
+        self,
+        window: int = CAUSAL_SAVGOL_WINDOW,
+        lookahead: int = CAUSAL_SAVGOL_LOOKAHEAD,
+        polyorder: int = SMOOTH_POLYORDER,
+    ):
+        from scipy.signal import savgol_coeffs
+
+        if not 0 <= lookahead < window:
+            raise ValueError(f"lookahead should be in [0, window): {lookahead}")
+
+        self.window = window
+        self.latency_frames = lookahead
+        # filter coefficients of the window ordered in time, evaluated at the delayed frame
+        self.coeffs = savgol_coeffs(window, polyorder, pos=window - 1 - lookahead, use="dot")
+        self.reset()
+
+    def reset(self):
+        self.frames = deque(maxlen=self.window)
+        self.num_pushed = 0
+
+    def __call__(self, angles: np.ndarray) -> Optional[np.ndarray]:
+        self.frames.append(np.asarray(angles, dtype=np.float64))
+        self.num_pushed += 1
+
+        if self.num_pushed <= self.latency_frames:
+            return None
+
+        # not enough frames for the polynomial fit yet: return the delayed frame as it is
+        if len(self.frames) < self.window:
+            return self.frames[-1 - self.latency_frames].copy()
+
+        return self.coeffs @ np.stack(self.frames)
+
+    def flush(self) -> List[np.ndarray]:
+        # the last frames don't have the lookahead frames, return them as they are
+        num_remaining = min(self.latency_frames, self.num_pushed)
+        return [self.frames[-num_remaining + i].copy() for i in range(num_remaining)]
+
+
+def filter_online(online_filter: OnlineFilter, motion: RobotMotion) -> RobotMotion:
+    """
+    Stream the frames of the motion through the online filter, and collect the smoothed frames
+    (aligned with the input frames, i.e. the lookahead delay is removed).
+    """
+    online_filter.reset()
+
+    smoothed = []
+    for angles in motion.angles:
+        out = online_filter(angles)
+        if out is not None:
+            smoothed.append(out)
+    smoothed += online_filter.flush()
+
+    return RobotMotion(np.stack(smoothed), motion.joint_names)
@@ -0,0 +1,170 @@
+"""
+Differentiable batched forward kinematics of the robots in torch, generated from the URDF chain (utils/urdf.py).
+
+kinpy (utils/forward_kinematics.py) computes one pose per call, which is far too slow inside the training loop. Here
+the links are grouped by their depth in the chain, and each depth is a few batched matrix products over all the poses
+and all the links of the depth, so the link positions are a part of the training graph (e.g. the link-position loss of
+model/train_one_stage.py). The link positions are the same as kinpy's (same joint origins, axes, and 0 for the joints
+without an angle).
+"""
+
+import sys
+import numpy as np
+import torch
+import torch.nn as nn
+from typing import Dict, List, Optional, Sequence
+
+sys.path.append("./src")
+from utils.urdf import UrdfChain
+
+
+def rpy_to_matrix(rpy: Sequence[float]) -> np.ndarray:
+    """
+    Rotation matrix of the fixed-axis roll, pitch, yaw of a URDF origin: Rz(yaw) @ Ry(pitch) @ Rx(roll)
+    """
+    roll, pitch, yaw = rpy
+    cr, sr, cp, sp, cy, sy = np.cos(roll), np.sin(roll), np.cos(pitch), np.sin(pitch), np.cos(yaw), np.sin(yaw)
+    return np.array(
+        [
+            [cy * cp, cy * sp * sr - sy * cr, cy * sp * cr + sy * sr],
+            [sy * cp, sy * sp * sr + cy * cr, sy * sp * cr - cy * sr],
+            [-sp, cp * sr, cp * cr],
+        ]
+    )
+
+
+def build_fk_levels(chain: UrdfChain, joint_names: List[str], link_names: List[str]) -> Dict[str, np.ndarray]:
+    """
+    Tables of the links needed for the link_names (the link_names and their ancestors), grouped by their depth.
+
+    Returns (the links of a depth are contiguous, in the order of the depth):
+        level_bounds (K + 1,): the links of the depth d are [level_bounds[d], level_bounds[d + 1])
+        parent_idxs (N,): index of the parent of each link within the previous depth (-1: the root)
+        angle_idxs (N,): index of the joint angle of each link in joint_names (J: no angle, stays at 0)
+        joint_types (N,): 0 fixed, 1 revolute (or continuous), 2 prismatic
+        origin_rots (N, 3, 3), origin_xyzs (N, 3), axes (N, 3): joint origins and unit axes
+        output_idxs (L,): index of each of the link_names in the tables
+    """
+    # the ancestors of the output links
+    needed = set()
+    for link in link_names:
+        if link not in chain.link_index:
+            raise ValueError(f"Unknown link {link} of the URDF chain")
+        while link not in needed:
+            needed.add(link)
+            if link == chain.root_link:
+                break
+            link = chain.parent_joint[link].parent
+
+    depths = {chain.root_link: 0}
+    for link in chain.link_names:  # parents come before their children in the forward kinematics order
+        if link != chain.root_link:
+            depths[link] = depths[chain.parent_joint[link].parent] + 1
+    links = sorted(needed, key=lambda link: (depths[link], chain.link_index[link]))
+
+    joint_type_ids = {"fixed": 0, "revolute": 1, "continuous": 1, "prismatic": 2}
+    joint_index = {name: i for i, name in enumerate(joint_names)}
+    level_start: Dict[int, int] = {}
+    tables = {k: [] for k in ["parent_idxs", "angle_idxs", "joint_types", "origin_rots", "origin_xyzs", "axes"]}
+    for i, link in enumerate(links):
+        level_start.setdefault(depths[link], i)
+        if link == chain.root_link:
+            parent_idx, angle_idx, joint_type = -1, len(joint_names), 0
+            origin_rot, origin_xyz, axis = np.eye(3), np.zeros(3), np.array([0.0, 0.0, 1.0])
+        else:
+            joint = chain.parent_joint[link]
+            if joint.joint_type not in joint_type_ids:
+                raise ValueError(f"Unsupported joint type {joint.joint_type} of {joint.name}")
+            parent_idx = links.index(joint.parent) - level_start[depths[link] - 1]
+            angle_idx, joint_type = joint_index.get(joint.name, len(joint_names)), joint_type_ids[joint.joint_type]
+            origin_rot, origin_xyz = rpy_to_matrix(joint.origin_rpy), np.array(joint.origin_xyz)
+            # the fixed joints may have a zero axis (unused)
+            axis_norm = np.linalg.norm(joint.axis)
+            axis = np.array(joint.axis) / axis_norm if axis_norm > 0 else np.array([0.0, 0.0, 1.0])
+
+        tables["parent_idxs"].append(parent_idx)
+        tables["angle_idxs"].append(angle_idx)
+        tables["joint_types"].append(joint_type)
+        tables["origin_rots"].append(origin_rot)
+        tables["origin_xyzs"].append(origin_xyz)
+        tables["axes"].append(axis)
+
+    tables = {k: np.array(v) for k, v in tables.items()}
+    tables["level_bounds"] = np.array(sorted(level_start.values()) + [len(links)])
+    tables["output_idxs"] = np.array([links.index(link) for link in link_names])
+    return tables
+
+
+class TorchForwardKinematics(nn.Module):
+    """
+    Batched link positions of the robot: joint angles (B, J) in the order of joint_names -> (B, L, 3) of link_names.
+
+    The joints which are not in joint_names stay at 0 (like the missing joints of kinpy's forward_kinematics).
+    """
+
+    def __init__(self, chain: UrdfChain, joint_names: List[str], link_names: Optional[List[str]] = None):
+        super(TorchForwardKinematics, self).__init__()
+
+        self.link_names = list(chain.link_names if link_names is None else link_names)
+        tables = build_fk_levels(chain, list(joint_names), self.link_names)
+        self.level_bounds: List[int] = tables["level_bounds"].tolist()
+
+        self.register_buffer("parent_idxs", torch.from_numpy(tables["parent_idxs"]).long())
+        self.register_buffer("angle_idxs", torch.from_numpy(tables["angle_idxs"]).long())
+        self.register_buffer("output_idxs", torch.from_numpy(tables["output_idxs"]).long())
+        self.register_buffer("revolute", torch.from_numpy(tables["joint_types"] == 1).float())
+        self.register_buffer("prismatic", torch.from_numpy(tables["joint_types"] == 2).float())
+        self.register_buffer("origin_rots", torch.from_numpy(tables["origin_rots"]).float())
+        self.register_buffer("origin_xyzs", torch.from_numpy(tables["origin_xyzs"]).float())
+        self.register_buffer("axes", torch.from_numpy(tables["axes"]).float())
+
+        # Rodrigues' formula of the revolute joints: R = I + sin(q) K + (1 - cos(q)) K^2 (K: cross-product matrix)
+        x, y, z = self.axes.unbind(-1)
+        zeros = torch.zeros_like(x)
+        skews = torch.stack([zeros, -z, y, z, zeros, -x, -y, x, zeros], dim=-1).reshape(-1, 3, 3)
+        self.register_buffer("skews", skews)
+        self.register_buffer("skews_sq", skews @ skews)
+
+    def forward(self, angles: torch.Tensor) -> torch.Tensor:
+        batch_size = angles.shape[0]
+        eye = torch.eye(3, dtype=angles.dtype, device=angles.device)
+
+        # the angle of each link's joint (the joints without an angle are the appended 0)
+        angles = torch.cat([angles, angles.new_zeros(batch_size, 1)], dim=1)[:, self.angle_idxs]  # (B, N)
+
+        # the root link is the world frame
+        rots = [eye.expand(batch_size, 1, 3, 3)]
+        xyzs = [angles.new_zeros(batch_size, 1, 3)]
+        for start, end in zip(self.level_bounds[1:-1], self.level_bounds[2:]):
+            level = slice(start, end)
+
+            # fmt: off
+            rev_angle = (angles[:, level] * self.revolute[level])[..., None, None]   # (B, n, 1, 1)
+            pri_angle = (angles[:, level] * self.prismatic[level])[..., None]        # (B, n, 1)
+            # fmt: on
+
+            # the joint frames in their parent frames
+            joint_rot = eye + torch.sin(rev_angle) * self.skews[level]
+            joint_rot = joint_rot + (1 - torch.cos(rev_angle)) * self.skews_sq[level]
+            joint_xyz = pri_angle * self.axes[level]
+            local_rot = self.origin_rots[level] @ joint_rot
+            local_xyz = self.origin_xyzs[level] + (self.origin_rots[level] @ joint_xyz[..., None])[..., 0]
+
+            parent_rot = rots[-1][:, self.parent_idxs[level]]
+            parent_xyz = xyzs[-1][:, self.parent_idxs[level]]
+            rots.append(parent_rot @ local_rot)
+            xyzs.append(parent_xyz + (parent_rot @ local_xyz[..., None])[..., 0])
+
+        return torch.cat(xyzs, dim=1)[:, self.output_idxs]
+
+
+def link_position_loss(fk: TorchForwardKinematics, pred_angles: torch.Tensor, gt_angles: torch.Tensor) -> torch.Tensor:
+    """
+    Mean distance of the link positions of the predicted and ground truth angles (the LINK evaluation mode).
+    """
+    with torch.no_grad():
+        gt_xyzs = fk(gt_angles)
+    sq_dists = ((fk(pred_angles) - gt_xyzs) ** 2).sum(dim=-1)
+
+    # the small epsilon keeps the gradient of the distance finite at 0
+    return torch.sqrt(sq_dists + 1e-12).mean()
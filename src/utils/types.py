@@ -22,6 +22,38 @@ class EvaluateMode(Enum):
     COS = "cos"
 
 
+class InferBackend(Enum):
+    """
+    Enum Type of Inference Backends
+    """
+
+    TORCH = "torch"
+    ONNX = "onnx"
+    INT8 = "int8"
+    KNN = "knn"  # nearest-neighbour retrieval of the training pairs (no network, see model/knn_retargeter.py)
+
+
+class SamplingMode(Enum):
+    """
+    Enum Type of Random Joint Angle Sampling
+    """
+
+    UNIFORM = "uniform"  # per-seed np.random.Generator (independent streams)
+    LEGACY = "legacy"  # same streams as the legacy np.random.seed + np.random.rand sampling
+    SOBOL = "sobol"  # scrambled Sobol' sequence (quasi-random, each seed is a block of a single sequence)
+    HALTON = "halton"  # scrambled Halton sequence (quasi-random, each seed is a block of a single sequence)
+    LHS = "lhs"  # Latin hypercube (stratified per seed)
+
+
+class ActiveErrorSource(Enum):
+    """
+    Enum Type of the Retargeting Error Estimate of the Active Sampling
+    """
+
+    HELDOUT = "heldout"  # error of the predicted joint angles on the held-out generated poses
+    DISAGREEMENT = "disagreement"  # two-stage model: post(pre(SMPL)) vs. post(robot reps), needs no labels
+
+
 # Argument Types
 class GenerateDataArgs(argparse.Namespace):
     """
@@ -32,7 +64,28 @@ class GenerateDataArgs(argparse.Namespace):
     num_seeds: int
     poses_per_seed: int
     device: str
-    restart_idx: int
+    sampling_mode: SamplingMode
+    dedup_tol: float
+    max_retries: int
+    quarantine_off: bool
+    overwrite: bool
+    ik_regressor: bool
+    refine_iters: int
+    continuous_ik: bool
+    round_iters: int
+    ik_autotune: bool
+    error_map: str
+
+
+class TrainIkRegressorArgs(argparse.Namespace):
+    """
+    Arguments for Training the Learned IK Python Codes
+    """
+
+    robot_type: RobotType
+    device: str
+    num_data: int
+    num_epochs: int
 
 
 class TrainArgs(argparse.Namespace):
@@ -46,6 +99,9 @@ class TrainArgs(argparse.Namespace):
     wandb: bool
     device: str
     num_data: int
+    rebuild_index: bool
+    legacy_split: bool
+    link_loss_weight: float
 
 
 class EvaluateArgs(argparse.Namespace):
@@ -58,6 +114,8 @@ class EvaluateArgs(argparse.Namespace):
     one_stage: bool
     device: str
     evaluate_mode: EvaluateMode
+    backend: InferBackend
+    smooth: bool
 
 
 class PybulletRenderArgs(argparse.Namespace):
@@ -68,4 +126,260 @@ class PybulletRenderArgs(argparse.Namespace):
     ground_truth: bool
     one_stage: bool
     extreme_filter_off: bool
+    backend: InferBackend
+    motion_idx: str
+    headless: bool
+    workers: int
+
+
+class ServeArgs(argparse.Namespace):
+    """
+    Arguments for Serving the Retargeting Models Python Codes
+    """
+
+    robot_types: list
+    extreme_filter_off: bool
+    one_stage: bool
+    device: str
+    evaluate_mode: EvaluateMode
+    host: str
+    port: int
+    max_batch_frames: int
+    max_wait_ms: float
+
+
+class ServerBenchArgs(argparse.Namespace):
+    """
+    Arguments for the Load Generator of the Inference Server Python Codes
+    """
+
+    robot_type: RobotType
+    host: str
+    port: int
+    concurrency: int
+    num_requests: int
+    frames_per_request: int
+
+
+class ExportArgs(argparse.Namespace):
+    """
+    Arguments for Exporting the Models (ONNX graphs, NumPy weights) Python Codes
+    """
+
+    robot_types: list
+    opset: int  # only for the ONNX graphs
+
+
+class BackendBenchArgs(argparse.Namespace):
+    """
+    Arguments for Comparing the Inference Backends Python Codes
+    """
+
+    robot_type: RobotType
+    extreme_filter_off: bool
+    one_stage: bool
+    evaluate_mode: EvaluateMode
+    batch_sizes: list
+    num_repeats: int
+
+
+class QuantizeArgs(argparse.Namespace):
+    """
+    Arguments for Quantizing the Models Python Codes
+    """
+
+    robot_type: RobotType
+    extreme_filter_off: bool
+    one_stage: bool
+    num_repeats: int
+
+
+class ColdStartBenchArgs(argparse.Namespace):
+    """
+    Arguments for Measuring the Cold Start of the Inference Runtimes Python Codes
+    """
+
+    robot_type: RobotType
+    extreme_filter_off: bool
+    one_stage: bool
+    evaluate_mode: EvaluateMode
     motion_idx: str
+    child: str
+    output: str
+
+
+class MotionFormatBenchArgs(argparse.Namespace):
+    """
+    Arguments for Comparing the Robot Motion Formats Python Codes
+    """
+
+    robot_type: RobotType
+    num_frames: int
+    num_repeats: int
+
+
+class SmoothingBenchArgs(argparse.Namespace):
+    """
+    Arguments for Benchmarking the Motion Smoothing Python Codes
+    """
+
+    robot_type: RobotType
+    num_frames: list
+    num_repeats: int
+
+
+class OnlineFilterBenchArgs(argparse.Namespace):
+    """
+    Arguments for Benchmarking the Online Motion Filters Python Codes
+    """
+
+    robot_type: RobotType
+    max_lag: int
+
+
+class ImportTimeBenchArgs(argparse.Namespace):
+    """
+    Arguments for Benchmarking the Startup Time of the Tools Python Codes
+    """
+
+    tools: list
+    num_repeats: int
+    top: int
+
+
+class KeypointConverterBenchArgs(argparse.Namespace):
+    """
+    Arguments for Benchmarking the Robot to SMPL Keypoint Converters Python Codes
+    """
+
+    num_poses: list
+    num_repeats: int
+
+
+class SamplingBenchArgs(argparse.Namespace):
+    """
+    Arguments for Benchmarking the Random Joint Angle Sampling Python Codes
+    """
+
+    num_poses: int
+    seeds: list
+    num_repeats: int
+
+
+class SamplingCoverageBenchArgs(argparse.Namespace):
+    """
+    Arguments for Benchmarking the Coverage of the Sampling Modes Python Codes
+    """
+
+    robot_type: RobotType
+    num_poses: list
+    sampling_modes: list
+    num_valid: int
+
+
+class IkDedupBenchArgs(argparse.Namespace):
+    """
+    Arguments for Benchmarking the Near-Duplicate Pose Dedup before the IK Python Codes
+    """
+
+    robot_type: RobotType
+    num_poses: int
+    tolerances: list
+    sampling_mode: SamplingMode
+
+
+class IkRegressorBenchArgs(argparse.Namespace):
+    """
+    Arguments for Benchmarking the Learned IK against the Full LBFGS Python Codes
+    """
+
+    robot_type: RobotType
+    device: str
+    num_poses: int
+    seed: int
+    refine_iters: list
+
+
+class ContinuousIkBenchArgs(argparse.Namespace):
+    """
+    Arguments for Benchmarking the Continuous Batching of the IK Python Codes
+    """
+
+    robot_type: RobotType
+    device: str
+    num_poses: int
+    seed: int
+    round_iters: list
+
+
+class AutotuneIkArgs(argparse.Namespace):
+    """
+    Arguments for Autotuning the IK on CPU Nodes Python Codes
+    """
+
+    robot_type: RobotType
+    batch_sizes: list
+    num_poses: int
+    max_iter: int
+    max_workers: int
+
+
+class ActiveRoundArgs(argparse.Namespace):
+    """
+    Arguments for Closing a Round of the Active Data Generation Python Codes
+    """
+
+    robot_type: RobotType
+    num_data: int
+    arm: str
+    error_source: ActiveErrorSource
+    extreme_filter_off: bool
+    one_stage: bool
+    device: str
+    evaluate_mode: EvaluateMode
+
+
+class ActiveReportArgs(argparse.Namespace):
+    """
+    Arguments for Reporting the Active Data Generation against the Uniform Sampling Python Codes
+    """
+
+    robot_type: RobotType
+    logs: list
+
+
+class BuildKnnIndexArgs(argparse.Namespace):
+    """
+    Arguments for Building the Nearest-Neighbour Retrieval Index Python Codes
+    """
+
+    robot_type: RobotType
+    num_data: int
+    extreme_filter_off: bool
+    max_points: int
+    num_cells: int
+
+
+class KnnBenchArgs(argparse.Namespace):
+    """
+    Arguments for Comparing the Nearest-Neighbour Retrieval with the MLP Backends Python Codes
+    """
+
+    robot_type: RobotType
+    extreme_filter_off: bool
+    one_stage: bool
+    evaluate_mode: EvaluateMode
+    ks: list
+    nprobes: list
+    num_repeats: int
+
+
+class LinkLossBenchArgs(argparse.Namespace):
+    """
+    Arguments for Benchmarking the Differentiable FK of the Link-position Loss Python Codes
+    """
+
+    robot_type: RobotType
+    batch_sizes: list
+    num_threads: int
+    num_repeats: int
@@ -0,0 +1,94 @@
+"""
+Minimal URDF parser for the kinematic chain of the robots (links in the forward kinematics order, joints with their
+origins, axes and limits).
+
+The link order is the depth-first order from the root link (children in the order of the joints in the file), which
+is the order of the links in kinpy's forward kinematics results. So the index of a link in `link_names` is its index
+in the xyzs / reps of the robot data.
+"""
+
+import xml.etree.ElementTree as ET
+from functools import lru_cache
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+
+class UrdfJoint(NamedTuple):
+    name: str
+    joint_type: str  # revolute, continuous, prismatic, fixed, ...
+    parent: str
+    child: str
+    limit: Optional[Tuple[float, float]]  # (lower, upper), None if the joint has no limit
+    origin_xyz: Tuple[float, float, float] = (0.0, 0.0, 0.0)  # position of the child frame in the parent frame
+    origin_rpy: Tuple[float, float, float] = (0.0, 0.0, 0.0)  # fixed-axis roll, pitch, yaw of the child frame
+    axis: Tuple[float, float, float] = (0.0, 0.0, 1.0)  # default of kinpy (which the evaluation uses), not of the URDF
+
+
+class UrdfChain:
+    """
+    Kinematic chain of a robot parsed from its URDF.
+    """
+
+    def __init__(self, root_link: str, link_names: List[str], joints: List[UrdfJoint]):
+        self.root_link = root_link
+        self.link_names = tuple(link_names)  # forward kinematics order
+        self.link_index: Dict[str, int] = {name: i for i, name in enumerate(link_names)}
+        self.joints: Dict[str, UrdfJoint] = {joint.name: joint for joint in joints}
+        self.parent_joint: Dict[str, UrdfJoint] = {joint.child: joint for joint in joints}  # the root has none
+
+    def __len__(self) -> int:
+        return len(self.link_names)
+
+
+def _parse_floats(element: Optional[ET.Element], attrib: str, default: Tuple[float, ...]) -> Tuple[float, ...]:
+    if element is None or attrib not in element.attrib:
+        return default
+    return tuple(float(v) for v in element.get(attrib).split())
+
+
+@lru_cache(maxsize=None)
+def parse_urdf(urdf_path: str) -> UrdfChain:
+    """
+    Parse the kinematic chain of the URDF file (cached per path).
+    """
+    robot = ET.parse(urdf_path).getroot()
+
+    joints = []
+    for joint in robot.findall("joint"):
+        limit = joint.find("limit")
+        if limit is not None and "lower" in limit.attrib and "upper" in limit.attrib:
+            limit = (float(limit.get("lower")), float(limit.get("upper")))
+        else:
+            limit = None
+
+        joints.append(
+            UrdfJoint(
+                name=joint.get("name"),
+                joint_type=joint.get("type"),
+                parent=joint.find("parent").get("link"),
+                child=joint.find("child").get("link"),
+                limit=limit,
+                origin_xyz=_parse_floats(joint.find("origin"), "xyz", (0.0, 0.0, 0.0)),
+                origin_rpy=_parse_floats(joint.find("origin"), "rpy", (0.0, 0.0, 0.0)),
+                axis=_parse_floats(joint.find("axis"), "xyz", (0.0, 0.0, 1.0)),
+            )
+        )
+
+    # the root link is the (first) link which is not a child of any joint
+    child_links = set(joint.child for joint in joints)
+    root_links = [link.get("name") for link in robot.findall("link") if link.get("name") not in child_links]
+    if len(root_links) == 0:
+        raise ValueError(f"{urdf_path} has no root link")
+
+    children: Dict[str, List[str]] = {}
+    for joint in joints:
+        children.setdefault(joint.parent, []).append(joint.child)
+
+    # depth-first traversal from the root link (iterative, the chains of the hands can be deep)
+    link_names = []
+    stack = [root_links[0]]
+    while stack:
+        link = stack.pop()
+        link_names.append(link)
+        stack.extend(reversed(children.get(link, [])))
+
+    return UrdfChain(root_links[0], link_names, joints)
@@ -1,90 +1,215 @@
+import pkgutil
+import time
 import pybullet as pb
 import pybullet_data
 import sys
 import numpy as np
-from scipy.signal import savgol_filter
+from typing import Dict, Iterator, Sequence, Tuple
 
 sys.path.append("src/")
 from utils.RobotConfig import RobotConfig
 from utils.types import RobotType
+from utils.motion import RobotMotion, as_robot_motion
+from utils.smoothing import smooth_motion
 from utils.consts import *
 
 
-def pybullet_render(motions, robot_config: RobotConfig, smooth_off: bool):
-    # smoothing the motion data
-    if not smooth_off:
-        print("median filtering....")
-        for ki, k in enumerate(motions[0].keys()):
-            # for ki, k in enumerate(robot_config.joi_keys):
-            values = np.array([th[k] for th in motions])
-            if robot_config.robot_type == RobotType.COMAN:
-                filter_window = 50
-            elif robot_config.robot_type == RobotType.NAO:
-                filter_window = 50
-            values = savgol_filter(values, filter_window, 2)
-            for thi, th in enumerate(motions):
-                th[k] = values[thi]
-        print("filtering done")
-
-    # Initialize the pybullet simulator
-    pb.connect(pb.GUI)
-    pb.setAdditionalSearchPath(pybullet_data.getDataPath())
-
-    # Set gravity
-    pb.setGravity(0, 0, -11.7)
-    pb.loadURDF("plane.urdf")
-
-    # load the robot URDF file
-    if robot_config.robot_type == RobotType.COMAN:
-        robot_id = pb.loadURDF(robot_config.URDF_4_RENDER_PATH)
-    else:
-        robot_id = pb.loadURDF(robot_config.URDF_PATH)
-
-    # Set the mass of the robot to 0, so that it is not affected by gravity (not rolling on the ground & not falling)
-    pb.changeDynamics(robot_id, -1, mass=0)
-
-    # Set the initial position of the robot on the ground
-    if robot_config.robot_type == RobotType.COMAN:
-        initial_position = [0, 0, 0.53]  # Adjust the values as needed
-        camera_distance = 1
-        camera_pitch = -15
-    elif robot_config.robot_type == RobotType.NAO:
-        initial_position = [0, 0, 0]
-        camera_distance = 1
-        camera_pitch = -30
-    initial_orientation = pb.getQuaternionFromEuler([0, 0, 0])  # No initial rotation
-    pb.resetBasePositionAndOrientation(robot_id, initial_position, initial_orientation)
-
-    # Set the camera position and orientation of the pybullet simulator
-    pb.resetDebugVisualizerCamera(
-        cameraDistance=camera_distance,
-        cameraYaw=90,
-        cameraPitch=camera_pitch,
-        cameraTargetPosition=initial_position,
-    )
-
-    # map joint name to joint index ({joint_name: joint_index})
-    num_joints = pb.getNumJoints(robot_id)  # number of joints in the robot
-    joint_name_to_id = {}  # {joint_name: joint_index}
-
-    for i in range(num_joints):
-        joint_info = pb.getJointInfo(robot_id, i)
-        joint_name = joint_info[1].decode("utf-8")
-        joint_name_to_id[joint_name] = joint_info[0]
-        # -> joint_name_to_id: {"head_yaw": 0, "head_pitch": 1, "l_shoulder_pitch": 2, ...}
-
-    frames = []
-
-    for joi_angles in motions:
-        # Set the joint angles of the robot in the pybullet simulator
-        for joi_name, angle in joi_angles.items():
-            joi_index = joint_name_to_id[joi_name]
-            pb.resetJointState(robot_id, joi_index, angle)  # set the joint angle
-
-        pb.stepSimulation()
-        img = pb.getCameraImage(640, 480, renderer=pb.ER_BULLET_HARDWARE_OPENGL)
-
-        frames.append(img[2])
-
-    pb.disconnect()
-    return frames
+def connect_headless() -> Tuple[int, int]:
+    """
+    Connect to a headless (DIRECT) physics server.
+    Load the EGL renderer plugin for the hardware rendering if it is available, otherwise use the TinyRenderer (CPU).
+
+    Returns:
+        client_id: int
+        renderer: int (pb.ER_BULLET_HARDWARE_OPENGL with EGL, pb.ER_TINY_RENDERER without EGL)
+    """
+    client_id = pb.connect(pb.DIRECT)
+
+    egl = pkgutil.get_loader("eglRenderer")
+    if egl is not None:
+        plugin_id = pb.loadPlugin(egl.get_filename(), "_eglRendererPlugin", physicsClientId=client_id)
+        if plugin_id >= 0:
+            return client_id, pb.ER_BULLET_HARDWARE_OPENGL
+
+    print("EGL renderer is not available, rendering with the TinyRenderer")
+    return client_id, pb.ER_TINY_RENDERER
+
+
+class RobotRenderSession:
+    """
+    A pybullet scene (physics client, plane, robot and camera) which is set up once and renders many motions.
+
+    Usage:
+        with RobotRenderSession(robot_config, headless=True) as session:
+            for motions in all_motions:
+                for frame in session.render(motions, smooth_off):
+                    ...
+    """
+
+    def __init__(self, robot_config: RobotConfig, headless: bool = False):
+        start = time.perf_counter()
+        self.robot_config = robot_config
+
+        # Initialize the pybullet simulator
+        # (each process owns its own physics client, so that the headless rendering can run in parallel)
+        if headless:
+            self.client_id, self.renderer = connect_headless()
+        else:
+            self.client_id, self.renderer = pb.connect(pb.GUI), pb.ER_BULLET_HARDWARE_OPENGL
+        client_id = self.client_id
+        pb.setAdditionalSearchPath(pybullet_data.getDataPath(), physicsClientId=client_id)
+
+        # Set gravity
+        pb.setGravity(0, 0, -11.7, physicsClientId=client_id)
+
+        # load the robot URDF file (COMAN is rendered without the hands)
+        self.robot_id = pb.loadURDF(robot_config.URDF_4_RENDER_PATH, physicsClientId=client_id)
+
+        # Set the mass of the robot to 0, so that it is not affected by gravity
+        # (not rolling on the ground & not falling)
+        pb.changeDynamics(self.robot_id, -1, mass=0, physicsClientId=client_id)
+
+        # the plane is loaded by reset_scene before rendering each motion
+        self.plane_id = None
+
+        # Set the initial position of the robot on the ground
+        if robot_config.robot_type == RobotType.COMAN:
+            initial_position = [0, 0, 0.53]  # Adjust the values as needed
+            camera_distance = 1
+            camera_pitch = -15
+        elif robot_config.robot_type == RobotType.NAO:
+            initial_position = [0, 0, 0]
+            camera_distance = 1
+            camera_pitch = -30
+        initial_orientation = pb.getQuaternionFromEuler([0, 0, 0])  # No initial rotation
+        pb.resetBasePositionAndOrientation(
+            self.robot_id, initial_position, initial_orientation, physicsClientId=client_id
+        )
+
+        # Set the camera position and orientation of the pybullet simulator
+        if headless:
+            # there is no debug visualizer in DIRECT mode, so the camera matrices are given to getCameraImage
+            self.camera_kwargs = dict(
+                viewMatrix=pb.computeViewMatrixFromYawPitchRoll(
+                    cameraTargetPosition=initial_position,
+                    distance=camera_distance,
+                    yaw=90,
+                    pitch=camera_pitch,
+                    roll=0,
+                    upAxisIndex=2,
+                ),
+                projectionMatrix=pb.computeProjectionMatrixFOV(
+                    fov=PYBULLET_CAMERA_FOV,
+                    aspect=PYBULLET_IMG_WIDTH / PYBULLET_IMG_HEIGHT,
+                    nearVal=0.01,
+                    farVal=100,
+                ),
+            )
+        else:
+            pb.resetDebugVisualizerCamera(
+                cameraDistance=camera_distance,
+                cameraYaw=90,
+                cameraPitch=camera_pitch,
+                cameraTargetPosition=initial_position,
+                physicsClientId=client_id,
+            )
+            self.camera_kwargs = {}
+
+        # map joint name to joint index ({joint_name: joint_index})
+        num_joints = pb.getNumJoints(self.robot_id, physicsClientId=client_id)  # number of joints in the robot
+        self.joint_name_to_id: Dict[str, int] = {}  # {joint_name: joint_index}
+        self.movable_joint_ids = []  # all the non-fixed joints, including the joints which are not in the motions
+
+        for i in range(num_joints):
+            joint_info = pb.getJointInfo(self.robot_id, i, physicsClientId=client_id)
+            joint_name = joint_info[1].decode("utf-8")
+            self.joint_name_to_id[joint_name] = joint_info[0]
+            # -> joint_name_to_id: {"head_yaw": 0, "head_pitch": 1, "l_shoulder_pitch": 2, ...}
+            if joint_info[2] != pb.JOINT_FIXED:
+                self.movable_joint_ids.append(joint_info[0])
+
+        # joint index arrays of the joint name orders ({joint_names: [joint_index, ...]})
+        self._joint_indices: Dict[Tuple[str, ...], list] = {}
+
+        self.setup_seconds = time.perf_counter() - start
+
+    def reset_scene(self):
+        """
+        Reset the scene before rendering a motion, so that every motion is rendered from the same initial state.
+        The joints which are not in the motions (e.g. legs & fingers) move with the simulation steps and touch the
+        plane, so they are reset and the plane is reloaded to drop the contacts cached from the previous motion.
+        (saveState & restoreState don't drop the cached contacts.)
+        """
+        client_id = self.client_id
+        zeros = [[0.0] for _ in self.movable_joint_ids]
+
+        if self.plane_id is not None:
+            pb.removeBody(self.plane_id, physicsClientId=client_id)
+        pb.resetJointStatesMultiDof(
+            self.robot_id, self.movable_joint_ids, zeros, targetVelocities=zeros, physicsClientId=client_id
+        )
+        self.plane_id = pb.loadURDF("plane.urdf", physicsClientId=client_id)
+
+    def joint_indices(self, joint_names: Sequence[str]) -> list:
+        joint_names = tuple(joint_names)
+        if joint_names not in self._joint_indices:
+            self._joint_indices[joint_names] = [self.joint_name_to_id[name] for name in joint_names]
+        return self._joint_indices[joint_names]
+
+    def render(self, motions: RobotMotion, smooth_off: bool) -> Iterator[np.ndarray]:
+        """
+        Render the motion frame by frame.
+        This is a generator, so that the frames can be encoded as soon as they are rendered (not buffered in memory).
+
+        Yields:
+            frame: np.ndarray (PYBULLET_IMG_HEIGHT, PYBULLET_IMG_WIDTH, 4) RGBA image
+        """
+        motions = as_robot_motion(motions)
+
+        # smoothing the motion data
+        if not smooth_off:
+            motions = smooth_motion(motions, self.robot_config.smooth_window)
+
+        joi_indices = self.joint_indices(motions.joint_names)
+
+        self.reset_scene()
+
+        for joi_angles in motions.angles.tolist():
+            # Set the joint angles of the robot in the pybullet simulator (all the joints in a single call)
+            pb.resetJointStatesMultiDof(
+                self.robot_id, joi_indices, [[angle] for angle in joi_angles], physicsClientId=self.client_id
+            )
+
+            pb.stepSimulation(physicsClientId=self.client_id)
+            img = pb.getCameraImage(
+                PYBULLET_IMG_WIDTH,
+                PYBULLET_IMG_HEIGHT,
+                renderer=self.renderer,
+                physicsClientId=self.client_id,
+                **self.camera_kwargs,
+            )
+
+            # the image is a flat list if pybullet is built without numpy
+            yield np.reshape(img[2], (PYBULLET_IMG_HEIGHT, PYBULLET_IMG_WIDTH, 4)).astype(np.uint8)
+
+    def close(self):
+        pb.disconnect(physicsClientId=self.client_id)
+
+    def __enter__(self) -> "RobotRenderSession":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+def pybullet_render(
+    motions: RobotMotion, robot_config: RobotConfig, smooth_off: bool, headless: bool = False
+) -> Iterator[np.ndarray]:
+    """
+    Render a single motion in a new RobotRenderSession (use RobotRenderSession directly for many motions).
+
+    Yields:
+        frame: np.ndarray (PYBULLET_IMG_HEIGHT, PYBULLET_IMG_WIDTH, 4) RGBA image
+    """
+    with RobotRenderSession(robot_config, headless) as session:
+        yield from session.render(motions, smooth_off)
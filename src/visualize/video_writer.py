@@ -0,0 +1,75 @@
+"""
+Incremental video writer running on a background thread.
+
+The frames are encoded as soon as they are rendered, so only a few frames (bounded queue) are held in memory
+regardless of the motion length, and the encoding overlaps with the rendering.
+"""
+
+import queue
+import threading
+import numpy as np
+
+_END_OF_FRAMES = object()  # put in the queue after the last frame
+
+
+class VideoWriterThread:
+    """
+    Write frames into a gif or mp4 file on a background thread.
+
+    Usage:
+        with VideoWriterThread(output_path, fps) as writer:
+            for frame in frames:
+                writer.write(frame)
+    """
+
+    def __init__(self, output_path: str, fps: int, max_queue_frames: int = 32):
+        import imageio
+
+        extension = output_path.split(".")[-1]
+        if extension == "gif":
+            self.writer = imageio.get_writer(output_path, mode="I", duration=1000 / fps)
+        elif extension == "mp4":
+            self.writer = imageio.get_writer(output_path, fps=fps)
+        else:
+            raise ValueError(f"Unsupported video extension: {extension}")
+
+        # bounded queue: the renderer blocks if the encoder falls behind, instead of piling up the frames
+        self.frames = queue.Queue(maxsize=max_queue_frames)
+        self.num_frames = 0
+        self.error = None
+
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+
+    def _run(self):
+        try:
+            while True:
+                frame = self.frames.get()
+                if frame is _END_OF_FRAMES:
+                    break
+                self.writer.append_data(frame)
+        except Exception as e:
+            self.error = e
+            # keep draining the queue, so that the renderer is not blocked forever
+            while self.frames.get() is not _END_OF_FRAMES:
+                pass
+        finally:
+            self.writer.close()
+
+    def write(self, frame: np.ndarray):
+        if self.error is not None:
+            raise self.error
+        self.frames.put(frame)
+        self.num_frames += 1
+
+    def close(self):
+        self.frames.put(_END_OF_FRAMES)
+        self.thread.join()
+        if self.error is not None:
+            raise self.error
+
+    def __enter__(self) -> "VideoWriterThread":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
@@ -0,0 +1,127 @@
+"""
+Close a round of the active data generation: log the validation error of the best model against the IK-hours spent on
+the data so far, and build the error map which biases the poses of the next round (tools/generate_data.py -emap).
+
+A round:
+    1. python tools/generate_data.py -r ROBOT -s NUM_DATA [-emap ./out/active/ROBOT/error_map.npz]
+    2. python tools/train.py -r ROBOT -n NUM_DATA -ef-off, python tools/evaluate_model.py -r ROBOT -ef-off
+    3. python tools/active_round.py -r ROBOT -n NUM_DATA [-a ARM]
+
+The rounds of an arm are logged in ./out/active/ROBOT/rounds_ARM.json. Run the uniform sampling (no -emap) as the arm
+"uniform" for tools/report_active_sampling.py (in another checkout: the data and the models of the arms share paths).
+
+Usage:
+    python tools/active_round.py -r ROBOT_TYPE -n NUM_DATA [-a ARM] [-src ERROR_SOURCE] [-ef-off] [-os] [-d DEVICE]
+                                 [-em EVALUATE_MODE]
+
+Example:
+    python tools/active_round.py -r NAO -n 100 -ef-off
+    python tools/active_round.py -r NAO -n 200 -ef-off -src disagreement
+    python tools/active_round.py -r NAO -n 200 -ef-off -a uniform
+"""
+
+import argparse
+import sys
+
+sys.path.append("./src")
+from process_data.active_sampling import (
+    ActiveErrorMap,
+    heldout_pose_errors,
+    validation_error,
+    ik_hours,
+    log_active_round,
+)
+from utils.RobotConfig import RobotConfig
+from utils.types import RobotType, EvaluateMode, ActiveErrorSource, ActiveRoundArgs
+from utils.consts import *
+
+
+def main(args: ActiveRoundArgs):
+    robot_config = RobotConfig(args.robot_type)
+    robot_name = args.robot_type.name
+
+    # validation error of the best model of this round, and the IK-hours of its data
+    val_error = validation_error(
+        robot_config, args.extreme_filter_off, args.one_stage, args.device, args.evaluate_mode
+    )
+    hours, num_missing = ik_hours(robot_config, args.num_data)
+    if num_missing > 0:
+        print(f"{num_missing} seeds have no IK wall time (generated before it was recorded): first pass time instead")
+
+    # error map of the next round: errors of the best model on the held-out generated poses
+    angles, errors = heldout_pose_errors(
+        robot_config,
+        args.num_data,
+        args.extreme_filter_off,
+        args.one_stage,
+        args.device,
+        args.evaluate_mode,
+        args.error_source,
+    )
+    error_map = ActiveErrorMap.from_joint_angles(robot_config, angles, errors)
+    error_map.save(ACTIVE_ERROR_MAP_PATH(robot_name))
+
+    rounds = log_active_round(
+        ACTIVE_ROUNDS_LOG_PATH(robot_name, args.arm),
+        {
+            "num_data": args.num_data,
+            "ik_hours": hours,
+            "val_error": val_error,
+            "heldout_error": float(errors.mean()),
+            "error_source": args.error_source.value,
+            "evaluate_mode": args.evaluate_mode.value,
+            "error_map": error_map.fingerprint(),
+        },
+    )
+    print(
+        f"[{args.arm}] round {len(rounds) - 1}: {args.num_data} seeds, {hours:.3f} IK-hours, "
+        f"val error {val_error:.6f}, held-out {args.error_source.value} error {errors.mean():.6f}"
+    )
+    print(f"Error map of the next round: {ACTIVE_ERROR_MAP_PATH(robot_name)}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="args for closing a round of the active data generation")
+
+    parser.add_argument(
+        "--robot-type",
+        "-r",
+        type=RobotType,
+        required=True,
+        help=f"Select the robot type: {RobotType._member_names_}",
+    )
+    parser.add_argument(
+        "--num-data",
+        "-n",
+        type=int,
+        required=True,
+        help="number of the generated seeds of this round (the model is trained on them)",
+    )
+    parser.add_argument(
+        "--arm",
+        "-a",
+        type=str,
+        default="active",
+        help="name of the arm of the comparison (uniform: the baseline of tools/report_active_sampling.py)",
+    )
+    parser.add_argument(
+        "--error-source",
+        "-src",
+        type=ActiveErrorSource,
+        choices=list(ActiveErrorSource),
+        default=ActiveErrorSource.HELDOUT,
+        help="retargeting error estimate of the error map",
+    )
+    parser.add_argument("--extreme-filter-off", "-ef-off", action="store_true")
+    parser.add_argument("--one-stage", "-os", action="store_true")
+    parser.add_argument("--device", "-d", type=str, default=DEVICE)
+    parser.add_argument(
+        "--evaluate-mode",
+        "-em",
+        type=EvaluateMode,
+        choices=list(EvaluateMode),
+        default=EvaluateMode.JOINT,
+    )
+
+    args: ActiveRoundArgs = parser.parse_args()
+    main(args)
@@ -0,0 +1,45 @@
+"""
+Autotune the IK for the CPU of this node: benchmark the IK batch size, the torch threads of an IK process and the
+number of IK worker processes on the detected CPU topology, and save the fastest configuration (per CPU topology) in
+./out/ik_autotune.json for `tools/generate_data.py -d cpu -at`.
+
+Usage:
+    python tools/autotune_ik.py -r [robot_type] [-bs batch_size ...] [-p num_poses] [-it max_iter] [-w max_workers]
+
+Example:
+    python tools/autotune_ik.py -r NAO
+    python tools/autotune_ik.py -r COMAN -bs 250 500 -w 4
+"""
+
+import argparse
+import os
+import sys
+
+sys.path.append("./src")
+from process_data.ik_autotune import autotune_ik
+from utils.types import RobotType, AutotuneIkArgs
+from utils.RobotConfig import RobotConfig
+from utils.consts import *
+
+
+def main(args: AutotuneIkArgs):
+    robot_config = RobotConfig(args.robot_type)
+    config = autotune_ik(robot_config, args.batch_sizes, args.num_poses, args.max_iter, args.max_workers)
+
+    print(
+        f"Best: batch size {config['batch_size']}, {config['num_workers']} workers x {config['num_threads']} threads "
+        f"({config['poses_per_s']:.1f} poses/s) -> {IK_AUTOTUNE_PATH}"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="args for autotuning the IK on CPU nodes")
+
+    parser.add_argument("--robot-type", "-r", type=RobotType, default=RobotType.NAO)
+    parser.add_argument("--batch-sizes", "-bs", type=int, nargs="+", default=IK_AUTOTUNE_BATCH_SIZES)
+    parser.add_argument("--num-poses", "-p", type=int, default=POSE_PER_SEED)
+    parser.add_argument("--max-iter", "-it", type=int, default=IK_AUTOTUNE_ITERS)
+    parser.add_argument("--max-workers", "-w", type=int, default=os.cpu_count())
+
+    args: AutotuneIkArgs = parser.parse_args()
+    main(args)
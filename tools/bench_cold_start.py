@@ -0,0 +1,124 @@
+"""
+Measure the cold start (process start -> first prediction) and the peak memory of the torch inference path
+against the NumPy runtime. Each path runs in a fresh python process, and their predictions are compared.
+
+Usage:
+    python tools/bench_cold_start.py -r ROBOT_TYPE [-ef-off] [-os] [-em EVALUATE_MODE] [-mi MOTION_IDX]
+
+Example:
+    python tools/export_npz.py -r NAO
+    python tools/bench_cold_start.py -r NAO -mi 02_05
+"""
+
+import argparse
+import json
+import os
+import os.path as osp
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.append("./src")
+from utils.types import RobotType, EvaluateMode, ColdStartBenchArgs
+from utils.consts import *
+
+
+def run_child(args: ColdStartBenchArgs):
+    """
+    Run a single inference in this (fresh) process and report the peak memory.
+    Heavy modules are imported here on purpose, since their import time is a part of the cold start.
+    """
+    import numpy as np
+
+    human_pose_path = osp.join(AMASS_DATA_PATH, f"{args.motion_idx}_stageii.npz")
+
+    if args.child == "numpy":
+        from model.numpy_runtime import infer_numpy, npz_model_path
+
+        npz_path = npz_model_path(args.robot_type.name, args.extreme_filter_off, args.one_stage, args.evaluate_mode)
+        pred_motion = infer_numpy(npz_path, human_pose_path)
+
+    else:
+        from utils.RobotConfig import RobotConfig
+        from model.infer_with_one_stage import infer_one_stage
+        from model.infer_with_two_stage import infer_two_stage
+
+        infer = infer_one_stage if args.one_stage else infer_two_stage
+        pred_motion = infer(
+            robot_config=RobotConfig(args.robot_type),
+            extreme_filter_off=args.extreme_filter_off,
+            human_pose_path=human_pose_path,
+            device="cpu",
+            evaluate_mode=args.evaluate_mode,
+        )
+
+    np.save(args.output, pred_motion.angles)
+
+    # ru_maxrss is in kilobytes on Linux
+    print(json.dumps({"max_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024}))
+
+
+def main(args: ColdStartBenchArgs):
+    import numpy as np
+
+    results = {}
+    with tempfile.TemporaryDirectory() as temp_dir:
+        for runtime in ["torch", "numpy"]:
+            output = osp.join(temp_dir, f"{runtime}.npy")
+            # fmt: off
+            command = [
+                sys.executable, __file__,
+                "-r", args.robot_type.value, "-em", args.evaluate_mode.value, "-mi", args.motion_idx,
+                "--child", runtime, "--output", output,
+            ]
+            # fmt: on
+            if args.extreme_filter_off:
+                command.append("-ef-off")
+            if args.one_stage:
+                command.append("-os")
+
+            start = time.perf_counter()
+            stdout = subprocess.run(command, check=True, capture_output=True, text=True, env=os.environ).stdout
+            elapsed = time.perf_counter() - start
+
+            results[runtime] = {
+                "cold_start_s": elapsed,
+                "max_rss_mb": json.loads(stdout.strip().splitlines()[-1])["max_rss_mb"],
+                "angles": np.load(output),
+            }
+
+    torch_res, numpy_res = results["torch"], results["numpy"]
+    max_diff = np.abs(torch_res["angles"] - numpy_res["angles"]).max()
+
+    print(f"Robot: {args.robot_type.name} Model: {'one-stage' if args.one_stage else 'two-stage'}")
+    print(f"Motion: {args.motion_idx} ({len(torch_res['angles'])} frames)")
+    print(f"{'runtime':>8} | {'cold start (s)':>14} | {'peak RSS (MB)':>13}")
+    for runtime, res in results.items():
+        print(f"{runtime:>8} | {res['cold_start_s']:>14.3f} | {res['max_rss_mb']:>13.1f}")
+    print(f"Max abs diff of the predicted angles: {max_diff:.2e}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="compare the cold start of the torch & NumPy runtimes")
+
+    parser.add_argument("--robot-type", "-r", type=RobotType, default=RobotType.NAO)
+    parser.add_argument("--extreme-filter-off", "-ef-off", action="store_true")
+    parser.add_argument("--one-stage", "-os", action="store_true")
+    parser.add_argument(
+        "--evaluate-mode",
+        "-em",
+        type=EvaluateMode,
+        choices=list(EvaluateMode),
+        default=EvaluateMode.LINK,
+    )
+    parser.add_argument("--motion-idx", "-mi", type=str, default=GT_MOTION_IDXS[0])
+    parser.add_argument("--child", type=str, choices=["torch", "numpy"], help="(internal) run a single runtime")
+    parser.add_argument("--output", type=str, help="(internal) path to save the predicted angles")
+
+    args: ColdStartBenchArgs = parser.parse_args()
+    if args.child is None:
+        main(args)
+    else:
+        run_child(args)
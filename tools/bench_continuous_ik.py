@@ -0,0 +1,76 @@
+"""
+Compare the continuous batching of the IK (the converged poses leave the batch and the pending poses take their slots)
+with the current batch-level LBFGS on a seed: wall time, total LBFGS iterations of the poses, and keypoint residual.
+
+Modes:
+    IK_Engine: the current first pass (VPoser's IK engine, batches of VPOSER_BATCH_SIZE poses)
+    rounds of 500: ContinuousBatchIk with a single round of 500 iterations, i.e. the batch-level LBFGS of IK_Engine
+                   (every pose of a batch pays the iterations of the slowest pose), to count its iterations
+    rounds of K: continuous batching with a convergence check every K iterations
+
+Usage:
+    python tools/bench_continuous_ik.py -r ROBOT_TYPE [-d DEVICE] [-p NUM_POSES] [-s SEED] [-rd ROUND_ITERS ...]
+
+Example:
+    python tools/bench_continuous_ik.py -r NAO
+    python tools/bench_continuous_ik.py -r COMAN -d cuda:1 -p 1000 -rd 5 10 25
+"""
+
+import argparse
+import sys
+import time
+
+sys.path.append("./src")
+from process_data.fit2smpl import fit2smpl
+from process_data.sample_robot_data import sample_robot_data
+from utils.types import RobotType, ContinuousIkBenchArgs
+from utils.RobotConfig import RobotConfig
+from utils.consts import *
+
+FULL_LBFGS_ITERS = 500
+
+
+def main(args: ContinuousIkBenchArgs):
+    robot_config = RobotConfig(args.robot_type)
+    _, _, _, xyzs4smpl = sample_robot_data(args.robot_type, args.num_poses, args.seed)
+
+    # (mode, continuous, round iterations)
+    modes = [("IK_Engine", False, 0), (f"rounds of {FULL_LBFGS_ITERS}", True, FULL_LBFGS_ITERS)]
+    modes += [(f"rounds of {k}", True, k) for k in args.round_iters]
+
+    results = []
+    for name, continuous, round_iters in modes:
+        start = time.perf_counter()
+        _, ik_report = fit2smpl(robot_config, xyzs4smpl, args.device, continuous=continuous, round_iters=round_iters)
+        results.append((name, time.perf_counter() - start, ik_report))
+
+    print(f"Robot: {args.robot_type.name} Poses: {args.num_poses} Device: {args.device}")
+    print(
+        f"{'mode':>14} | {'wall (s)':>8} | {'first pass (s)':>14} | {'speedup':>7} | {'iters':>9} | "
+        f"{'iters/pose':>10} | {'residual (mm)':>13} | NaN"
+    )
+    for name, wall_time, ik_report in results:
+        first_pass = ik_report["first_pass"]
+        sample_iters = first_pass.get("sample_iters")
+        if sample_iters is None:
+            iters = f"{'-':>9} | {'-':>10}"
+        else:
+            iters = f"{sample_iters:>9} | {sample_iters / args.num_poses:>10.1f}"
+        print(
+            f"{name:>14} | {wall_time:>8.2f} | {first_pass['wall_time']:>14.2f} | "
+            f"{results[0][2]['first_pass']['wall_time'] / first_pass['wall_time']:>6.2f}x | {iters} | "
+            f"{ik_report['keypoint_residual'] * 1000:>13.2f} | {ik_report['num_nan_first_pass']}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="benchmark the continuous batching of the IK")
+
+    parser.add_argument("--robot-type", "-r", type=RobotType, default=RobotType.NAO)
+    parser.add_argument("--device", "-d", type=str, default=DEVICE)
+    parser.add_argument("--num-poses", "-p", type=int, default=POSE_PER_SEED)
+    parser.add_argument("--seed", "-s", type=int, default=0)
+    parser.add_argument("--round-iters", "-rd", type=int, nargs="+", default=[5, IK_ROUND_ITERS, 25])
+
+    args: ContinuousIkBenchArgs = parser.parse_args()
+    main(args)
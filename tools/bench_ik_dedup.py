@@ -0,0 +1,63 @@
+"""
+Report how many VPoser IK solves the near-duplicate pose dedup skips for each tolerance, and how far it moves the SMPL
+keypoints of the poses (distance between the keypoints of a pose and of its representative).
+
+Usage:
+    python tools/bench_ik_dedup.py -r ROBOT_TYPE [-p NUM_POSES] [-t TOLERANCE ...] [-sm SAMPLING_MODE]
+
+Example:
+    python tools/bench_ik_dedup.py -r NAO
+    python tools/bench_ik_dedup.py -r COMAN -p 20000 -t 0.01 0.05
+"""
+
+import argparse
+import sys
+import time
+import numpy as np
+import kinpy as kp
+
+sys.path.append("./src")
+from process_data.fit2smpl import dedup_keypoints
+from process_data.sample_robot_data import sample_joint_angles
+from utils.forward_kinematics import smpl_xyzs
+from utils.types import RobotType, SamplingMode, IkDedupBenchArgs
+from utils.RobotConfig import RobotConfig
+
+
+def main(args: IkDedupBenchArgs):
+    robot_config = RobotConfig(args.robot_type)
+    chain = kp.build_chain_from_urdf(open(robot_config.URDF_PATH).read())
+
+    angles = sample_joint_angles(robot_config, args.num_poses, 0, args.sampling_mode)
+    xyzs4smpl = smpl_xyzs(robot_config, chain, angles)
+
+    print(f"Robot: {args.robot_type.name} Poses: {args.num_poses} Sampling: {args.sampling_mode.value}")
+    print(
+        f"{'tol (m)':>7} | {'fitted':>6} | {'skipped':>7} | {'dedup (ms)':>10} | "
+        f"{'mean shift (m)':>14} | max shift (m)"
+    )
+
+    for tol in args.tolerances:
+        start = time.perf_counter()
+        representative_idxs, cluster_idxs = dedup_keypoints(xyzs4smpl, tol)
+        dedup_ms = (time.perf_counter() - start) * 1000
+
+        # keypoints shift of the poses which share the IK result of their representatives
+        shift = np.abs(xyzs4smpl[representative_idxs][cluster_idxs] - xyzs4smpl).max(axis=(1, 2))
+        num_skipped = args.num_poses - len(representative_idxs)
+        print(
+            f"{tol:>7} | {len(representative_idxs):>6} | {num_skipped:>7} | {dedup_ms:>10.2f} | "
+            f"{shift.mean():>14.4f} | {shift.max():.4f}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="benchmark the near-duplicate pose dedup before the IK")
+
+    parser.add_argument("--robot-type", "-r", type=RobotType, default=RobotType.NAO)
+    parser.add_argument("--num-poses", "-p", type=int, default=2000)
+    parser.add_argument("--tolerances", "-t", type=float, nargs="+", default=[0.005, 0.01, 0.02, 0.05, 0.1])
+    parser.add_argument("--sampling-mode", "-sm", type=SamplingMode, default=SamplingMode.UNIFORM)
+
+    args: IkDedupBenchArgs = parser.parse_args()
+    main(args)
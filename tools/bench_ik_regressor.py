@@ -0,0 +1,67 @@
+"""
+Compare the learned IK (with 0 or a few LBFGS refinement iterations) with the full LBFGS of VPoser's IK engine: IK
+poses/s and the keypoint residual (mean distance between the fitted SMPL-X keypoints and the target keypoints).
+
+The poses are sampled with a seed outside of the generated data (default: NUM_SEEDS), which the regressor hasn't seen.
+
+Usage:
+    python tools/bench_ik_regressor.py -r ROBOT_TYPE [-d DEVICE] [-p NUM_POSES] [-s SEED] [-ri REFINE_ITERS ...]
+
+Example:
+    python tools/bench_ik_regressor.py -r NAO
+    python tools/bench_ik_regressor.py -r COMAN -d cuda:1 -p 500 -ri 0 5 20 50
+"""
+
+import argparse
+import sys
+import time
+
+sys.path.append("./src")
+from process_data.fit2smpl import fit2smpl
+from process_data.ik_regressor import IkRegressor
+from process_data.sample_robot_data import sample_robot_data
+from utils.types import RobotType, IkRegressorBenchArgs
+from utils.RobotConfig import RobotConfig
+from utils.consts import *
+
+
+def main(args: IkRegressorBenchArgs):
+    robot_config = RobotConfig(args.robot_type)
+    ik_regressor = IkRegressor.load(IK_REGRESSOR_PATH(args.robot_type.name), args.device)
+
+    _, _, _, xyzs4smpl = sample_robot_data(args.robot_type, args.num_poses, args.seed)
+
+    # (mode, learned IK, LBFGS iterations after the learned IK)
+    modes = [("full LBFGS", None, 0)]
+    modes += [(f"learned + {k} iters", ik_regressor, k) for k in args.refine_iters]
+
+    results = []
+    for name, regressor, refine_iters in modes:
+        start = time.perf_counter()
+        _, ik_report = fit2smpl(
+            robot_config, xyzs4smpl, args.device, ik_regressor=regressor, refine_iters=refine_iters
+        )
+        elapsed = time.perf_counter() - start
+        results.append((name, args.num_poses / elapsed, ik_report))
+
+    print(f"Robot: {args.robot_type.name} Poses: {args.num_poses} Device: {args.device}")
+    print(f"{'mode':>20} | {'poses/s':>8} | {'speedup':>7} | {'residual (mm)':>13} | {'NaN':>4} | quarantined")
+    for name, poses_per_s, ik_report in results:
+        print(
+            f"{name:>20} | {poses_per_s:>8.1f} | {poses_per_s / results[0][1]:>6.1f}x | "
+            f"{ik_report['keypoint_residual'] * 1000:>13.2f} | {ik_report['num_nan_first_pass']:>4} | "
+            f"{ik_report['num_quarantined_poses']}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="benchmark the learned IK against the full LBFGS")
+
+    parser.add_argument("--robot-type", "-r", type=RobotType, default=RobotType.NAO)
+    parser.add_argument("--device", "-d", type=str, default=DEVICE)
+    parser.add_argument("--num-poses", "-p", type=int, default=POSE_PER_SEED)
+    parser.add_argument("--seed", "-s", type=int, default=NUM_SEEDS)
+    parser.add_argument("--refine-iters", "-ri", type=int, nargs="+", default=[0, 5, IK_REGRESSOR_REFINE_ITERS])
+
+    args: IkRegressorBenchArgs = parser.parse_args()
+    main(args)
@@ -0,0 +1,102 @@
+"""
+Measure the startup (import) time of the tools with `python -X importtime tools/TOOL.py --help`, and check it against
+the target of each tool. The heaviest top-level imports are listed to find what to defer.
+Exits with an error if a tool misses its target (or fails to start).
+
+Usage:
+    python tools/bench_import_time.py [-t TOOL ...] [-n NUM_REPEATS] [--top TOP]
+
+Example:
+    python tools/bench_import_time.py
+    python tools/bench_import_time.py -t render_robot_motion.py evaluate_model.py --top 10
+"""
+
+import argparse
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from typing import Dict, Tuple
+
+sys.path.append("./src")
+from utils.types import ImportTimeBenchArgs
+
+# Target of the import time (seconds) of each tool, measured with `--help` (nothing but the imports runs)
+IMPORT_TIME_TARGETS_S = {
+    "render_robot_motion.py": 0.5,  # pybullet only
+    "evaluate_model.py": 2.0,  # torch, but no pytorch3d / human_body_prior / kinpy / matplotlib
+    "serve_retarget.py": 2.0,
+    "bench_cold_start.py": 0.3,  # the runtimes are imported in the child processes
+    "export_npz.py": 2.0,
+    "train.py": 3.0,  # torch & the data loading, but no wandb (only with --wandb)
+    "generate_data.py": 5.0,  # torch, human_body_prior, kinpy (the IK needs them), but no body_visualizer
+}
+
+
+def measure_import_time(tool: str) -> Tuple[float, float, Dict[str, float], str]:
+    """
+    Run the tool with --help and parse the output of -X importtime.
+
+    Returns:
+        import_s: float (sum of the cumulative import time of the top-level imports)
+        wall_s: float (wall-clock time of the process)
+        top_level_s: {top-level package: cumulative import time (s)}
+        error: str (last line of stderr if the tool failed to start, otherwise "")
+    """
+    start = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", f"tools/{tool}", "--help"], capture_output=True, text=True
+    )
+    wall_s = time.perf_counter() - start
+
+    # line format: "import time: self [us] | cumulative | imported package" (nested imports are indented)
+    top_level_s = defaultdict(float)
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.split("|")
+        if name.startswith("  "):
+            continue
+        top_level_s[name.strip().split(".")[0]] += int(cumulative) / 1e6
+
+    error = "" if result.returncode == 0 else result.stderr.strip().splitlines()[-1]
+    return sum(top_level_s.values()), wall_s, top_level_s, error
+
+
+def main(args: ImportTimeBenchArgs):
+    all_passed = True
+
+    print(f"{'tool':>24} | {'import (s)':>10} | {'wall (s)':>8} | {'target (s)':>10} | result")
+    for tool in args.tools:
+        # the minimum over the repeats (the first run also pays for the cold disk cache)
+        runs = [measure_import_time(tool) for _ in range(args.num_repeats)]
+        import_s, wall_s, top_level_s, error = min(runs, key=lambda run: run[0])
+        target_s = IMPORT_TIME_TARGETS_S.get(tool)
+
+        if error:
+            result = f"FAILED ({error})"
+        elif target_s is None:
+            result = "no target"
+        else:
+            result = "ok" if import_s <= target_s else "SLOW"
+        all_passed &= result in ["ok", "no target"]
+
+        target = f"{target_s:.1f}" if target_s is not None else "-"
+        print(f"{tool:>24} | {import_s:>10.3f} | {wall_s:>8.3f} | {target:>10} | {result}")
+
+        heaviest = sorted(top_level_s.items(), key=lambda item: -item[1])[: args.top]
+        print(" " * 27 + ", ".join(f"{name} {seconds:.3f}" for name, seconds in heaviest))
+
+    if not all_passed:
+        raise SystemExit("Some tools missed their import time target or failed to start!")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="benchmark the startup (import) time of the tools")
+
+    parser.add_argument("--tools", "-t", type=str, nargs="+", default=list(IMPORT_TIME_TARGETS_S.keys()))
+    parser.add_argument("--num-repeats", "-n", type=int, default=3)
+    parser.add_argument("--top", type=int, default=5, help="number of the heaviest top-level imports to list")
+
+    args: ImportTimeBenchArgs = parser.parse_args()
+    main(args)
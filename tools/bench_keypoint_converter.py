@@ -0,0 +1,198 @@
+"""
+Check the robot -> SMPL keypoint conversion of the robot specs (data/ROBOT/ROBOT.yaml smpl_keypoints), per pose and
+batched (a single matmul on (N, num_links, 3) link xyzs), against the legacy hand-written converters of each robot
+(frozen copies of the former utils/consts/ROBOT.py functions, keyed by the link names) on random link xyzs, and
+compare their speed.
+Exits with an error if the converted keypoints are not close to the legacy ones.
+
+Usage:
+    python tools/bench_keypoint_converter.py [-N NUM_POSES ...] [-n NUM_REPEATS]
+
+Example:
+    python tools/bench_keypoint_converter.py
+    python tools/bench_keypoint_converter.py -N 2000 200000
+"""
+
+import argparse
+import sys
+import time
+import numpy as np
+from typing import Dict
+
+sys.path.append("./src")
+from utils.types import RobotType, KeypointConverterBenchArgs
+from utils.RobotConfig import RobotConfig
+
+
+def legacy_reachy_xyzs_to_smpl_xyzs(xyzs: Dict[str, np.ndarray]) -> np.ndarray:
+    # fmt: off
+    return np.array([
+        np.array([0.0, 0.0, 0.6]),                                  # pelvis
+        np.array([0.0, -0.04, 0.55]),                               # right hip
+        np.array([0.0, 0.04, 0.55]),                                # left hip
+        np.array([0.0, -0.08, 0.25]),                               # right knee
+        np.array([0.0, 0.08, 0.25]),                                # left knee
+        np.array([0.0, 0.0, 0.85]),                                 # spine 3
+        np.array([0.025, 0.0, 1.05]),                               # neck
+        xyzs["r_shoulder"],                                         # right_shoulder
+        xyzs["r_forearm"],                                          # right_elbow
+        xyzs["r_wrist2hand"],                                       # right_wrist
+        xyzs["r_gripper_thumb"],                                    # right_tumb2
+        xyzs["r_gripper_finger"],                                   # right_index1
+        xyzs["right_tip"],                                          # right_index3
+        xyzs["l_shoulder"],                                         # left_shoulder
+        xyzs["l_forearm"],                                          # left_elbow
+        xyzs["l_wrist2hand"],                                       # left_wrist
+        xyzs["l_gripper_thumb"],                                    # left_tumb2
+        xyzs["l_gripper_finger"],                                   # left_index1
+        xyzs["left_tip"],                                           # left_index3
+        xyzs["right_camera"] + np.array([-0.02, 0.01, 0.075]),      # right_eye_smplhf
+        xyzs["left_camera"] + np.array([-0.02, -0.01, 0.075]),      # left_eye_smplhf
+    ])
+    # fmt: on
+
+
+def legacy_coman_xyzs_to_smpl_xyzs(xyzs: Dict[str, np.ndarray]) -> np.ndarray:
+    r_sh2el = xyzs["RElb"] - xyzs["RShr"]
+    r_el2wr = xyzs["r_wrist"] - xyzs["RElb"]
+    l_sh2el = xyzs["LElb"] - xyzs["LShr"]
+    l_el2wr = xyzs["l_wrist"] - xyzs["LElb"]
+    sh2el_scale = 0.25  # IROS version
+    el2wr_scale = 0.15  # IROS version
+    r_hand = sh2el_scale * r_sh2el + el2wr_scale * r_el2wr
+    l_hand = sh2el_scale * l_sh2el + el2wr_scale * l_el2wr
+
+    # fmt: off
+    smpl_xyzs = [
+        xyzs["Waist"],                                                                              # pelvis
+        xyzs["RHipMot"] + [0, -0.08, 0],                                                            # right hip
+        xyzs["LHipMot"] + [0, 0.08, 0],                                                             # left hip
+        xyzs["RLowLeg"] + [0, -0.03, -0.05],                                                        # right knee
+        xyzs["LLowLeg"] + [0, 0.03, -0.05],                                                         # left knee
+
+        xyzs["torso"] + [0, 0, -0.025],                                                             # spine 3
+        xyzs["torso"] + [0, 0, 0.125],                                                              # neck
+        xyzs["gaze"] + [0, -0.03, 0.15],                                                            # right_eye
+        xyzs["gaze"] + [0, 0.03, 0.15],                                                             # left_eye
+
+        xyzs["RShr"] + [0, 0, 0.075],                                                               # right_shoulder
+        (xyzs["RElb"] + [0, 0, 0.075]) + (sh2el_scale * r_sh2el),                                   # right_elbow
+        (xyzs["r_wrist"] + [0, 0, 0.075]) + r_hand,                                                 # right_wrist
+        # right_middle3, right_thumb3, right_pinky
+        ((xyzs["r_hand_upper_right_link"] + xyzs["r_hand_lower_right_link"]) / 2 + [0, 0, 0.075]) + r_hand,
+        ((3 * xyzs["r_hand_upper_left_link"] + xyzs["r_hand_upper_right_link"]) / 4 + [0, 0, 0.075]) + r_hand,
+        ((xyzs["r_hand_lower_right_link"] + xyzs["r_hand_lower_left_link"]) / 2 + [0, 0, 0.075]) + r_hand,
+
+        xyzs["LShr"] + [0, 0, 0.075],                                                               # left_shoulder
+        (xyzs["LElb"] + [0, 0, 0.075]) + (sh2el_scale * l_sh2el),                                   # left_elbow
+        (xyzs["l_wrist"] + [0, 0, 0.075]) + l_hand,                                                 # left_wrist
+        # left_middle3, left_thumb3, left_pinky
+        ((xyzs["l_hand_upper_right_link"] + xyzs["l_hand_lower_right_link"]) / 2 + [0, 0, 0.075]) + l_hand,
+        ((3 * xyzs["l_hand_upper_left_link"] + xyzs["l_hand_upper_right_link"]) / 4 + [0, 0, 0.075]) + l_hand,
+        ((xyzs["l_hand_lower_right_link"] + xyzs["l_hand_lower_left_link"]) / 2 + [0, 0, 0.075]) + l_hand,
+    ]
+    # fmt: on
+    smpl_xyzs = np.array(smpl_xyzs) + [0, 0, 0.65]
+    smpl_xyzs = smpl_xyzs * 1.1
+    return smpl_xyzs
+
+
+def legacy_nao_xyzs_to_smpl_xyzs(xyzs: Dict[str, np.ndarray]) -> np.ndarray:
+    r_sh2el = xyzs["RElbow"] - xyzs["RShoulder"]
+    r_el2wr = xyzs["r_gripper"] - xyzs["RElbow"]
+    l_sh2el = xyzs["LElbow"] - xyzs["LShoulder"]
+    l_el2wr = xyzs["l_gripper"] - xyzs["LElbow"]
+    sh2el_scale = 0.44
+    el2wr_scale = 0.36
+
+    # fmt: off
+    smpl_xyzs = [
+        (xyzs["RPelvis"] + xyzs["LPelvis"]) / 2,                                                    # pelvis
+        xyzs["RTibia"] + [0, 0.03, 0.06],                                                           # right hip
+        xyzs["LTibia"] + [0, -0.03, 0.06],                                                          # left hip
+        xyzs["RTibia"] + [0, 0.01, -0.08],                                                          # right knee
+        xyzs["LTibia"] + [0, -0.01, -0.08],                                                         # left knee
+
+        xyzs["torso"] + [0, 0, 0.03],                                                               # spine 3
+        xyzs["Neck"],                                                                               # neck
+        xyzs["Head"] + [0, -0.015, 0.07],                                                           # right_eye
+        xyzs["Head"] + [0, 0.015, 0.07],                                                            # left_eye
+
+        xyzs["RShoulder"],                                                                          # right_shoulder
+        xyzs["RElbow"] + (sh2el_scale * r_sh2el),                                                   # right_elbow
+        xyzs["r_gripper"] + (sh2el_scale * r_sh2el) + (el2wr_scale * r_el2wr),                      # right_wrist
+        xyzs["RFinger13_link"] + (sh2el_scale * r_sh2el) + (el2wr_scale * r_el2wr),                 # right_middle1
+        xyzs["RThumb2_link"] + (sh2el_scale * r_sh2el) + (el2wr_scale * r_el2wr),                   # right_thumb1
+
+        xyzs["LShoulder"],                                                                          # left_shoulder
+        xyzs["LElbow"] + (sh2el_scale * l_sh2el),                                                   # left_elbow
+        xyzs["l_gripper"] + (sh2el_scale * l_sh2el) + (el2wr_scale * l_el2wr),                      # left_wrist
+        xyzs["LFinger13_link"] + (sh2el_scale * l_sh2el) + (el2wr_scale * l_el2wr),                 # left_middle1
+        xyzs["LThumb2_link"] + (sh2el_scale * l_sh2el) + (el2wr_scale * l_el2wr),                   # left_thumb1
+    ]
+    # fmt: on
+    smpl_xyzs = np.array(smpl_xyzs) + [0, 0, 0.12]
+    smpl_xyzs = smpl_xyzs * 2
+    return smpl_xyzs
+
+
+LEGACY_CONVERTERS = {
+    RobotType.REACHY: legacy_reachy_xyzs_to_smpl_xyzs,
+    RobotType.COMAN: legacy_coman_xyzs_to_smpl_xyzs,
+    RobotType.NAO: legacy_nao_xyzs_to_smpl_xyzs,
+}
+
+
+def measure_ms(fn, num_repeats: int):
+    start = time.perf_counter()
+    for _ in range(num_repeats):
+        result = fn()
+    return (time.perf_counter() - start) / num_repeats * 1000, result
+
+
+def main(args: KeypointConverterBenchArgs):
+    print(
+        f"{'robot':>6} | {'poses':>7} | {'legacy (ms)':>11} | {'per-pose (ms)':>13} | {'batch (ms)':>10} | "
+        f"{'speedup':>7} | max abs diff (per-pose, batch)"
+    )
+
+    rng = np.random.default_rng(0)
+    all_close = True
+    for robot_type, legacy_converter in LEGACY_CONVERTERS.items():
+        robot_config = RobotConfig(robot_type)
+        convert_xyzs = robot_config.convert_xyzs
+
+        for num_poses in args.num_poses:
+            # per-pose inputs are the lists of link xyzs (same as the forward kinematics results)
+            xyzs = rng.uniform(-1, 1, (num_poses, len(robot_config.link_names), 3))
+            xyzs_lists = [list(pose) for pose in xyzs]
+            xyzs_dicts = [dict(zip(robot_config.link_names, pose)) for pose in xyzs_lists]
+
+            legacy_ms, legacy = measure_ms(
+                lambda: np.asarray([legacy_converter(pose) for pose in xyzs_dicts]), args.num_repeats
+            )
+            per_pose_ms, per_pose = measure_ms(
+                lambda: np.asarray([convert_xyzs(pose) for pose in xyzs_lists]), args.num_repeats
+            )
+            batch_ms, batch = measure_ms(lambda: convert_xyzs.batch(xyzs), args.num_repeats)
+
+            per_pose_diff = np.abs(per_pose - legacy).max()
+            batch_diff = np.abs(batch - legacy).max()
+            all_close &= bool(max(per_pose_diff, batch_diff) < 1e-9)
+            print(
+                f"{robot_type.name:>6} | {num_poses:>7} | {legacy_ms:>11.2f} | {per_pose_ms:>13.2f} | "
+                f"{batch_ms:>10.2f} | {legacy_ms / batch_ms:>6.1f}x | {per_pose_diff:.2e}, {batch_diff:.2e}"
+            )
+
+    if not all_close:
+        raise ValueError("The keypoint conversion of the robot specs differs from the legacy converters!")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="benchmark the batched robot -> SMPL keypoint conversion")
+
+    parser.add_argument("--num-poses", "-N", type=int, nargs="+", default=[2000, 20000])
+    parser.add_argument("--num-repeats", "-n", type=int, default=3)
+
+    args: KeypointConverterBenchArgs = parser.parse_args()
+    main(args)
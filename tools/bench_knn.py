@@ -0,0 +1,137 @@
+"""
+Compare the nearest-neighbour retrieval retargeter with the MLP paths (torch, NumPy runtime) on CPU: the error on the
+test GT motions (calculate_error), the latency of a single frame and of a whole motion, and the memory of the model.
+
+Usage:
+    python tools/bench_knn.py -r ROBOT_TYPE [-ef-off] [-os] [-em EVALUATE_MODE] [-k K ...] [-np NPROBE ...]
+                              [-n NUM_REPEATS]
+
+Example:
+    python tools/build_knn_index.py -r NAO -ef-off
+    python tools/bench_knn.py -r NAO -ef-off
+    python tools/bench_knn.py -r NAO -ef-off -k 1 4 16 -np 1 16 1024
+"""
+
+import argparse
+import copy
+import os.path as osp
+import sys
+import time
+import numpy as np
+import torch
+
+sys.path.append("./src")
+from model.net import TwoStageMLP
+from model.infer_with_one_stage import load_one_stage_model
+from model.infer_with_two_stage import load_two_stage_models
+from model.knn_retargeter import KnnRetargeter, knn_index_path
+from model.numpy_runtime import NumpyRetargeter, npz_model_path, load_smpl_pose, smpl_pose_to_6D_reps
+from utils.calculate_error_from_motions import calculate_error
+from utils.motion import RobotMotion, load_gt_motion
+from utils.types import RobotType, EvaluateMode, KnnBenchArgs
+from utils.RobotConfig import RobotConfig
+from utils.consts import *
+
+
+def measure_latency_ms(predict_fn, inp, num_repeats: int) -> float:
+    # warm up
+    for _ in range(3):
+        predict_fn(inp)
+
+    start = time.perf_counter()
+    for _ in range(num_repeats):
+        predict_fn(inp)
+    return (time.perf_counter() - start) / num_repeats * 1000
+
+
+def main(args: KnnBenchArgs):
+    robot_config = RobotConfig(args.robot_type)
+    robot_name = args.robot_type.name
+    joint_keys = sorted(robot_config.joi_keys)
+
+    # the MLP paths: torch (CPU) and the NumPy runtime (if exported)
+    if args.one_stage:
+        torch_model = load_one_stage_model(robot_config, args.extreme_filter_off, "cpu", args.evaluate_mode)
+    else:
+        model_pre, model_post = load_two_stage_models(robot_config, args.extreme_filter_off, "cpu", args.evaluate_mode)
+        torch_model = TwoStageMLP(model_pre, model_post).eval()
+
+    def torch_predict(smpl_rep: np.ndarray) -> np.ndarray:
+        with torch.no_grad():
+            return torch_model(torch.from_numpy(smpl_rep)).numpy()[:, : robot_config.angles_dim]
+
+    mlp_mb = sum(p.numel() * p.element_size() for p in torch_model.parameters()) / 2**20
+    paths = {"mlp torch": (torch_predict, mlp_mb, 0.0)}
+
+    npz_path = npz_model_path(robot_name, args.extreme_filter_off, args.one_stage, args.evaluate_mode)
+    if osp.exists(npz_path):
+        paths["mlp numpy"] = (NumpyRetargeter(npz_path), mlp_mb, 0.0)
+
+    # the retrieval with each k and nprobe, sharing the index
+    start = time.perf_counter()
+    knn = KnnRetargeter(knn_index_path(robot_name, args.extreme_filter_off))
+    knn_load_s = time.perf_counter() - start
+    print(f"Retrieval index: {len(knn.smpl_reps)} training pairs in {len(knn.centroids)} cells")
+    for k in args.ks:
+        for nprobe in args.nprobes:
+            knn_variant = copy.copy(knn)
+            knn_variant.k, knn_variant.nprobe = min(k, len(knn.smpl_reps)), nprobe
+            paths[f"knn k={k} nprobe={nprobe}"] = (knn_variant, knn.memory_mb, knn_load_s)
+
+    # SMPL reps of the test GT motions
+    smpl_reps = {
+        motion_idx: smpl_pose_to_6D_reps(load_smpl_pose(osp.join(AMASS_DATA_PATH, f"{motion_idx}_stageii.npz")))
+        for motion_idx in TEST_GT_MOTION_IDXS
+    }
+    gt_motions = {motion_idx: load_gt_motion(args.robot_type, motion_idx) for motion_idx in TEST_GT_MOTION_IDXS}
+    longest = max(smpl_reps.values(), key=len)
+
+    print(
+        f"Robot: {robot_name} Model: {'one-stage' if args.one_stage else 'two-stage'} "
+        f"Evaluate mode: {args.evaluate_mode.value} (test GT motions, CPU)"
+    )
+    print(
+        f"{'path':>24} | {'error':>9} | {'1 frame (ms)':>12} | {f'{len(longest)} frames (ms)':>18} | "
+        f"{'memory (MB)':>11} | {'load (s)':>8}"
+    )
+    for name, (predict_fn, memory_mb, load_s) in paths.items():
+        errors = [
+            calculate_error(
+                robot_config, args.evaluate_mode, RobotMotion(predict_fn(smpl_reps[idx]), joint_keys), gt_motions[idx]
+            )
+            for idx in TEST_GT_MOTION_IDXS
+        ]
+        frame_ms = measure_latency_ms(predict_fn, longest[:1], args.num_repeats)
+        motion_ms = measure_latency_ms(predict_fn, longest, max(1, args.num_repeats // 20))
+        print(
+            f"{name:>24} | {np.mean(errors):>9.5f} | {frame_ms:>12.3f} | {motion_ms:>18.2f} | "
+            f"{memory_mb:>11.2f} | {load_s:>8.2f}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="compare the nearest-neighbour retrieval with the MLP paths")
+
+    parser.add_argument("--robot-type", "-r", type=RobotType, default=RobotType.NAO)
+    parser.add_argument("--extreme-filter-off", "-ef-off", action="store_true")
+    parser.add_argument("--one-stage", "-os", action="store_true")
+    parser.add_argument(
+        "--evaluate-mode",
+        "-em",
+        type=EvaluateMode,
+        choices=list(EvaluateMode),
+        default=EvaluateMode.JOINT,
+    )
+    parser.add_argument("--ks", "-k", type=int, nargs="+", default=[1, KNN_K, 16])
+    parser.add_argument(
+        "--nprobes",
+        "-np",
+        type=int,
+        nargs="+",
+        default=[1, KNN_NPROBE, KNN_NUM_CELLS],
+        help="searched cells of the retrieval (KNN_NUM_CELLS: exact)",
+    )
+    parser.add_argument("--num-repeats", "-n", type=int, default=200)
+
+    args: KnnBenchArgs = parser.parse_args()
+    main(args)
@@ -0,0 +1,116 @@
+"""
+Check the parity of the differentiable FK (utils/torch_kinematics.py) with kinpy, and benchmark the cost of the
+link-position loss (tools/train.py -llw) per training batch on CPU: forward + backward of the one-stage model with the
+joint angles MSE only and with the link-position loss, against the kinpy FK of the same batch (one pose per call).
+Exits with an error if the link positions are not close to kinpy's.
+
+Usage:
+    python tools/bench_link_loss.py -r ROBOT_TYPE [-bs BATCH_SIZE ...] [-t NUM_THREADS] [-n NUM_REPEATS]
+
+Example:
+    python tools/bench_link_loss.py -r NAO
+    python tools/bench_link_loss.py -r COMAN -bs 256 2048 -t 8
+"""
+
+import argparse
+import sys
+import time
+import kinpy as kp
+import numpy as np
+import torch
+import torch.nn as nn
+
+sys.path.append("./src")
+from model.net import MLP
+from utils.torch_kinematics import TorchForwardKinematics, link_position_loss
+from utils.urdf import parse_urdf
+from utils.types import RobotType, LinkLossBenchArgs
+from utils.RobotConfig import RobotConfig
+from utils.consts import *
+
+
+def measure_ms(step_fn, num_repeats: int) -> float:
+    # warm up
+    for _ in range(3):
+        step_fn()
+
+    start = time.perf_counter()
+    for _ in range(num_repeats):
+        step_fn()
+    return (time.perf_counter() - start) / num_repeats * 1000
+
+
+def main(args: LinkLossBenchArgs):
+    if args.num_threads > 0:
+        torch.set_num_threads(args.num_threads)
+
+    robot_config = RobotConfig(args.robot_type)
+    joint_keys = sorted(robot_config.joi_keys)
+    links = robot_config.evaluate_links
+    lower = np.array([robot_config.joi_range[k][0] for k in joint_keys])
+    upper = np.array([robot_config.joi_range[k][1] for k in joint_keys])
+
+    fk = TorchForwardKinematics(parse_urdf(robot_config.URDF_PATH), joint_keys, links)
+    kp_chain = kp.build_chain_from_urdf(open(robot_config.URDF_PATH).read())
+
+    def kinpy_xyzs(angles: np.ndarray) -> np.ndarray:
+        fk_results = [kp_chain.forward_kinematics(dict(zip(joint_keys, pose))) for pose in angles.tolist()]
+        return np.array([[fk_result[link].pos for link in links] for fk_result in fk_results])
+
+    # parity with kinpy (float64, random poses within the joint ranges)
+    angles = np.random.uniform(lower, upper, (256, len(joint_keys)))
+    with torch.no_grad():
+        max_diff = np.abs(fk.double()(torch.from_numpy(angles)).numpy() - kinpy_xyzs(angles)).max()
+    fk.float()
+    print(f"Robot: {args.robot_type.name} ({len(links)} evaluate links) max abs diff with kinpy: {max_diff:.2e}")
+
+    model = MLP(SMPL_ARM_JOINT_REPS_DIM, robot_config.angles_dim, HIDDEN_DIM)
+    criterion = nn.MSELoss()
+
+    print(
+        f"{'batch':>6} | {'MSE (ms)':>9} | {'MSE + link (ms)':>15} | {'overhead':>8} | {'FK fwd (ms)':>11} | "
+        f"{'kinpy FK (ms)':>13}"
+    )
+    for batch_size in args.batch_sizes:
+        smpl_rep = torch.rand(batch_size, SMPL_ARM_JOINT_REPS_DIM)
+        gt_angle = torch.from_numpy(np.random.uniform(lower, upper, (batch_size, len(joint_keys)))).float()
+
+        def mse_step():
+            model.zero_grad()
+            criterion(model(smpl_rep), gt_angle).backward()
+
+        def link_step():
+            model.zero_grad()
+            pred_angle = model(smpl_rep)
+            (criterion(pred_angle, gt_angle) + link_position_loss(fk, pred_angle, gt_angle)).backward()
+
+        def fk_forward():
+            with torch.no_grad():
+                fk(gt_angle)
+
+        mse_ms = measure_ms(mse_step, args.num_repeats)
+        link_ms = measure_ms(link_step, args.num_repeats)
+        fk_ms = measure_ms(fk_forward, args.num_repeats)
+
+        # kinpy on a part of the batch, scaled to the batch (one pose per call)
+        num_kinpy = min(batch_size, 64)
+        kinpy_ms = measure_ms(lambda: kinpy_xyzs(gt_angle.numpy()[:num_kinpy]), 1) * batch_size / num_kinpy
+        print(
+            f"{batch_size:>6} | {mse_ms:>9.2f} | {link_ms:>15.2f} | {link_ms / mse_ms - 1:>+7.0%} | {fk_ms:>11.2f} | "
+            f"{kinpy_ms:>13.1f}"
+        )
+
+    if not max_diff < 1e-6:
+        raise ValueError("The link positions of the differentiable FK are not close to kinpy's!")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="benchmark the differentiable FK of the link-position loss")
+
+    parser.add_argument("--robot-type", "-r", type=RobotType, default=RobotType.NAO)
+    parser.add_argument("--batch-sizes", "-bs", type=int, nargs="+", default=[256, EF_OFF_BATCH_SIZE])
+    parser.add_argument("--num-threads", "-t", type=int, default=0, help="torch CPU threads (0: default)")
+    parser.add_argument("--num-repeats", "-n", type=int, default=50)
+
+    args: LinkLossBenchArgs = parser.parse_args()
+    main(args)
@@ -0,0 +1,111 @@
+"""
+Compare the legacy robot motion format (pickled list of per-frame dicts) with RobotMotion (.npz of a (T, J) array)
+on a long synthetic motion: file size, save/load time and the JOINT error calculation time.
+Exits with an error if the vectorised JOINT error differs from the legacy per-frame loop.
+
+Usage:
+    python tools/bench_motion_format.py -r ROBOT_TYPE [-t NUM_FRAMES] [-n NUM_REPEATS]
+
+Example:
+    python tools/bench_motion_format.py -r NAO
+    python tools/bench_motion_format.py -r COMAN -t 100000
+"""
+
+import argparse
+import math
+import os
+import os.path as osp
+import pickle
+import sys
+import tempfile
+import time
+import numpy as np
+from typing import List
+
+sys.path.append("./src")
+from utils.calculate_error_from_motions import calculate_error
+from utils.motion import RobotMotion
+from utils.types import RobotType, EvaluateMode, MotionFormatBenchArgs
+from utils.RobotConfig import RobotConfig
+
+
+def legacy_joint_error(pred_motion: List[dict], gt_motion: List[dict]) -> float:
+    """
+    JOINT error of the legacy format (per-frame & per-joint python loop)
+    """
+    common_joint_keys = list(set(pred_motion[0].keys()).intersection(gt_motion[0].keys()))
+
+    motion_error = 0.0
+    for pose_idx in range(len(pred_motion)):
+        pose_loss = 0.0
+        for key in common_joint_keys:
+            diff = (pred_motion[pose_idx][key] - gt_motion[pose_idx][key]) % (2 * math.pi)
+            pose_loss += min(diff, (2 * math.pi) - diff)
+        motion_error += pose_loss / len(common_joint_keys)
+
+    return motion_error / len(pred_motion)
+
+
+def measure_ms(fn, num_repeats: int):
+    start = time.perf_counter()
+    for _ in range(num_repeats):
+        result = fn()
+    return (time.perf_counter() - start) / num_repeats * 1000, result
+
+
+def main(args: MotionFormatBenchArgs):
+    robot_config = RobotConfig(args.robot_type)
+    joint_names = sorted(robot_config.joi_keys)
+
+    # synthetic motions in the joint angle range of the robot ([-pi, pi])
+    rng = np.random.default_rng(0)
+    shape = (args.num_frames, len(joint_names))
+    pred_motion = RobotMotion(rng.uniform(-math.pi, math.pi, shape), joint_names)
+    gt_motion = RobotMotion(rng.uniform(-math.pi, math.pi, shape), joint_names)
+    pred_dicts, gt_dicts = pred_motion.to_dicts(), gt_motion.to_dicts()
+
+    print(f"Robot: {args.robot_type.name} Frames: {args.num_frames} Joints: {len(joint_names)}")
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        pkl_path = osp.join(temp_dir, "motion.pkl")
+        npz_path = osp.join(temp_dir, "motion.npz")
+
+        def save_pkl():
+            with open(pkl_path, "wb") as f:
+                pickle.dump(pred_dicts, f)
+
+        def load_pkl():
+            with open(pkl_path, "rb") as f:
+                return pickle.load(f)
+
+        pkl_save_ms, _ = measure_ms(save_pkl, args.num_repeats)
+        pkl_load_ms, _ = measure_ms(load_pkl, args.num_repeats)
+        npz_save_ms, _ = measure_ms(lambda: pred_motion.save(npz_path), args.num_repeats)
+        npz_load_ms, _ = measure_ms(lambda: RobotMotion.load(npz_path), args.num_repeats)
+
+        pkl_mb, npz_mb = os.path.getsize(pkl_path) / 1e6, os.path.getsize(npz_path) / 1e6
+
+        print(f"{'format':>12} | {'size (MB)':>9} | {'save (ms)':>9} | {'load (ms)':>9}")
+        print(f"{'pkl (dicts)':>12} | {pkl_mb:>9.2f} | {pkl_save_ms:>9.2f} | {pkl_load_ms:>9.2f}")
+        print(f"{'npz (array)':>12} | {npz_mb:>9.2f} | {npz_save_ms:>9.2f} | {npz_load_ms:>9.2f}")
+
+    legacy_ms, legacy_error = measure_ms(lambda: legacy_joint_error(pred_dicts, gt_dicts), args.num_repeats)
+    array_ms, array_error = measure_ms(
+        lambda: calculate_error(robot_config, EvaluateMode.JOINT, pred_motion, gt_motion), args.num_repeats
+    )
+    print(f"JOINT error: legacy {legacy_ms:.2f} ms ({legacy_error:.10f}) array {array_ms:.2f} ms ({array_error:.10f})")
+    print(f"speedup {legacy_ms / array_ms:.1f}x")
+
+    if not math.isclose(legacy_error, array_error, rel_tol=1e-9):
+        raise ValueError("The vectorised JOINT error differs from the legacy per-frame loop!")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="compare the legacy & array-native robot motion formats")
+
+    parser.add_argument("--robot-type", "-r", type=RobotType, default=RobotType.NAO)
+    parser.add_argument("--num-frames", "-t", type=int, default=20000)
+    parser.add_argument("--num-repeats", "-n", type=int, default=3)
+
+    args: MotionFormatBenchArgs = parser.parse_args()
+    main(args)
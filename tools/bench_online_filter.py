@@ -0,0 +1,95 @@
+"""
+Report the added latency, the per-frame cost and the jerk reduction of the online (causal) motion filters on the GT
+motions, with the offline Savitzky-Golay smoothing (non-causal, needs the whole motion) as a reference.
+
+- lookahead: frames the filter waits for before returning a frame (structural latency)
+- lag: frames the smoothed motion trails the raw motion (argmin of the mean abs difference over the shifts)
+- latency: added latency of the live operation in frames (lookahead + lag)
+- jerk: mean magnitude of the third derivative of the joint angles (rad/s^3)
+
+Usage:
+    python tools/bench_online_filter.py -r ROBOT_TYPE [--max-lag MAX_LAG]
+
+Example:
+    python tools/bench_online_filter.py -r NAO
+"""
+
+import argparse
+import sys
+import time
+import numpy as np
+from typing import List, Optional
+
+sys.path.append("./src")
+from utils.motion import RobotMotion, load_gt_motion
+from utils.smoothing import OneEuroFilter, CausalSavgolFilter, filter_online, smooth_motion
+from utils.types import RobotType, OnlineFilterBenchArgs
+from utils.RobotConfig import RobotConfig
+from utils.consts import *
+
+
+def mean_jerk(angles: np.ndarray) -> float:
+    return float(np.abs(np.diff(angles, n=3, axis=0)).mean() * MOTION_FPS**3)
+
+
+def estimate_lag_frames(raw: np.ndarray, smoothed: np.ndarray, max_lag: int) -> int:
+    """
+    Shift (in frames) of the smoothed motion behind the raw motion
+    """
+    errors = [np.abs(smoothed[lag:] - raw[: len(raw) - lag]).mean() for lag in range(max_lag + 1)]
+    return int(np.argmin(errors))
+
+
+def main(args: OnlineFilterBenchArgs):
+    robot_config = RobotConfig(args.robot_type)
+    motions = [load_gt_motion(args.robot_type, motion_idx) for motion_idx in GT_MOTION_IDXS]
+    num_frames = sum(len(motion) for motion in motions)
+
+    filters = {
+        "one_euro": OneEuroFilter(),
+        "causal_savgol (lookahead 0)": CausalSavgolFilter(lookahead=0),
+        f"causal_savgol (lookahead {CAUSAL_SAVGOL_LOOKAHEAD})": CausalSavgolFilter(),
+    }
+
+    print(f"Robot: {args.robot_type.name} GT motions: {len(motions)} Frames: {num_frames} FPS: {MOTION_FPS}")
+    print(
+        f"{'filter':>30} | {'lookahead':>9} | {'lag':>3} | {'latency':>7} | {'us/frame':>8} | {'jerk':>10} | "
+        f"{'reduction':>9} | {'mean abs diff':>13}"
+    )
+
+    raw_jerk = np.mean([mean_jerk(motion.angles) for motion in motions])
+    print(f"{'raw':>30} | {0:>9} | {0:>3} | {0:>7} | {0:>8.1f} | {raw_jerk:>10.2f} | {0:>8.1f}% | {0:>13.5f}")
+
+    def report(name: str, lookahead: Optional[int], smoothed_motions: List[RobotMotion], seconds: float):
+        jerk = np.mean([mean_jerk(smoothed.angles) for smoothed in smoothed_motions])
+        lag = np.median(
+            [estimate_lag_frames(m.angles, s.angles, args.max_lag) for m, s in zip(motions, smoothed_motions)]
+        )
+        diff = np.mean([np.abs(m.angles - s.angles).mean() for m, s in zip(motions, smoothed_motions)])
+        # the offline smoothing waits for the whole motion
+        latency = "motion" if lookahead is None else f"{lookahead + lag:.0f}"
+        lookahead = "motion" if lookahead is None else lookahead
+        print(
+            f"{name:>30} | {lookahead:>9} | {lag:>3.0f} | {latency:>7} | {seconds / num_frames * 1e6:>8.1f} | "
+            f"{jerk:>10.2f} | {(1 - jerk / raw_jerk) * 100:>8.1f}% | {diff:>13.5f}"
+        )
+
+    for name, online_filter in filters.items():
+        start = time.perf_counter()
+        smoothed_motions = [filter_online(online_filter, motion) for motion in motions]
+        report(name, online_filter.latency_frames, smoothed_motions, time.perf_counter() - start)
+
+    # reference: offline smoothing (the whole motion is needed)
+    start = time.perf_counter()
+    smoothed_motions = [smooth_motion(motion, robot_config.smooth_window) for motion in motions]
+    report("offline savgol", None, smoothed_motions, time.perf_counter() - start)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="benchmark the online motion filters on the GT motions")
+
+    parser.add_argument("--robot-type", "-r", type=RobotType, default=RobotType.NAO)
+    parser.add_argument("--max-lag", type=int, default=30, help="max shift (frames) to search the lag")
+
+    args: OnlineFilterBenchArgs = parser.parse_args()
+    main(args)
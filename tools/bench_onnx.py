@@ -0,0 +1,95 @@
+"""
+Check the numerical parity of the ONNX backend with the torch model, and compare their CPU latency.
+Exits with an error if the outputs of the two backends are not close.
+
+Usage:
+    python tools/bench_onnx.py -r ROBOT_TYPE [-ef-off] [-os] [-em EVALUATE_MODE] [-bs BATCH_SIZE ...] [-n NUM_REPEATS]
+
+Example:
+    python tools/export_onnx.py -r NAO
+    python tools/bench_onnx.py -r NAO
+    python tools/bench_onnx.py -r NAO -os -bs 1 32 2000
+"""
+
+import argparse
+import sys
+import time
+import numpy as np
+import torch
+
+sys.path.append("./src")
+from model.net import TwoStageMLP
+from model.infer_with_one_stage import load_one_stage_model
+from model.infer_with_two_stage import load_two_stage_models
+from model.onnx_backend import OnnxRetargeter, onnx_model_path
+from utils.types import RobotType, EvaluateMode, BackendBenchArgs
+from utils.RobotConfig import RobotConfig
+from utils.consts import *
+
+
+def measure_latency_ms(predict_fn, inp, num_repeats: int) -> float:
+    # warm up
+    for _ in range(3):
+        predict_fn(inp)
+
+    start = time.perf_counter()
+    for _ in range(num_repeats):
+        predict_fn(inp)
+    return (time.perf_counter() - start) / num_repeats * 1000
+
+
+def main(args: BackendBenchArgs):
+    robot_config = RobotConfig(args.robot_type)
+
+    if args.one_stage:
+        torch_model = load_one_stage_model(robot_config, args.extreme_filter_off, "cpu", args.evaluate_mode)
+    else:
+        model_pre, model_post = load_two_stage_models(robot_config, args.extreme_filter_off, "cpu", args.evaluate_mode)
+        torch_model = TwoStageMLP(model_pre, model_post).eval()
+
+    onnx_path = onnx_model_path(robot_config, args.extreme_filter_off, args.one_stage, args.evaluate_mode)
+    onnx_model = OnnxRetargeter(onnx_path)
+
+    def torch_predict(smpl_rep: np.ndarray) -> np.ndarray:
+        with torch.no_grad():
+            return torch_model(torch.from_numpy(smpl_rep)).numpy()
+
+    print(f"Robot: {args.robot_type.name} Model: {'one-stage' if args.one_stage else 'two-stage'} ({onnx_path})")
+    print(f"{'batch':>6} | {'torch (ms)':>10} | {'onnx (ms)':>10} | {'speedup':>7} | {'max abs diff':>12}")
+
+    parity_ok = True
+    for batch_size in args.batch_sizes:
+        smpl_rep = np.random.rand(batch_size, SMPL_ARM_JOINT_REPS_DIM).astype(np.float32)
+
+        # numerical parity between the torch and the ONNX backends
+        max_diff = np.abs(torch_predict(smpl_rep) - onnx_model(smpl_rep)).max()
+        parity_ok &= bool(max_diff < 1e-4)
+
+        torch_ms = measure_latency_ms(torch_predict, smpl_rep, args.num_repeats)
+        onnx_ms = measure_latency_ms(onnx_model, smpl_rep, args.num_repeats)
+        print(
+            f"{batch_size:>6} | {torch_ms:>10.3f} | {onnx_ms:>10.3f} | {torch_ms / onnx_ms:>6.2f}x | {max_diff:>12.2e}"
+        )
+
+    if not parity_ok:
+        raise ValueError("The outputs of the ONNX backend are not close to the torch model!")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="compare the torch & ONNX backends")
+
+    parser.add_argument("--robot-type", "-r", type=RobotType, default=RobotType.NAO)
+    parser.add_argument("--extreme-filter-off", "-ef-off", action="store_true")
+    parser.add_argument("--one-stage", "-os", action="store_true")
+    parser.add_argument(
+        "--evaluate-mode",
+        "-em",
+        type=EvaluateMode,
+        choices=list(EvaluateMode),
+        default=EvaluateMode.LINK,
+    )
+    parser.add_argument("--batch-sizes", "-bs", type=int, nargs="+", default=[1, 32, 2000])
+    parser.add_argument("--num-repeats", "-n", type=int, default=200)
+
+    args: BackendBenchArgs = parser.parse_args()
+    main(args)
@@ -0,0 +1,80 @@
+"""
+Load generator for the retargeting inference server.
+Send requests from concurrent clients and measure the requests/s and the latency of the server.
+
+Usage:
+    python tools/bench_retarget_server.py -r ROBOT_TYPE [-c CONCURRENCY] [-n NUM_REQUESTS] [-f FRAMES_PER_REQUEST]
+
+Example:
+    python tools/serve_retarget.py -d cpu &
+    python tools/bench_retarget_server.py -r NAO -c 1 -n 500 -f 1
+    python tools/bench_retarget_server.py -r NAO -c 32 -n 2000 -f 1
+"""
+
+import argparse
+import json
+import sys
+import time
+import urllib.request
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.append("./src")
+from utils.types import RobotType, ServerBenchArgs
+from utils.consts import *
+
+
+def post_retarget(url: str, body: bytes) -> float:
+    """
+    Send a single retargeting request and return its latency in milliseconds.
+    """
+    request = urllib.request.Request(url, data=body, headers={"Content-Type": "application/json"})
+
+    start = time.perf_counter()
+    with urllib.request.urlopen(request) as response:
+        response.read()
+    return (time.perf_counter() - start) * 1000
+
+
+def main(args: ServerBenchArgs):
+    base_url = f"http://{args.host}:{args.port}"
+
+    # Random 6D reps are enough to measure the server, since the cost of the model doesn't depend on the values.
+    smpl_rep = np.random.rand(args.frames_per_request, SMPL_ARM_JOINT_REPS_DIM).astype(np.float32)
+    body = json.dumps({"robot_type": args.robot_type.value, "smpl_rep": smpl_rep.tolist()}).encode("utf-8")
+
+    # warm up the server (the first forward pass is slower than the others)
+    post_retarget(f"{base_url}/retarget", body)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as executor:
+        latencies = list(executor.map(lambda _: post_retarget(f"{base_url}/retarget", body), range(args.num_requests)))
+    elapsed = time.perf_counter() - start
+
+    latencies = np.array(latencies)
+    print(f"Robot: {args.robot_type.name} Concurrency: {args.concurrency} Frames/request: {args.frames_per_request}")
+    print(f"Requests/s: {args.num_requests / elapsed:.1f}")
+    print(f"Frames/s:   {args.num_requests * args.frames_per_request / elapsed:.1f}")
+    print(
+        f"Latency (ms): p50 {np.percentile(latencies, 50):.2f} "
+        f"p95 {np.percentile(latencies, 95):.2f} max {latencies.max():.2f}"
+    )
+
+    # counters of the server side (includes the batching statistics)
+    with urllib.request.urlopen(f"{base_url}/stats") as response:
+        stats = json.loads(response.read())
+    print(json.dumps(stats[args.robot_type.name], indent=2))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="load generator for the retargeting inference server")
+
+    parser.add_argument("--robot-type", "-r", type=RobotType, default=RobotType.NAO)
+    parser.add_argument("--host", type=str, default=SERVER_HOST)
+    parser.add_argument("--port", type=int, default=SERVER_PORT)
+    parser.add_argument("--concurrency", "-c", type=int, default=16)
+    parser.add_argument("--num-requests", "-n", type=int, default=1000)
+    parser.add_argument("--frames-per-request", "-f", type=int, default=1)
+
+    args: ServerBenchArgs = parser.parse_args()
+    main(args)
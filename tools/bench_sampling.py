@@ -0,0 +1,87 @@
+"""
+Compare the block-vectorized joint angle sampling ((N, J) matrix in a single call) with the legacy sampling (a scalar
+np.random.rand() per joint and per pose after np.random.seed) of each robot.
+Exits with an error if the LEGACY sampling mode doesn't reproduce the legacy angles bit-exactly.
+
+Usage:
+    python tools/bench_sampling.py [-p NUM_POSES] [-s SEED ...] [-n NUM_REPEATS]
+
+Example:
+    python tools/bench_sampling.py
+    python tools/bench_sampling.py -p 100000 -s 0 1 999
+"""
+
+import argparse
+import sys
+import time
+import numpy as np
+from typing import List
+
+sys.path.append("./src")
+from process_data.sample_robot_data import sample_joint_angles
+from utils.types import RobotType, SamplingMode, SamplingBenchArgs
+from utils.RobotConfig import RobotConfig
+
+
+def legacy_sample(robot_config: RobotConfig, num_poses: int, seed: int) -> List[dict]:
+    """
+    Legacy sampling of sample_robot_data (global seed, a scalar draw per joint and per pose)
+    """
+    np.random.seed(seed)
+    return [
+        {k: ((np.random.rand() * (v[1] - v[0])) + v[0]) for k, v in robot_config.joi_range.items()}
+        for _ in range(num_poses)
+    ]
+
+
+def measure_ms(fn, num_repeats: int):
+    start = time.perf_counter()
+    for _ in range(num_repeats):
+        result = fn()
+    return (time.perf_counter() - start) / num_repeats * 1000, result
+
+
+def main(args: SamplingBenchArgs):
+    print(f"Poses: {args.num_poses} Seeds: {args.seeds}")
+    print(
+        f"{'robot':>6} | {'legacy (ms)':>11} | {'LEGACY (ms)':>11} | {'UNIFORM (ms)':>12} | {'speedup':>7} | bit-exact"
+    )
+
+    all_exact = True
+    for robot_type in RobotType:
+        robot_config = RobotConfig(robot_type)
+        joint_names = list(robot_config.joi_keys)
+
+        exact = True
+        for seed in args.seeds:
+            legacy = legacy_sample(robot_config, args.num_poses, seed)
+            block = sample_joint_angles(robot_config, args.num_poses, seed, SamplingMode.LEGACY)
+            exact &= bool(np.array_equal(np.array([[pose[k] for k in joint_names] for pose in legacy]), block))
+        all_exact &= exact
+
+        seed = args.seeds[0]
+        legacy_ms, _ = measure_ms(lambda: legacy_sample(robot_config, args.num_poses, seed), args.num_repeats)
+        block_ms, _ = measure_ms(
+            lambda: sample_joint_angles(robot_config, args.num_poses, seed, SamplingMode.LEGACY), args.num_repeats
+        )
+        uniform_ms, _ = measure_ms(
+            lambda: sample_joint_angles(robot_config, args.num_poses, seed, SamplingMode.UNIFORM), args.num_repeats
+        )
+        print(
+            f"{robot_type.name:>6} | {legacy_ms:>11.2f} | {block_ms:>11.3f} | {uniform_ms:>12.3f} | "
+            f"{legacy_ms / block_ms:>6.0f}x | {exact}"
+        )
+
+    if not all_exact:
+        raise ValueError("The LEGACY sampling mode doesn't reproduce the legacy sampling!")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="benchmark the block-vectorized joint angle sampling")
+
+    parser.add_argument("--num-poses", "-p", type=int, default=2000)
+    parser.add_argument("--seeds", "-s", type=int, nargs="+", default=[0, 1, 42, 999])
+    parser.add_argument("--num-repeats", "-n", type=int, default=3)
+
+    args: SamplingBenchArgs = parser.parse_args()
+    main(args)
@@ -0,0 +1,103 @@
+"""
+Compare the sampling modes (i.i.d. uniform, scrambled Sobol' / Halton, Latin hypercube) by the coverage of the joint
+space and a validation error against the number of sampled poses.
+
+Running the VPoser IK and training a model for every mode and every number of poses is too expensive for a benchmark,
+so the validation error is the error of the nearest sampled pose: each validation pose is matched to the sampled pose
+with the closest SMPL keypoints (the IK targets), and the joint angle error of the match is reported. It measures how
+well the sampled poses cover the poses that the model has to retarget, at no IK cost.
+The validation poses are the validation GT motions if the GT file exists, otherwise i.i.d. uniform poses.
+
+Usage:
+    python tools/bench_sampling_coverage.py -r ROBOT_TYPE [-p NUM_POSES ...] [-m SAMPLING_MODE ...] [-v NUM_VALID]
+
+Example:
+    python tools/bench_sampling_coverage.py -r NAO
+    python tools/bench_sampling_coverage.py -r COMAN -p 1000 8000 -m uniform sobol
+"""
+
+import argparse
+import os.path as osp
+import sys
+import time
+import numpy as np
+import kinpy as kp
+from scipy.spatial import cKDTree
+
+sys.path.append("./src")
+from process_data.sample_robot_data import sample_joint_angles, joint_space_coverage
+from utils.forward_kinematics import smpl_xyzs
+from utils.motion import load_gt_motion
+from utils.types import RobotType, SamplingMode, SamplingCoverageBenchArgs
+from utils.RobotConfig import RobotConfig
+from utils.consts import *
+
+VALID_SEED = 12345  # seed of the i.i.d. uniform validation poses (not used by the sampled poses)
+
+
+def main(args: SamplingCoverageBenchArgs):
+    robot_config = RobotConfig(args.robot_type)
+    chain = kp.build_chain_from_urdf(open(robot_config.URDF_PATH).read())
+
+    if osp.exists(GT_PATH):
+        valid_source = f"GT motions {VALID_GT_MOTION_IDXS}"
+        valid_angles = np.concatenate(
+            [
+                load_gt_motion(args.robot_type, motion_idx).select(list(robot_config.joi_keys)).angles
+                for motion_idx in VALID_GT_MOTION_IDXS
+            ]
+        ).astype(np.float64)
+    else:
+        valid_source = "i.i.d. uniform poses"
+        valid_angles = sample_joint_angles(robot_config, args.num_valid, VALID_SEED, SamplingMode.UNIFORM)
+    valid_keypoints = smpl_xyzs(robot_config, chain, valid_angles).reshape(len(valid_angles), -1)
+
+    print(f"Robot: {args.robot_type.name} Joints: {valid_angles.shape[1]}")
+    print(f"Validation: {valid_source} ({len(valid_angles)} poses)")
+    print(
+        f"{'mode':>7} | {'poses':>6} | {'sample (ms)':>11} | {'mean gap':>8} | {'max gap':>7} | "
+        f"{'NN angle err (rad)':>18} | NN keypoint err (m)"
+    )
+
+    # warm up (scipy.stats is imported at the first quasi-random sampling)
+    for sampling_mode in args.sampling_modes:
+        sample_joint_angles(robot_config, 1, 0, sampling_mode)
+
+    for num_poses in args.num_poses:
+        for sampling_mode in args.sampling_modes:
+            start = time.perf_counter()
+            angles = sample_joint_angles(robot_config, num_poses, 0, sampling_mode)
+            sample_ms = (time.perf_counter() - start) * 1000
+
+            coverage = joint_space_coverage(robot_config, angles)
+
+            keypoints = smpl_xyzs(robot_config, chain, angles).reshape(num_poses, -1)
+            keypoint_dists, nearest = cKDTree(keypoints).query(valid_keypoints)
+            angle_err = np.abs(angles[nearest] - valid_angles).mean()
+            num_joints = keypoints.shape[1] // 3
+            keypoint_err = np.linalg.norm(
+                (keypoints[nearest] - valid_keypoints).reshape(-1, num_joints, 3), axis=-1
+            ).mean()
+
+            print(
+                f"{sampling_mode.value:>7} | {num_poses:>6} | {sample_ms:>11.2f} | {coverage['mean_gap']:>8.4f} | "
+                f"{coverage['max_gap']:>7.4f} | {angle_err:>18.4f} | {keypoint_err:.4f}"
+            )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="benchmark the coverage of the joint angle sampling modes")
+
+    parser.add_argument("--robot-type", "-r", type=RobotType, default=RobotType.NAO)
+    parser.add_argument("--num-poses", "-p", type=int, nargs="+", default=[250, 1000, 4000])
+    parser.add_argument(
+        "--sampling-modes",
+        "-m",
+        type=SamplingMode,
+        nargs="+",
+        default=[SamplingMode.UNIFORM, SamplingMode.SOBOL, SamplingMode.HALTON, SamplingMode.LHS],
+    )
+    parser.add_argument("--num-valid", "-v", type=int, default=2000, help="number of the uniform validation poses")
+
+    args: SamplingCoverageBenchArgs = parser.parse_args()
+    main(args)
@@ -0,0 +1,90 @@
+"""
+Compare the vectorised smoothing stage (a single savgol_filter call on the (T, J) joint angles) with the legacy
+per-joint smoothing of the per-frame dicts on long synthetic motions.
+Exits with an error if the smoothed motions are not close.
+
+Usage:
+    python tools/bench_smoothing.py -r ROBOT_TYPE [-t NUM_FRAMES ...] [-n NUM_REPEATS]
+
+Example:
+    python tools/bench_smoothing.py -r COMAN
+    python tools/bench_smoothing.py -r NAO -t 1000 100000
+"""
+
+import argparse
+import copy
+import sys
+import time
+import numpy as np
+from scipy.signal import savgol_filter
+from typing import List
+
+sys.path.append("./src")
+from utils.motion import RobotMotion
+from utils.smoothing import smooth_motion
+from utils.types import RobotType, SmoothingBenchArgs
+from utils.RobotConfig import RobotConfig
+from utils.consts import *
+
+
+def legacy_smooth(motions: List[dict], window: int) -> List[dict]:
+    """
+    Per-joint smoothing of the per-frame dicts (the legacy implementation of pybullet_render)
+    """
+    for k in motions[0].keys():
+        values = np.array([th[k] for th in motions])
+        values = savgol_filter(values, window, SMOOTH_POLYORDER)
+        for thi, th in enumerate(motions):
+            th[k] = values[thi]
+    return motions
+
+
+def measure_ms(fn, num_repeats: int):
+    start = time.perf_counter()
+    for _ in range(num_repeats):
+        result = fn()
+    return (time.perf_counter() - start) / num_repeats * 1000, result
+
+
+def main(args: SmoothingBenchArgs):
+    robot_config = RobotConfig(args.robot_type)
+    joint_names = sorted(robot_config.joi_keys)
+    window = robot_config.smooth_window
+
+    print(f"Robot: {args.robot_type.name} Joints: {len(joint_names)} Window: {window}")
+    print(f"{'frames':>8} | {'legacy (ms)':>11} | {'array (ms)':>10} | {'speedup':>7} | {'max abs diff':>12}")
+
+    rng = np.random.default_rng(0)
+    all_close = True
+    for num_frames in args.num_frames:
+        # noisy synthetic motion
+        t = np.linspace(0, num_frames / 120, num_frames)[:, None]
+        angles = np.sin(t + np.arange(len(joint_names))) + rng.normal(0, 0.05, (num_frames, len(joint_names)))
+        motion = RobotMotion(angles, joint_names)
+        dicts = motion.to_dicts()
+
+        legacy_ms, legacy = measure_ms(lambda: legacy_smooth(copy.deepcopy(dicts), window), args.num_repeats)
+        deepcopy_ms, _ = measure_ms(lambda: copy.deepcopy(dicts), args.num_repeats)
+        legacy_ms -= deepcopy_ms  # the copy is only for repeating the in-place legacy smoothing
+        array_ms, smoothed = measure_ms(lambda: smooth_motion(motion, window), args.num_repeats)
+
+        max_diff = np.abs(RobotMotion.from_dicts(legacy, joint_names).angles - smoothed.angles).max()
+        all_close &= bool(max_diff < 1e-5)
+        print(
+            f"{num_frames:>8} | {legacy_ms:>11.2f} | {array_ms:>10.2f} | {legacy_ms / array_ms:>6.1f}x | "
+            f"{max_diff:>12.2e}"
+        )
+
+    if not all_close:
+        raise ValueError("The vectorised smoothing differs from the legacy per-joint smoothing!")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="benchmark the vectorised motion smoothing")
+
+    parser.add_argument("--robot-type", "-r", type=RobotType, default=RobotType.COMAN)
+    parser.add_argument("--num-frames", "-t", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--num-repeats", "-n", type=int, default=3)
+
+    args: SmoothingBenchArgs = parser.parse_args()
+    main(args)
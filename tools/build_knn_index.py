@@ -0,0 +1,92 @@
+"""
+Build the retrieval index of the nearest-neighbour retargeter (`-b knn` of tools/evaluate_model.py) from the training
+pairs (SMPL reps -> robot angles) of the train split: the pairs are clustered into k-means cells, which a query
+searches only in part (see model/knn_retargeter.py). The data is loaded through the dataset index of tools/train.py,
+so the seeds compiled for the training are not loaded again.
+
+The train split is the split of the dataset index (every DATA_SPLIT_RATIO-th seed is a test seed), not the legacy
+split of `tools/train.py -ls` (the first num_data // DATA_SPLIT_RATIO seeds): an index built for models trained with
+-ls holds some of their test seeds, so their held-out sets differ.
+
+Usage:
+    python tools/build_knn_index.py -r ROBOT_TYPE [-n NUM_DATA] [-ef-off] [-mp MAX_POINTS] [-nc NUM_CELLS]
+
+Example:
+    python tools/build_knn_index.py -r NAO -ef-off
+    python tools/build_knn_index.py -r NAO -ef-off -mp 500000
+"""
+
+import argparse
+import sys
+
+sys.path.append("./src")
+from model.knn_retargeter import build_knn_index, knn_index_path
+from utils.data import load_indexed_train_test
+from utils.RobotConfig import RobotConfig
+from utils.types import RobotType, BuildKnnIndexArgs
+from utils.consts import *
+
+
+def main(args: BuildKnnIndexArgs):
+    robot_config = RobotConfig(args.robot_type)
+    robot_name = args.robot_type.name
+
+    _, _, robot_angles, smpl_reps, smpl_probs = load_indexed_train_test(
+        input_path=robot_config.SMPL_PARAMS_PATH,
+        reps_path=robot_config.XYZS_REPS_PATH,
+        target_path=robot_config.ANGLES_PATH,
+        num_data=args.num_data,
+        index_dir=DATASET_INDEX_DIR(robot_name, args.extreme_filter_off),
+        split_ratio=DATA_SPLIT_RATIO,
+        extreme_filter_off=args.extreme_filter_off,
+    )
+
+    # the extreme poses (probability 0 of the extreme filter) are not retrieved
+    index_path = knn_index_path(robot_name, args.extreme_filter_off)
+    num_points = build_knn_index(
+        index_path,
+        smpl_reps["train"],
+        robot_angles["train"],
+        sorted(robot_config.joi_keys),
+        smpl_probs=None if args.extreme_filter_off else smpl_probs["train"],
+        max_points=args.max_points,
+        num_cells=args.num_cells,
+    )
+    print(f"Indexed {num_points} of {len(smpl_reps['train'])} training pairs: {index_path}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="build the index of the nearest-neighbour retargeter")
+
+    parser.add_argument(
+        "--robot-type",
+        "-r",
+        type=RobotType,
+        required=True,
+        help=f"Select the robot type: {RobotType._member_names_}",
+    )
+    parser.add_argument(
+        "--num-data",
+        "-n",
+        type=int,
+        default=NUM_SEEDS,
+        help="Number of the generated seeds to index (their train split)",
+    )
+    parser.add_argument("--extreme-filter-off", "-ef-off", action="store_true")
+    parser.add_argument(
+        "--max-points",
+        "-mp",
+        type=int,
+        default=0,
+        help="index a random subset of the training pairs (0: all), which trades accuracy for memory",
+    )
+    parser.add_argument(
+        "--num-cells",
+        "-nc",
+        type=int,
+        default=KNN_NUM_CELLS,
+        help="number of the k-means cells of the index",
+    )
+
+    args: BuildKnnIndexArgs = parser.parse_args()
+    main(args)
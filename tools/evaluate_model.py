@@ -3,11 +3,14 @@ This script is used to evaluate the model.
 Picks the best model on the validation set and evaluates it on the test motions.
 
 # Usage
-    python tools/evaluate_model.py -r ROBOT_TYPE [-ef-off] [-os] [-d DEVICE] [-em EVALUATE_MODE]
+    python tools/evaluate_model.py -r ROBOT_TYPE [-ef-off] [-os] [-d DEVICE] [-em EVALUATE_MODE] [-b BACKEND] [-s]
 
 # Example
     python tools/evaluate_model.py -r REACHY
     python tools/evaluate_model.py -r REACHY -ef-off -os -d cuda:2 -em joint
+    python tools/evaluate_model.py -r NAO -b onnx
+    python tools/evaluate_model.py -r NAO -ef-off -b knn
+    python tools/evaluate_model.py -r COMAN -s
 """
 
 import argparse
@@ -16,22 +19,44 @@ import sys
 sys.path.append("./src")
 from model.pick_best_model import pick_best_model
 from model.evaluate_on_test_motions import evaluate_on_test_motions
-from utils.types import EvaluateArgs, RobotType, EvaluateMode
+from utils.types import EvaluateArgs, RobotType, EvaluateMode, InferBackend
 from utils.RobotConfig import RobotConfig
 
 
 def main(args: EvaluateArgs):
     robot_config = RobotConfig(args.robot_type)
 
-    best_model_idx: int = pick_best_model(
-        robot_config=robot_config,
-        extreme_filter_off=args.extreme_filter_off,
-        one_stage=args.one_stage,
-        device=args.device,
-        evaluate_mode=args.evaluate_mode,
-    )
+    # The int8 models are quantized from the best weights, so the best model is picked with the fp32 weights,
+    # and the freshly picked best weights are quantized and evaluated.
+    pick_backend = InferBackend.TORCH if args.backend == InferBackend.INT8 else args.backend
+
+    # The k-NN retrieval has no weights to pick (the index of tools/build_knn_index.py is evaluated)
+    if args.backend == InferBackend.KNN:
+        best_model_idx = -1
+    else:
+        best_model_idx: int = pick_best_model(
+            robot_config=robot_config,
+            extreme_filter_off=args.extreme_filter_off,
+            one_stage=args.one_stage,
+            device=args.device,
+            evaluate_mode=args.evaluate_mode,
+            backend=pick_backend,
+        )
 
     print(f"Best model index on eval motions: {best_model_idx}")
+    if args.backend == InferBackend.INT8:
+        # the quantization is only needed for the int8 backend
+        from model.quantize_model import quantize_and_save
+
+        # the int8 weights of an earlier pick would not be the weights of best_model_idx
+        for path in quantize_and_save(
+            robot_config=robot_config,
+            extreme_filter_off=args.extreme_filter_off,
+            one_stage=args.one_stage,
+            evaluate_mode=args.evaluate_mode,
+        ):
+            print(f"Quantized the best weights: {path}")
+        best_model_idx = -1
 
     evaluate_on_test_motions(
         robot_config=robot_config,
@@ -40,6 +65,8 @@ def main(args: EvaluateArgs):
         device=args.device,
         evaluate_mode=args.evaluate_mode,
         best_model_idx=best_model_idx,
+        backend=args.backend,
+        smooth=args.smooth,
     )
 
 
@@ -63,5 +90,20 @@ if __name__ == "__main__":
         choices=list(EvaluateMode),
         default=EvaluateMode.JOINT,
     )
+    parser.add_argument(
+        "--backend",
+        "-b",
+        type=InferBackend,
+        choices=list(InferBackend),
+        default=InferBackend.TORCH,
+        help="inference backend "
+        "(onnx: tools/export_onnx.py, int8: tools/quantize_model.py, knn: tools/build_knn_index.py)",
+    )
+    parser.add_argument(
+        "--smooth",
+        "-s",
+        action="store_true",
+        help="smooth the predicted test motions before the evaluation (the window is set per robot)",
+    )
     args: EvaluateArgs = parser.parse_args()
     main(args)
@@ -0,0 +1,80 @@
+"""
+Export the MLP weights of the best models into compact `.npz` files for the NumPy runtime (src/model/numpy_runtime.py).
+The files are saved next to the torch weights (e.g. out/models/NAO/ts/no_ex/human2NAO_ts_best_link.npz).
+
+Usage:
+    python tools/export_npz.py [-r ROBOT_TYPE ...]
+
+Example:
+    python tools/export_npz.py
+    python tools/export_npz.py -r NAO
+"""
+
+import argparse
+import os.path as osp
+import sys
+import numpy as np
+
+sys.path.append("./src")
+from model.infer_with_one_stage import load_one_stage_model
+from model.infer_with_two_stage import load_two_stage_models
+from model.numpy_runtime import npz_model_path
+from utils.types import RobotType, EvaluateMode, ExportArgs
+from utils.RobotConfig import RobotConfig
+from utils.consts import *
+
+
+def main(args: ExportArgs):
+    for robot_type in args.robot_types:
+        robot_config = RobotConfig(robot_type)
+        robot_name = robot_type.name
+
+        for one_stage in [True, False]:
+            for extreme_filter_off in [True, False]:
+                for evaluate_mode in EvaluateMode:
+                    # skip the variants which are not trained or evaluated yet
+                    weight_dir = MODEL_WEIGHTS_DIR(robot_name, one_stage, extreme_filter_off)
+                    model_type = "os" if one_stage else "pre"
+                    if not osp.exists(
+                        osp.join(weight_dir, MODEL_BEST_WEIGHT_NAME(robot_name, model_type, evaluate_mode.value))
+                    ):
+                        continue
+
+                    if one_stage:
+                        models = {"os": load_one_stage_model(robot_config, extreme_filter_off, "cpu", evaluate_mode)}
+                    else:
+                        model_pre, model_post = load_two_stage_models(
+                            robot_config, extreme_filter_off, "cpu", evaluate_mode
+                        )
+                        models = {"pre": model_pre, "post": model_post}
+
+                    # {stage}.{layer}.{weight|bias}: float32 arrays
+                    weights = {
+                        f"{stage}.{k}": v.cpu().numpy().astype(np.float32)
+                        for stage, model in models.items()
+                        for k, v in model.state_dict().items()
+                    }
+                    npz_path = npz_model_path(robot_name, extreme_filter_off, one_stage, evaluate_mode)
+                    np.savez(
+                        npz_path,
+                        stages=np.array(list(models.keys())),
+                        joint_keys=np.array(sorted(robot_config.joi_keys)),
+                        **weights,
+                    )
+                    print(f"Exported: {npz_path}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="args for exporting the MLP weights for the NumPy runtime")
+
+    parser.add_argument(
+        "--robot-types",
+        "-r",
+        type=RobotType,
+        nargs="+",
+        choices=list(RobotType),
+        default=list(RobotType),
+    )
+
+    args: ExportArgs = parser.parse_args()
+    main(args)
@@ -0,0 +1,84 @@
+"""
+Export every trained checkpoint of the retargeting models into ONNX graphs.
+The two-stage models are exported as a single graph which fuses the pre & post networks.
+The ONNX graphs are saved next to the torch weights (e.g. out/models/NAO/ts/no_ex/human2NAO_ts_best_link.onnx).
+
+Usage:
+    python tools/export_onnx.py [-r ROBOT_TYPE ...] [--opset OPSET]
+
+Example:
+    python tools/export_onnx.py
+    python tools/export_onnx.py -r NAO COMAN
+"""
+
+import argparse
+import glob
+import os.path as osp
+import sys
+
+sys.path.append("./src")
+from model.onnx_backend import export_onnx
+from utils.types import RobotType, EvaluateMode, ExportArgs
+from utils.RobotConfig import RobotConfig
+from utils.consts import *
+
+
+def find_checkpoints(robot_name: str, one_stage: bool, extreme_filter_off: bool):
+    """
+    Find the trained checkpoints in the weight directory.
+
+    Returns:
+        checkpoints: list of (evaluate_mode, weight_idx) (weight_idx == -1 for the best weights)
+    """
+    weight_dir = MODEL_WEIGHTS_DIR(robot_name, one_stage, extreme_filter_off)
+
+    # every checkpoint of the two-stage model has both pre & post weights, so we only look for the pre weights
+    model_type = "os" if one_stage else "pre"
+    weight_paths = glob.glob(osp.join(weight_dir, f"human2{robot_name}_{model_type}_*.pth"))
+
+    checkpoints = []
+    for weight_path in sorted(weight_paths):
+        weight_tag = osp.basename(weight_path)[len(f"human2{robot_name}_{model_type}_") : -len(".pth")]
+
+        if weight_tag.startswith("best_"):
+            checkpoints.append((EvaluateMode(weight_tag[len("best_") :]), -1))
+        else:
+            checkpoints.append((EvaluateMode.LINK, int(weight_tag)))
+
+    return checkpoints
+
+
+def main(args: ExportArgs):
+    for robot_type in args.robot_types:
+        robot_config = RobotConfig(robot_type)
+        robot_name = robot_type.name
+
+        for one_stage in [True, False]:
+            for extreme_filter_off in [True, False]:
+                for evaluate_mode, weight_idx in find_checkpoints(robot_name, one_stage, extreme_filter_off):
+                    onnx_path = export_onnx(
+                        robot_config=robot_config,
+                        extreme_filter_off=extreme_filter_off,
+                        one_stage=one_stage,
+                        evaluate_mode=evaluate_mode,
+                        weight_idx=weight_idx,
+                        opset=args.opset,
+                    )
+                    print(f"Exported: {onnx_path}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="args for exporting the models into ONNX")
+
+    parser.add_argument(
+        "--robot-types",
+        "-r",
+        type=RobotType,
+        nargs="+",
+        choices=list(RobotType),
+        default=list(RobotType),
+    )
+    parser.add_argument("--opset", type=int, default=ONNX_OPSET)
+
+    args: ExportArgs = parser.parse_args()
+    main(args)
@@ -5,17 +5,45 @@ Generate <Robot-Human> paired pose data
 2. Generate human pose data using VPoser IK solver.
 
 Usage:
-    python tools/generate_data.py -r [robot_type] -s [num_seeds] -p [poses_per_seed] -d [device] -i [restart_idx]
+    python tools/generate_data.py -r [robot_type] -s [num_seeds] -p [poses_per_seed] -d [device]
+                                  [-sm sampling_mode] [-dt dedup_tol] [-mr max_retries] [-q-off] [-ow]
+                                  [-ikr] [-ri refine_iters] [-ci] [-rd round_iters] [-at] [-emap error_map]
 
 Example:
-    python tools/generate_data.py -r REACHY -s 1000 -p 2000 -d cuda -i 0
-    python tools/generate_data.py -r NAO -s 1000 -p 2000 -d cuda:1 -i 500
+    python tools/generate_data.py -r REACHY -s 1000 -p 2000 -d cuda
+    python tools/generate_data.py -r NAO -s 1000 -p 2000 -d cuda:1 -sm legacy
+    python tools/generate_data.py -r NAO -s 1000 -p 2000 -d cuda -dt 0.01
+    python tools/generate_data.py -r NAO -s 1000 -p 2000 -d cuda -mr 5 -q-off
+    python tools/generate_data.py -r NAO -s 1000 -p 2000 -d cuda -ikr -ri 20
+    python tools/generate_data.py -r NAO -s 1000 -p 2000 -d cuda -ci
+    python tools/generate_data.py -r NAO -s 1000 -p 2000 -d cpu -at
+    python tools/generate_data.py -r NAO -s 200 -p 2000 -d cuda -emap ./out/active/NAO/error_map.npz
+
+The poses whose IK results are NaN are retried (only those poses), and the poses which are still NaN after the
+retries are quarantined: dropped from all the data files of the seed. The counters of each seed are written to
+SMPL_PARAMS_PATH/ik_report_0000.json.
+
+With -ikr, the learned IK (trained by tools/train_ik_regressor.py) predicts the SMPL parameters, and only -ri LBFGS
+iterations refine them (0: no LBFGS) instead of the full 500 iterations from the rest pose. The IK mode can change
+between the runs on the same data (e.g. adding seeds with -ikr): it is recorded per seed in the manifest.
+With -ci, the poses leave the IK batch once they converge, and the pending poses take their slots (recorded per seed
+in the manifest, like -ikr).
+With -at (CPU only), the IK runs with the batch size, torch threads and worker processes tuned for the CPU topology of
+the node by tools/autotune_ik.py.
+With -emap (active sampling), the poses of the new seeds are biased toward the joint space regions where the current
+model retargets badly (error map of tools/active_round.py). The finished seeds keep their poses, so a round only adds
+seeds: e.g. -s 100, then -s 200 -emap ... for the next round.
+
+All the files are written atomically (temp file + rename), and the finished seeds are recorded in the manifest
+(e.g. ./data/nao/motions/manifest.json). Running the same command again resumes where it stopped: the finished seeds
+are skipped, and the finished IK batches of the interrupted seed are restored from its checkpoints
+(SMPL_PARAMS_PATH/ik_ckpt_0000/). Use -ow to ignore the manifest and generate all the seeds again.
 
 """
 
 import argparse
 import sys
-import pickle
+import time
 import os
 import os.path as osp
 import numpy as np
@@ -24,8 +52,9 @@ from tqdm import tqdm
 sys.path.append("./src")
 from process_data.sample_robot_data import sample_robot_data
 from process_data.fit2smpl import fit2smpl
-from utils.types import RobotType, GenerateDataArgs
+from utils.types import RobotType, SamplingMode, GenerateDataArgs
 from utils.RobotConfig import RobotConfig
+from utils.checkpoint import IkCheckpoint, DataManifest, atomic_savez, atomic_pickle_dump, atomic_json_dump
 from utils.consts import *
 
 
@@ -38,45 +67,135 @@ def generate_data(args: GenerateDataArgs):
     os.makedirs(robot_config.ANGLES_PATH, exist_ok=True)
     os.makedirs(robot_config.SMPL_PARAMS_PATH, exist_ok=True)
 
+    # manifest of the finished seeds (the settings which change the data must be the same to resume, the IK mode may
+    # change between the runs: it is recorded per seed, like the error map)
+    manifest = DataManifest(
+        osp.join(osp.dirname(robot_config.SMPL_PARAMS_PATH), DATA_MANIFEST_NAME),
+        settings={
+            "poses_per_seed": args.poses_per_seed,
+            "sampling_mode": args.sampling_mode.value,
+            "dedup_tol": args.dedup_tol,
+        },
+        overwrite=args.overwrite,
+    )
+
+    # learned IK (torch is imported only when it is used)
+    ik_regressor = None
+    if args.ik_regressor:
+        from process_data.ik_regressor import IkRegressor
+
+        ik_regressor = IkRegressor.load(IK_REGRESSOR_PATH(args.robot_type.name), args.device)
+
+    # IK configuration autotuned for the CPU topology (torch is imported only when it is used)
+    ik_batch_size, worker_pool = VPOSER_BATCH_SIZE, None
+    if args.ik_autotune:
+        import torch
+        from process_data.ik_autotune import load_ik_config
+        from utils.hbp import IkWorkerPool
+
+        if args.device != "cpu":
+            raise ValueError("The IK autotuning (-at) is for the CPU nodes (-d cpu).")
+        ik_config = load_ik_config()
+        if ik_config is None:
+            raise ValueError("The IK is not tuned for the CPU of this node yet. Run tools/autotune_ik.py first.")
+
+        print(
+            f"IK config: batch size {ik_config['batch_size']}, {ik_config['num_workers']} workers x "
+            f"{ik_config['num_threads']} threads ({ik_config['poses_per_s']:.1f} poses/s in the autotuning)"
+        )
+        ik_batch_size = ik_config["batch_size"]
+        torch.set_num_threads(ik_config["num_threads"])
+        if ik_config["num_workers"] > 1:
+            worker_pool = IkWorkerPool(
+                num_workers=ik_config["num_workers"],
+                num_threads=ik_config["num_threads"],
+                vposer_path=VPOSER_PATH,
+                smpl_path=SMPL_PATH,
+                num_betas=NUM_BETAS,
+                smpl_joint_idx=robot_config.smpl_joint_idx,
+                device=args.device,
+            )
+
+    # retargeting errors of the current model for the active sampling
+    error_map = None
+    if args.error_map is not None:
+        from process_data.active_sampling import ActiveErrorMap
+
+        error_map = ActiveErrorMap.load(args.error_map)
+
     # sample robot data iteratively for number of seeds
     for seed in tqdm(range(args.num_seeds)):
+        # file name: DATA_PATH/xyzs+reps_0000.npz, DATA_PATH/angles_0000.pkl, DATA_PATH/params_0000.npz
+        xyzs_reps_file = osp.join(robot_config.XYZS_REPS_PATH, robot_xyzs_reps_path(seed))
+        angles_file = osp.join(robot_config.ANGLES_PATH, robot_angles_path(seed))
+        smpl_params_file = osp.join(robot_config.SMPL_PARAMS_PATH, smpl_params_path(seed))
+        ik_report_file = osp.join(robot_config.SMPL_PARAMS_PATH, ik_report_path(seed))
 
-        # skip if seed < restart_idx
-        if seed < args.restart_idx:
+        # skip the finished seeds
+        if manifest.is_done(seed, [xyzs_reps_file, angles_file, smpl_params_file, ik_report_file]):
             continue
 
-        # sample robot data
+        ik_checkpoint = IkCheckpoint(osp.join(robot_config.SMPL_PARAMS_PATH, ik_checkpoint_dir(seed)))
+
+        # sample robot data (the same poses as the interrupted run of the seed: the checkpoints are reused)
         angles_list, xyzs_array, reps_array, xyzs4smpl_array = sample_robot_data(
             args.robot_type,
             args.poses_per_seed,
             seed,
+            args.sampling_mode,
+            error_map,
         )
 
         # fits the robot joints to SMPL parameters
-        smpl_data = fit2smpl(robot_config, xyzs4smpl_array, args.device)
-
-        # save robot's xyz + rep data file
-        # file name: DATA_PATH/xyzs+reps_0000.npz
-        np.savez(
-            osp.join(robot_config.XYZS_REPS_PATH, robot_xyzs_reps_path(seed)),
-            xyzs=xyzs_array,
-            reps=reps_array,
-            xyzs4smpl=xyzs4smpl_array,
+        ik_start = time.perf_counter()
+        smpl_data, ik_report = fit2smpl(
+            robot_config,
+            xyzs4smpl_array,
+            args.device,
+            dedup_tol=args.dedup_tol,
+            max_retries=args.max_retries,
+            quarantine=not args.quarantine_off,
+            ik_checkpoint=ik_checkpoint,
+            ik_regressor=ik_regressor,
+            refine_iters=args.refine_iters,
+            continuous=args.continuous_ik,
+            round_iters=args.round_iters,
+            batch_size=ik_batch_size,
+            worker_pool=worker_pool,
         )
+        ik_report["ik_wall_time"] = time.perf_counter() - ik_start
 
-        # save robot's angle data file
-        # file name: DATA_PATH/angles_0000.pkl
-        pickle.dump(
-            angles_list,
-            open(osp.join(robot_config.ANGLES_PATH, robot_angles_path(seed)), "wb"),
-        )
+        # drop the quarantined poses (IK results were NaN after the retries) from the robot data
+        if ik_report["num_quarantined_poses"] > 0:
+            print(f"seed {seed}: quarantined {ik_report['num_quarantined_poses']} poses")
+            valid = np.ones(len(angles_list), dtype=bool)
+            valid[ik_report["quarantined_poses"]] = False
+            angles_list = [angles for angles, v in zip(angles_list, valid) if v]
+            xyzs_array = xyzs_array[valid]
+            reps_array = reps_array[valid]
+            xyzs4smpl_array = xyzs4smpl_array[valid]
+
+        # save robot's xyz + rep data file, angle data file, SMPL parameters, and the IK report
+        atomic_savez(xyzs_reps_file, xyzs=xyzs_array, reps=reps_array, xyzs4smpl=xyzs4smpl_array)
+        atomic_pickle_dump(angles_list, angles_file)
+        atomic_savez(smpl_params_file, **smpl_data)
+        atomic_json_dump({"seed": seed, **ik_report}, ik_report_file)
 
-        # save SMPL parameters
-        # file name: DATA_PATH/params_0000.npz
-        np.savez(
-            osp.join(robot_config.SMPL_PARAMS_PATH, smpl_params_path(seed)),
-            **smpl_data,
+        # record the seed only after all its files are in place
+        manifest.mark_done(
+            seed,
+            {
+                "num_poses": len(angles_list),
+                "num_quarantined_poses": ik_report["num_quarantined_poses"],
+                "error_map": error_map.fingerprint() if error_map is not None else None,
+                "ik_refine_iters": args.refine_iters if args.ik_regressor else None,
+                "ik_round_iters": args.round_iters if args.continuous_ik else None,
+            },
         )
+        ik_checkpoint.clear()
+
+    if worker_pool is not None:
+        worker_pool.close()
 
 
 if __name__ == "__main__":
@@ -112,10 +231,78 @@ if __name__ == "__main__":
         default=DEVICE,
     )
     parser.add_argument(
-        "--restart-idx",
-        "-i",
+        "--sampling-mode",
+        "-sm",
+        type=SamplingMode,
+        default=SamplingMode.UNIFORM,
+        help=f"random stream of the joint angles: {[m.value for m in SamplingMode]} "
+        "(use legacy to reproduce or resume the data generated with the legacy sampling)",
+    )
+    parser.add_argument(
+        "--dedup-tol",
+        "-dt",
+        type=float,
+        default=IK_DEDUP_TOL,
+        help="tolerance (m) of the near-duplicate SMPL keypoints which share a single IK solve (0: no dedup)",
+    )
+    parser.add_argument(
+        "--max-retries",
+        "-mr",
         type=int,
-        default=0,
+        default=IK_MAX_RETRIES,
+        help="number of retries of the poses whose IK results are NaN",
+    )
+    parser.add_argument(
+        "--quarantine-off",
+        "-q-off",
+        action="store_true",
+        help="abort the seed instead of dropping the poses which are still NaN after the retries",
+    )
+    parser.add_argument(
+        "--overwrite",
+        "-ow",
+        action="store_true",
+        help="ignore the manifest of the finished seeds and generate all the seeds again",
+    )
+    parser.add_argument(
+        "--ik-regressor",
+        "-ikr",
+        action="store_true",
+        help="start the IK from the predictions of the learned IK (tools/train_ik_regressor.py)",
+    )
+    parser.add_argument(
+        "--refine-iters",
+        "-ri",
+        type=int,
+        default=IK_REGRESSOR_REFINE_ITERS,
+        help="LBFGS iterations after the learned IK (0: use its predictions as they are)",
+    )
+    parser.add_argument(
+        "--continuous-ik",
+        "-ci",
+        action="store_true",
+        help="retire the converged poses from the IK batch and refill their slots with the pending poses",
+    )
+    parser.add_argument(
+        "--round-iters",
+        "-rd",
+        type=int,
+        default=IK_ROUND_ITERS,
+        help="LBFGS iterations between the per-pose convergence checks of the continuous IK",
+    )
+    parser.add_argument(
+        "--ik-autotune",
+        "-at",
+        action="store_true",
+        help="run the IK with the configuration tuned by tools/autotune_ik.py for this CPU (batch, threads, workers)",
+    )
+
+    parser.add_argument(
+        "--error-map",
+        "-emap",
+        type=str,
+        default=None,
+        help="bias the poses of the new seeds toward the high errors of this error map (tools/active_round.py)",
     )
 
     args: GenerateDataArgs = parser.parse_args()
@@ -0,0 +1,99 @@
+"""
+Produce int8 dynamically quantized variants of the best models, and report the size, latency and error deltas
+against the fp32 models (errors are calculated on the test GT motions in all the evaluate modes).
+
+The quantized weights are saved in `out/models/ROBOT/{os,ts}/{ex,no_ex}/int8/`, and the report is saved as
+`quantization_report.txt` in the same directory.
+`tools/evaluate_model.py -b int8` quantizes the best weights it picks in the same way before evaluating them.
+
+Usage:
+    python tools/quantize_model.py -r ROBOT_TYPE [-ef-off] [-os] [-n NUM_REPEATS]
+
+Example:
+    python tools/quantize_model.py -r NAO
+    python tools/quantize_model.py -r COMAN -os -ef-off
+"""
+
+import argparse
+import os.path as osp
+import sys
+
+sys.path.append("./src")
+from model.quantize_model import (
+    quantize_and_save,
+    weights_size_mb,
+    measure_latency_ms,
+    evaluate_on_test_motions_error,
+)
+from utils.types import RobotType, EvaluateMode, InferBackend, QuantizeArgs
+from utils.RobotConfig import RobotConfig
+from utils.consts import *
+
+LATENCY_BATCH_SIZES = [1, 32, 2000]
+
+
+def main(args: QuantizeArgs):
+    robot_config = RobotConfig(args.robot_type)
+    robot_name = robot_config.robot_type.name
+    variant = dict(
+        robot_config=robot_config,
+        extreme_filter_off=args.extreme_filter_off,
+        one_stage=args.one_stage,
+    )
+
+    lines = [
+        f"Robot: {robot_name} Model: {'one-stage' if args.one_stage else 'two-stage'} "
+        f"EF: [{'OFF' if args.extreme_filter_off else 'ON'}]",
+        "===================================================",
+    ]
+
+    for evaluate_mode in EvaluateMode:
+        for path in quantize_and_save(evaluate_mode=evaluate_mode, **variant):
+            print(f"Saved: {path}")
+
+        fp32_size = weights_size_mb(evaluate_mode=evaluate_mode, int8=False, **variant)
+        int8_size = weights_size_mb(evaluate_mode=evaluate_mode, int8=True, **variant)
+        fp32_error = evaluate_on_test_motions_error(evaluate_mode=evaluate_mode, backend=InferBackend.TORCH, **variant)
+        int8_error = evaluate_on_test_motions_error(evaluate_mode=evaluate_mode, backend=InferBackend.INT8, **variant)
+
+        lines.append(f"Evaluate_mode: {evaluate_mode.name} (best weight of the mode)")
+        lines.append(f"Size (MB):  fp32 {fp32_size:.3f} int8 {int8_size:.3f} ratio {int8_size / fp32_size:.3f}")
+        lines.append(
+            f"Mean_error: fp32 {fp32_error:.6f} int8 {int8_error:.6f} "
+            f"delta {int8_error - fp32_error:+.6f} ({(int8_error - fp32_error) / fp32_error * 100:+.2f}%)"
+        )
+
+        for batch_size in LATENCY_BATCH_SIZES:
+            fp32_ms = measure_latency_ms(
+                evaluate_mode=evaluate_mode, int8=False, batch_size=batch_size, num_repeats=args.num_repeats, **variant
+            )
+            int8_ms = measure_latency_ms(
+                evaluate_mode=evaluate_mode, int8=True, batch_size=batch_size, num_repeats=args.num_repeats, **variant
+            )
+            lines.append(
+                f"Latency (ms) batch {batch_size:>4}: fp32 {fp32_ms:.3f} int8 {int8_ms:.3f} "
+                f"speedup {fp32_ms / int8_ms:.2f}x"
+            )
+        lines.append("---------------------------------------------------")
+
+    report = "\n".join(lines) + "\n"
+    print(report)
+
+    report_path = osp.join(
+        MODEL_INT8_WEIGHTS_DIR(robot_name, args.one_stage, args.extreme_filter_off), "quantization_report.txt"
+    )
+    with open(report_path, "w") as f:
+        f.write(report)
+    print(f"Saved the report: {report_path}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="args for quantizing the models into int8")
+
+    parser.add_argument("--robot-type", "-r", type=RobotType, default=RobotType.NAO)
+    parser.add_argument("--extreme-filter-off", "-ef-off", action="store_true")
+    parser.add_argument("--one-stage", "-os", action="store_true")
+    parser.add_argument("--num-repeats", "-n", type=int, default=100)
+
+    args: QuantizeArgs = parser.parse_args()
+    main(args)
@@ -10,23 +10,31 @@ Example:
     python tools/render_robot_motion.py -r COMAN -mi 13_08 -e mp4 --fps 120
     python tools/render_robot_motion.py -r COMAN -mi 13_18 -e mp4 --fps 120 -ef-off -s-off
     python tools/render_robot_motion.py -r COMAN -e mp4 --fps 120
+    python tools/render_robot_motion.py -r COMAN -e mp4 --fps 120 -b onnx   # predictions of evaluate_model.py -b onnx
 
     # render for GT motion
     python tools/render_robot_motion.py -r=COMAN -gt -mi="13_08" -e mp4 --fps 120 -s-off
     python tools/render_robot_motion.py -r=COMAN -gt -mi="13_18" -e mp4 --fps 120
+
+    # render all the motions headless (DIRECT mode) with 4 worker processes
+    python tools/render_robot_motion.py -r COMAN -e mp4 --fps 120 --headless --workers 4
 """
 
 import argparse
+import itertools
+import multiprocessing as mp
+import resource
 import sys
-import pickle
-import imageio
+import time
 import os
 import os.path as osp
-from typing import Dict, List
+from typing import List, Tuple
 
 sys.path.append("./src")
-from visualize.pybullet_render import pybullet_render
-from utils.types import RobotType, PybulletRenderArgs
+from visualize.pybullet_render import RobotRenderSession
+from visualize.video_writer import VideoWriterThread
+from utils.motion import RobotMotion, load_gt_motion, load_robot_motion
+from utils.types import RobotType, InferBackend, PybulletRenderArgs
 from utils.RobotConfig import RobotConfig
 from utils.consts import *
 
@@ -43,36 +51,81 @@ def main(args: PybulletRenderArgs):
         # if the motion index is given, render only the given motion
         motion_idxs = [args.motion_idx]
 
-    for motion_idx in motion_idxs:
-        render_motion(args, motion_idx)
-
+    num_workers = min(args.workers, len(motion_idxs))
+    if num_workers > 1 and not args.headless:
+        print("Multiple workers can't share the GUI, rendering headless")
+        args.headless = True
 
-def render_motion(args: PybulletRenderArgs, motion_idx: str):
-    # load the robot configuration
+    start = time.perf_counter()
+    if num_workers <= 1:
+        worker_results = [render_motions(args, motion_idxs)]
+    else:
+        # each worker owns its own physics client and renders a subset of the motions
+        # (spawn: the physics clients and the EGL contexts must not be inherited from the parent process)
+        subsets = [motion_idxs[i::num_workers] for i in range(num_workers)]
+        with mp.get_context("spawn").Pool(num_workers) as pool:
+            worker_results = pool.starmap(render_motions, [(args, subset) for subset in subsets])
+    elapsed = time.perf_counter() - start
+
+    total_frames = 0
+    for worker_idx, (num_frames, render_seconds, max_rss_mb, setup_seconds) in enumerate(worker_results):
+        total_frames += num_frames
+        num_motions = len(motion_idxs[worker_idx::num_workers])
+        print(
+            f"Worker {worker_idx}: {num_frames} frames, {num_frames / render_seconds:.1f} frames/s, "
+            f"peak RSS {max_rss_mb:.0f} MB, "
+            f"scene setup {setup_seconds:.2f} s once (saved {setup_seconds * (num_motions - 1):.2f} s "
+            f"over {num_motions} motions)"
+        )
+    print(f"Total: {total_frames} frames in {elapsed:.1f} s, {total_frames / elapsed:.1f} frames/s")
+
+
+def render_motions(args: PybulletRenderArgs, motion_idxs: List[str]) -> Tuple[int, float, float, float]:
+    """
+    Render the motions one after another (in a worker process) in a single pybullet session.
+
+    Returns:
+        num_frames: int (number of the rendered frames)
+        render_seconds: float (time spent on rendering & encoding the videos)
+        max_rss_mb: float (peak memory of the process)
+        setup_seconds: float (time spent on setting up the scene, once per worker)
+    """
+    # load the robot configuration and set up the scene once
     robot_config = RobotConfig(args.robot_type)
+
+    num_frames, render_seconds = 0, 0.0
+    with RobotRenderSession(robot_config, args.headless) as session:
+        for motion_idx in motion_idxs:
+            n, seconds = render_motion(args, motion_idx, session)
+            num_frames += n
+            render_seconds += seconds
+
+    # ru_maxrss is in kilobytes on Linux
+    max_rss_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+    return num_frames, render_seconds, max_rss_mb, session.setup_seconds
+
+
+def render_motion(args: PybulletRenderArgs, motion_idx: str, session: RobotRenderSession) -> Tuple[int, float]:
+    robot_config = session.robot_config
     robot_name = robot_config.robot_type.name
 
     # load motion data (joint) and set output path
     # if ground truth, load ground truth motion data
     if args.ground_truth:
-        motions: List[Dict[str, float]] = pickle.load(open(GT_PATH, "rb"))
-        robot_name_for_gt = args.robot_type.name[0] + args.robot_type.name[1:].lower()
-        motions = motions[robot_name_for_gt][motion_idx]["q"]
+        motions: RobotMotion = load_gt_motion(args.robot_type, motion_idx)
 
     # if not ground truth, load predicted motion data
     else:
         # fmt: off
         motions_dir = PRED_MOTIONS_DIR(robot_name, args.one_stage, args.extreme_filter_off)
-        motion_name = PRED_MOTION_NAME(robot_name, args.extreme_filter_off, motion_idx)
+        variant = PRED_VARIANT(args.backend.value, False)  # the raw predictions (smoothed here unless -s-off)
+        motion_name = PRED_MOTION_NAME(robot_name, args.extreme_filter_off, motion_idx, variant)
         motion_path = osp.join(motions_dir, motion_name)
-        motions: List[Dict[str, float]] = pickle.load(open(motion_path, "rb"))
+        motions: RobotMotion = load_robot_motion(motion_path)
         # fmt: on
 
-    # render the motion with pybullet
-    # The first frame has an issue with the camera view, so we skip the first frame
-    frames = pybullet_render(motions, robot_config, args.smooth_off)[1:]
-
-    # Save the frames as a gif or mp4 file
+    # Set the output path of the gif or mp4 file
     # fmt: off
     if args.ground_truth:
         output_dir = PYBULLET_GT_VID_DIR(robot_name)
@@ -80,22 +133,30 @@ def render_motion(args: PybulletRenderArgs, motion_idx: str):
         output_path = osp.join(output_dir, output_name)
     else:
         output_dir = PYBULLET_PRED_VID_DIR(robot_name, args.one_stage, args.extreme_filter_off)
-        output_name = PYBULLET_PRED_VID_NAME(robot_name, args.extreme_filter_off, motion_idx, args.extention)
+        output_name = PYBULLET_PRED_VID_NAME(
+            robot_name, args.extreme_filter_off, motion_idx, args.backend.value, args.extention
+        )
         output_path = osp.join(output_dir, output_name)
     os.makedirs(os.path.dirname(output_path), exist_ok=True)
-    extension = output_path.split(".")[-1]
-    if extension == "gif":
-        imageio.mimwrite(output_path, frames, duration=1000 / args.fps)
-    elif extension == "mp4":
-        imageio.mimsave(output_path, frames, fps=args.fps)
     # fmt: on
 
+    # render the motion with pybullet, and encode the frames on a background thread while rendering
+    # The first frame has an issue with the camera view, so we skip the first frame
+    start = time.perf_counter()
+    frames = session.render(motions, args.smooth_off)
+    with VideoWriterThread(output_path, args.fps) as writer:
+        for frame in itertools.islice(frames, 1, None):
+            writer.write(frame)
+    render_seconds = time.perf_counter() - start
+
     # save frames as images
     # frame_dir = f"{output_dir}/{args.motion_idx}"
     # os.makedirs(frame_dir, exist_ok=True)
     # for i, frame in enumerate(frames):
     #     imageio.imwrite(osp.join(frame_dir, f"frame_{i:04}.png"), frame)
 
+    return writer.num_frames, render_seconds
+
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="args for render with pybullet")
@@ -105,9 +166,19 @@ if __name__ == "__main__":
     parser.add_argument("--motion-idx", "-mi", type=str)
     parser.add_argument("--extreme-filter-off", "-ef-off", action="store_true")
     parser.add_argument("--one-stage", "-os", action="store_true")
+    parser.add_argument(
+        "--backend",
+        "-b",
+        type=InferBackend,
+        choices=list(InferBackend),
+        default=InferBackend.TORCH,
+        help="inference backend of the predicted motions (tools/evaluate_model.py -b)",
+    )
     parser.add_argument("--fps", type=int, default=120)
     parser.add_argument("--smooth-off", "-s-off", action="store_true")
     parser.add_argument("--extention", "-e", type=str, default="gif")
+    parser.add_argument("--headless", action="store_true", help="render without GUI (DIRECT mode, EGL if available)")
+    parser.add_argument("--workers", "-w", type=int, default=1, help="number of the rendering processes")
 
     args: PybulletRenderArgs = parser.parse_args()
     main(args)
@@ -0,0 +1,68 @@
+"""
+Report the active data generation against the uniform sampling: the validation error of each round per IK-hour, and
+the validation error of the uniform sampling at the same IK-hours (logs of tools/active_round.py).
+
+Usage:
+    python tools/report_active_sampling.py -r ROBOT_TYPE [-l LOG ...]
+
+Example:
+    python tools/report_active_sampling.py -r NAO
+    python tools/report_active_sampling.py -r NAO -l ./out/active/NAO/rounds_active.json ../uniform/rounds_uniform.json
+"""
+
+import argparse
+import glob
+import json
+import sys
+import os.path as osp
+
+sys.path.append("./src")
+from process_data.active_sampling import active_sampling_report
+from utils.types import RobotType, ActiveReportArgs
+from utils.consts import *
+
+
+def main(args: ActiveReportArgs):
+    robot_name = args.robot_type.name
+
+    # logs of the arms: rounds_ARM.json
+    log_paths = args.logs or sorted(glob.glob(ACTIVE_ROUNDS_LOG_PATH(robot_name, "*")))
+    arms = {}
+    for log_path in log_paths:
+        arm = osp.splitext(osp.basename(log_path))[0][len("rounds_") :]
+        with open(log_path) as f:
+            arms[arm] = json.load(f)
+
+    if "uniform" not in arms:
+        print("No log of the uniform sampling (rounds_uniform.json): the comparison is skipped.")
+
+    lines = [f"Robot: {robot_name}", ""] + active_sampling_report(arms)
+    print("\n".join(lines))
+
+    report_path = osp.join(osp.dirname(ACTIVE_ROUNDS_LOG_PATH(robot_name, "")), "report.txt")
+    with open(report_path, "w") as f:
+        f.write("\n".join(lines))
+    print(f"Saved the report: {report_path}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="args for reporting the active data generation")
+
+    parser.add_argument(
+        "--robot-type",
+        "-r",
+        type=RobotType,
+        required=True,
+        help=f"Select the robot type: {RobotType._member_names_}",
+    )
+    parser.add_argument(
+        "--logs",
+        "-l",
+        type=str,
+        nargs="+",
+        default=None,
+        help="round logs of the arms (rounds_ARM.json, default: the logs in ./out/active/ROBOT/)",
+    )
+
+    args: ActiveReportArgs = parser.parse_args()
+    main(args)
@@ -0,0 +1,73 @@
+"""
+Serve the retargeting models of all robot types from a single local process.
+Concurrent requests are coalesced into micro-batches (see src/model/retarget_server.py).
+
+Usage:
+    python tools/serve_retarget.py [-r ROBOT_TYPE ...] [-ef-off] [-os] [-d DEVICE] [-em EVALUATE_MODE] [--port PORT] [--max-wait-ms MS]
+
+Example:
+    python tools/serve_retarget.py
+    python tools/serve_retarget.py -r NAO COMAN -os -d cpu --max-wait-ms 2
+"""
+
+import argparse
+import sys
+
+sys.path.append("./src")
+from model.retarget_server import RetargetModelPool, serve_retarget
+from utils.types import RobotType, EvaluateMode, ServeArgs
+from utils.consts import *
+
+
+def main(args: ServeArgs):
+    pool = RetargetModelPool(
+        robot_types=args.robot_types,
+        one_stage=args.one_stage,
+        extreme_filter_off=args.extreme_filter_off,
+        device=args.device,
+        evaluate_mode=args.evaluate_mode,
+        max_batch_frames=args.max_batch_frames,
+        max_wait_ms=args.max_wait_ms,
+    )
+    serve_retarget(pool, args.host, args.port)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="args for serving the retargeting models")
+
+    parser.add_argument(
+        "--robot-types",
+        "-r",
+        type=RobotType,
+        nargs="+",
+        choices=list(RobotType),
+        default=list(RobotType),
+    )
+    parser.add_argument("--extreme-filter-off", "-ef-off", action="store_true")
+    parser.add_argument("--one-stage", "-os", action="store_true")
+    parser.add_argument("--device", "-d", type=str, default="cpu")
+    parser.add_argument(
+        "--evaluate-mode",
+        "-em",
+        type=EvaluateMode,
+        choices=list(EvaluateMode),
+        default=EvaluateMode.LINK,
+        help="the best weight of which evaluate mode to serve",
+    )
+    parser.add_argument("--host", type=str, default=SERVER_HOST)
+    parser.add_argument("--port", type=int, default=SERVER_PORT)
+    parser.add_argument(
+        "--max-batch-frames",
+        type=int,
+        default=SERVER_MAX_BATCH_FRAMES,
+        help="maximum number of frames in a micro-batch",
+    )
+    parser.add_argument(
+        "--max-wait-ms",
+        type=float,
+        default=SERVER_MAX_WAIT_MS,
+        help="maximum waiting time to gather a micro-batch",
+    )
+
+    args: ServeArgs = parser.parse_args()
+    main(args)
@@ -2,15 +2,21 @@
 Train the model to predict robot joint angles from SMPL parameters.
 
 Usage:
-    python tools/train.py -r [robot_type] [-d <device>] [-n <num_data>] [-ef-off] [-os] [-w]
+    python tools/train.py -r [robot_type] [-d <device>] [-n <num_data>] [-ef-off] [-os] [-w] [-ri] [-ls]
+                          [-llw <weight>]
 
 Example:
     python tools/train.py -r REACHY -os -w
     python tools/train.py -r COMAN -d cuda:2
+    python tools/train.py -r NAO -os -llw 1.0   # + link-position loss of the evaluate links (differentiable FK)
+
+The loaded data is compiled into an append-only dataset index (./out/datasets/ROBOT/{ex,no_ex}/), which records a
+stable train/test split per seed. Training with more seeds (-n) only loads the new seeds and appends them to the index.
+Use -ri to compile the index again (e.g. after generating the data again), or -ls for the legacy split (the first
+num_data // DATA_SPLIT_RATIO seeds are the test data, without the index).
 """
 
 import argparse
-import wandb
 import time
 import sys
 from torch.utils.data import DataLoader
@@ -19,7 +25,7 @@ sys.path.append("./src")
 from utils.RobotConfig import RobotConfig
 from utils.types import RobotType, TrainArgs
 from utils.consts import *
-from utils.data import load_and_split_train_test, H2RMotionData
+from utils.data import load_and_split_train_test, load_indexed_train_test, H2RMotionData
 from model.train_one_stage import train_one_stage
 from model.train_two_stage import train_two_stage
 
@@ -27,8 +33,13 @@ from model.train_two_stage import train_two_stage
 def train(args: TrainArgs):
     robot_config = RobotConfig(args.robot_type)
 
-    # wandb init
+    if args.link_loss_weight > 0 and not args.one_stage:
+        raise ValueError("The link-position loss is only implemented for the one-stage model (-os).")
+
+    # wandb init (imported only when it is used, since it is slow to import)
     if args.wandb:
+        import wandb
+
         wandb.init(project="mr_hubo")
         current_time = time.strftime("%Y-%m-%d_%H:%M:%S", time.localtime())
         if args.one_stage:
@@ -59,16 +70,30 @@ def train(args: TrainArgs):
     target_path = robot_config.ANGLES_PATH       # target: robot joint angles    (q)
     # fmt: on
 
-    robot_xyzs, robot_reps, robot_angles, smpl_reps, smpl_prob = (
-        load_and_split_train_test(
-            input_path=input_path,
-            reps_path=reps_path,
-            target_path=target_path,
-            num_data=num_data,
-            split_ratio=DATA_SPLIT_RATIO,
-            extreme_filter_off=args.extreme_filter_off,
+    if args.legacy_split:
+        robot_xyzs, robot_reps, robot_angles, smpl_reps, smpl_prob = (
+            load_and_split_train_test(
+                input_path=input_path,
+                reps_path=reps_path,
+                target_path=target_path,
+                num_data=num_data,
+                split_ratio=DATA_SPLIT_RATIO,
+                extreme_filter_off=args.extreme_filter_off,
+            )
+        )
+    else:
+        robot_xyzs, robot_reps, robot_angles, smpl_reps, smpl_prob = (
+            load_indexed_train_test(
+                input_path=input_path,
+                reps_path=reps_path,
+                target_path=target_path,
+                num_data=num_data,
+                index_dir=DATASET_INDEX_DIR(args.robot_type.name, args.extreme_filter_off),
+                split_ratio=DATA_SPLIT_RATIO,
+                extreme_filter_off=args.extreme_filter_off,
+                rebuild=args.rebuild_index,
+            )
         )
-    )
 
     train_dataset = H2RMotionData(
         robot_xyzs["train"],
@@ -100,6 +125,7 @@ def train(args: TrainArgs):
             test_dataloader=test_dataloader,
             num_epochs=num_epochs,
             is_wandb=args.wandb,
+            link_loss_weight=args.link_loss_weight,
         )
     else:
         train_two_stage(
@@ -153,6 +179,25 @@ if __name__ == "__main__":
         default=NUM_SEEDS,
         help="Number of data to train",
     )
+    parser.add_argument(
+        "--rebuild-index",
+        "-ri",
+        action="store_true",
+        help="compile the dataset index again from all the data files",
+    )
+    parser.add_argument(
+        "--legacy-split",
+        "-ls",
+        action="store_true",
+        help="split the first num_data // DATA_SPLIT_RATIO seeds as the test data (without the dataset index)",
+    )
+    parser.add_argument(
+        "--link-loss-weight",
+        "-llw",
+        type=float,
+        default=0.0,
+        help="weight of the link-position loss of the evaluate links (one-stage model, 0: joint angles MSE only)",
+    )
 
     args: TrainArgs = parser.parse_args()
     train(args)
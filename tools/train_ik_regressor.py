@@ -0,0 +1,61 @@
+"""
+Train the learned IK (regressor from the SMPL keypoints of the robot poses to the SMPL parameters of their IK results)
+on the generated data. The weights are saved in ./out/models/ROBOT/ik_regressor.pth, and used by
+`tools/generate_data.py -ikr` instead of the full LBFGS of VPoser's IK engine.
+
+Usage:
+    python tools/train_ik_regressor.py -r [robot_type] [-d <device>] [-n <num_data>] [-e <num_epochs>]
+
+Example:
+    python tools/train_ik_regressor.py -r NAO -n 100
+    python tools/train_ik_regressor.py -r COMAN -d cuda:1 -e 50
+"""
+
+import argparse
+import sys
+
+sys.path.append("./src")
+from process_data.ik_regressor import train_ik_regressor
+from utils.RobotConfig import RobotConfig
+from utils.types import RobotType, TrainIkRegressorArgs
+from utils.consts import *
+
+
+def main(args: TrainIkRegressorArgs):
+    robot_config = RobotConfig(args.robot_type)
+    train_ik_regressor(robot_config, args.device, args.num_data, args.num_epochs)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="args for training the learned IK")
+
+    parser.add_argument(
+        "--robot-type",
+        "-r",
+        type=RobotType,
+        required=True,
+        help=f"Select the robot type: {RobotType._member_names_}",
+    )
+    parser.add_argument(
+        "--device",
+        "-d",
+        type=str,
+        default=DEVICE,
+        help="Device to run the model",
+    )
+    parser.add_argument(
+        "--num-data",
+        "-n",
+        type=int,
+        default=NUM_SEEDS,
+        help="Number of the generated seeds to train on",
+    )
+    parser.add_argument(
+        "--num-epochs",
+        "-e",
+        type=int,
+        default=IK_REGRESSOR_EPOCHS,
+    )
+
+    args: TrainIkRegressorArgs = parser.parse_args()
+    main(args)